@@ -0,0 +1,81 @@
+"""Microbenchmarks of the engine, serialization and pub/sub hot paths.
+
+Run from the repository root, saving a baseline on this machine first:
+
+    PYTHONPATH=src python -m benchmarks save-baseline
+    PYTHONPATH=src python -m benchmarks run --output results.json
+    PYTHONPATH=src python -m benchmarks compare --threshold 0.15
+"""
+
+import argparse
+import sys
+from pathlib import Path
+
+from benchmarks import engine_benchmarks  # noqa: F401 registers the benchmarks
+from benchmarks.harness import (
+    BenchmarkResult,
+    compare_results,
+    read_results,
+    registered_benchmarks,
+    run_benchmark,
+    write_results,
+)
+
+DEFAULT_BASELINE_PATH = Path(__file__).resolve().parent / "baseline.json"
+
+
+def _run(name_filter: str | None, repeats: int) -> dict[str, BenchmarkResult]:
+    results = {}
+    for name, setup in registered_benchmarks().items():
+        if name_filter is not None and name_filter not in name:
+            continue
+        results[name] = run_benchmark(setup, repeats=repeats)
+        print(f"{name:<70} {results[name].median_s * 1e6:>12.2f} us")
+    return results
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__)
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    for command in ("run", "save-baseline", "compare"):
+        subparser = subparsers.add_parser(command)
+        subparser.add_argument("--filter", default=None)
+        subparser.add_argument("--repeats", type=int, default=5)
+        subparser.add_argument("--baseline", type=Path, default=DEFAULT_BASELINE_PATH)
+    subparsers.choices["run"].add_argument("--output", type=Path, default=None)
+    subparsers.choices["compare"].add_argument("--threshold", type=float, default=0.1)
+
+    args = parser.parse_args()
+    # timings only compare on the same machine, no baseline is committed
+    if args.command == "compare" and not args.baseline.exists():
+        parser.error(
+            f"no baseline at {args.baseline}, "
+            "run `python -m benchmarks save-baseline` first"
+        )
+    results = _run(args.filter, args.repeats)
+
+    match args.command:
+        case "run":
+            if args.output is not None:
+                write_results(args.output, results)
+        case "save-baseline":
+            write_results(args.baseline, results)
+            print(f"Baseline saved to {args.baseline}")
+        case "compare":
+            comparisons = compare_results(read_results(args.baseline), results)
+            regressions = [c for c in comparisons if c.is_regression(args.threshold)]
+            print()
+            for comparison in comparisons:
+                flag = "REGRESSION" if comparison in regressions else ""
+                print(f"{comparison.name:<70} {comparison.ratio:>8.2f}x {flag}")
+            if regressions:
+                print(
+                    f"{len(regressions)} benchmarks regressed over {args.threshold:.0%}"
+                )
+                return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,312 @@
+import json
+import logging
+import random
+import tempfile
+import uuid
+
+from benchmarks import fixtures
+from benchmarks.harness import benchmark
+from controller.game_update import GameStatusUpdate
+from controller.interest_manager import InterestManager
+from game_log.game_log_config import GameLogConfig
+from game_log.game_log_format import encode_actions, encode_snapshot
+from game_log.game_log_reader import GameLogReader
+from game_log.game_log_writer import GameLogWriter
+from metrics.log_pipeline import LogPipeline
+from metrics.logging_config import LoggingConfig
+from metrics.metrics import FAST_BUCKETS, MetricsRegistry
+from model.board.board_factory import generate_board
+from model.board.hex_geometry import LevelGeometry
+from model.board.hexagon_coordinates import HexagonCoordinates
+from model.board.level_format import read_level, write_level
+from model.board.level_generator import generate_level
+from model.game_model.game_status.game_status_factory import generate_game_status
+from model.game_model.game_status.game_status_updater import update_game_status
+from model.game_model.legal_actions import legal_actions_by_seat
+from model.game_model.player_action_validator import is_valid_action
+from model.game_model.player_actions import MarchTroopAction, SpawnTroopAction
+from model.troops import HomeBaseTroop
+from session.pub_sub import PubSubManager
+from simulation.batch_simulator import BatchLevel, run_batch
+
+
+@benchmark("engine.update_game_status[4p]")
+def _update_game_status():
+    game_status, actions = fixtures.mid_game(4)
+    return lambda: update_game_status(game_status, actions, is_valid_action)
+
+
+@benchmark("batch_simulator.run_batch[1000 games,4p]")
+def _run_batch():
+    level = BatchLevel(fixtures.level(4), 4)
+    return lambda: run_batch(level, 1000, seed=0)
+
+
+def _first_action(action_type):
+    game_status, actions = fixtures.mid_game(4)
+    seat, action = next(
+        (seat, action)
+        for seat, seat_actions in enumerate(actions)
+        for action in seat_actions
+        if isinstance(action, action_type)
+    )
+    return lambda: is_valid_action(seat, action, game_status)
+
+
+@benchmark("validator.is_valid_action[march]")
+def _is_valid_march():
+    return _first_action(MarchTroopAction)
+
+
+@benchmark("validator.is_valid_action[spawn]")
+def _is_valid_spawn():
+    return _first_action(SpawnTroopAction)
+
+
+def _board_and_troop_tiles():
+    game_status, _ = fixtures.mid_game(4)
+    board = game_status.board
+    troop_tiles = [
+        coordinates
+        for coordinates, troop in board.coordinates_to_occupation.items()
+        if troop is not None and not isinstance(troop, HomeBaseTroop)
+    ]
+    empty_tiles = [
+        coordinates
+        for coordinates, troop in board.coordinates_to_occupation.items()
+        if troop is None
+    ]
+    return board, troop_tiles, empty_tiles
+
+
+@benchmark("legal_actions.legal_actions_by_seat[8p]")
+def _legal_actions_by_seat():
+    game_status, _ = fixtures.mid_game(8)
+    return lambda: legal_actions_by_seat(game_status)
+
+
+@benchmark("level_format.read_level[8p,radius 60]")
+def _read_level():
+    with tempfile.TemporaryDirectory() as folder:
+        path = f"{folder}/8.hexlevel"
+        write_level(path, generate_level(8, radius=60))
+        yield lambda: read_level(path)
+
+
+@benchmark("hex_geometry.reachable[8p,radius 60,10 steps]")
+def _reachable():
+    geometry = LevelGeometry(generate_level(8, radius=60).points)
+    core = HexagonCoordinates(q=0, r=0)
+    return lambda: geometry.reachable([core], max_steps=10)
+
+
+@benchmark("interest_manager.visible_game_status[4p,radius 60]")
+def _visible_game_status():
+    level = generate_level(4, radius=60)
+    game_status = generate_game_status(
+        set(fixtures.players(4)),
+        lambda n_players: generate_board(n_players, lambda _: set(level.points)),
+        random.Random(0),
+    )
+    interest_manager = InterestManager(game_status, radius=4, cell_size=8)
+    seat = game_status.player_order.seats[0]
+    return lambda: interest_manager.visible_game_status(seat, game_status)
+
+
+@benchmark("board.add_player_troop")
+def _add_player_troop():
+    board, troop_tiles, empty_tiles = _board_and_troop_tiles()
+    troop = board.coordinates_to_occupation[troop_tiles[0]]
+    return lambda: board.add_player_troop(troop, empty_tiles[0])
+
+
+@benchmark("board.move_troop")
+def _move_troop():
+    board, troop_tiles, empty_tiles = _board_and_troop_tiles()
+    return lambda: board.move_troop(troop_tiles[0], empty_tiles[0])
+
+
+@benchmark("board.remove_troop")
+def _remove_troop():
+    board, troop_tiles, _ = _board_and_troop_tiles()
+    return lambda: board.remove_troop(troop_tiles[0])
+
+
+@benchmark("board.remove_player_troops")
+def _remove_player_troops():
+    board, troop_tiles, _ = _board_and_troop_tiles()
+    seat = board.coordinates_to_occupation[troop_tiles[0]].owner
+    return lambda: board.remove_player_troops(seat)
+
+
+@benchmark("board.playable_troop_by_seat")
+def _playable_troop_by_seat():
+    board, _, _ = _board_and_troop_tiles()
+    return board.playable_troop_by_seat
+
+
+@benchmark("serialization.game_status_update.model_dump")
+def _game_status_update_model_dump():
+    game_status, _ = fixtures.mid_game(4)
+    update = GameStatusUpdate(game_status=game_status)
+    # what the websocket sends: a python dump encoded by json.dumps
+    return lambda: json.dumps(update.model_dump())
+
+
+@benchmark("serialization.game_status_update.model_dump_json")
+def _game_status_update_model_dump_json():
+    game_status, _ = fixtures.mid_game(4)
+    update = GameStatusUpdate(game_status=game_status)
+    return update.model_dump_json
+
+
+@benchmark("game_log.encode_actions[4p]")
+def _encode_actions():
+    _, actions = fixtures.mid_game(4)
+    return lambda: encode_actions(actions)
+
+
+@benchmark("game_log.encode_snapshot[4p]")
+def _encode_snapshot():
+    game_status, _ = fixtures.mid_game(4)
+    return lambda: encode_snapshot(game_status)
+
+
+@benchmark("game_log_reader.game_status[4p,farthest from snapshot]")
+def _game_log_seek():
+    game_status, actions = fixtures.mid_game(4)
+    with tempfile.TemporaryDirectory() as folder:
+        writer = GameLogWriter(
+            GameLogConfig(game_log_folder=folder, game_log_snapshot_interval=10)
+        )
+        game_log = writer.open_game_log(uuid.uuid4())
+        for _ in range(10):
+            game_log.record_turn(game_status, actions)
+            _, game_status = update_game_status(game_status, actions, is_valid_action)
+        game_log.close(game_status)
+        writer.flush()
+        with GameLogReader(game_log.path) as reader:
+            yield lambda: reader.game_status(reader.last_turn - 1)
+
+
+@benchmark("metrics.histogram.observe")
+def _histogram_observe():
+    histogram = MetricsRegistry().histogram(
+        "phase_seconds", "", ("phase",), FAST_BUCKETS
+    )
+    child = histogram.labels("update_game_status")
+    return lambda: child.observe(0.003)
+
+
+@benchmark("metrics.exposition[100 series]")
+def _exposition():
+    registry = MetricsRegistry()
+    histogram = registry.histogram("phase_seconds", "", ("phase",), FAST_BUCKETS)
+    counter = registry.counter("updates_total", "", ("update_type",))
+    for series in range(50):
+        histogram.labels(f"phase{series}").observe(0.003)
+        counter.labels(f"update{series}").inc()
+    return registry.exposition
+
+
+def _logger(name: str, handler: logging.Handler) -> logging.Logger:
+    # not propagated to the root logger, the handlers of a previous run dropped
+    logger = logging.getLogger(f"benchmark.{name}")
+    logger.setLevel(logging.INFO)
+    logger.propagate = False
+    logger.handlers.clear()
+    handler.setFormatter(
+        logging.Formatter("%(asctime)s %(levelname)s %(name)s %(message)s")
+    )
+    logger.addHandler(handler)
+    return logger
+
+
+def _log_player_connected(logger: logging.Logger):
+    player_id = fixtures.players(1)[0].id
+    return lambda: logger.info("Player %s connected", player_id)
+
+
+@benchmark("logging.info[file handler]")
+def _log_to_file():
+    with tempfile.TemporaryDirectory() as folder:
+        handler = logging.FileHandler(f"{folder}/benchmark.log")
+        try:
+            yield _log_player_connected(_logger("file", handler))
+        finally:
+            handler.close()
+
+
+@benchmark("logging.info[queued]")
+def _log_queued():
+    # the cost on the logging thread, the writer thread does the formatting
+    logger = _logger("queued", logging.NullHandler())
+    log_pipeline = LogPipeline(LoggingConfig(log_rate_limit=0), logger)
+    log_pipeline.start()
+    try:
+        yield _log_player_connected(logger)
+    finally:
+        log_pipeline.stop()
+
+
+@benchmark("logging.info[sampled out]")
+def _log_sampled_out():
+    logger = _logger("sampled_out", logging.NullHandler())
+    log_pipeline = LogPipeline(
+        LoggingConfig(log_sample_rates={"Player %s connected": 0.0}), logger
+    )
+    log_pipeline.start()
+    try:
+        yield _log_player_connected(logger)
+    finally:
+        log_pipeline.stop()
+
+
+@benchmark("logging.debug[below level,lazy]")
+def _log_below_level_lazy():
+    logger = _logger("below_level_lazy", logging.NullHandler())
+    update = fixtures.players(1)[0]
+    return lambda: logger.debug("Broadcast %s", update)
+
+
+@benchmark("logging.debug[below level,f-string]")
+def _log_below_level_f_string():
+    logger = _logger("below_level_f_string", logging.NullHandler())
+    update = fixtures.players(1)[0]
+    return lambda: logger.debug(f"Broadcast {update}")
+
+
+def _register_publish(n_subscribers: int):
+    @benchmark(f"pub_sub.publish[{n_subscribers} subscribers]")
+    def _publish():
+        pub_sub = PubSubManager()
+        for _ in range(n_subscribers):
+            pub_sub.subscribe("topic", lambda update: None)
+        return lambda: pub_sub.publish("topic", "update")
+
+
+def _register_generate_game_status(n_players: int):
+    @benchmark(f"game_status_factory.generate_game_status[template,{n_players}p]")
+    def _generate_from_template():
+        board_templates = fixtures.board_templates()
+        players = set(fixtures.players(n_players))
+        rng = random.Random(0)
+        return lambda: generate_game_status(
+            players, board_templates.generate_board, rng
+        )
+
+    @benchmark(f"game_status_factory.generate_game_status[level,{n_players}p]")
+    def _generate_from_level():
+        players = set(fixtures.players(n_players))
+        level = fixtures.level(n_players)
+        rng = random.Random(0)
+        return lambda: generate_game_status(
+            players, lambda n: generate_board(n, lambda _: level), rng
+        )
+
+
+for _n_subscribers in (1, 8, 100):
+    _register_publish(_n_subscribers)
+
+for _n_players in fixtures.PLAYERS_NUMBERS:
+    _register_generate_game_status(_n_players)
@@ -0,0 +1,64 @@
+import random
+from functools import cache
+from pathlib import Path
+
+from controller.level_loader import LevelLoader
+from model.board.board_factory import BoardTemplates
+from model.board.level import Level
+from model.game_model.game_status.game_status import GameStatus
+from model.game_model.game_status.game_status_factory import generate_game_status
+from model.game_model.game_status.game_status_updater import update_game_status
+from model.game_model.player_action_validator import is_valid_action
+from model.game_model.player_actions import GameAction
+from player.player import Player
+from simulation.simulated_player import RandomPlayer
+
+RESOURCES_PATH = Path(__file__).resolve().parent.parent / "src" / "resources"
+PLAYERS_NUMBERS = range(3, 9)
+
+
+@cache
+def _level_loader() -> LevelLoader:
+    return LevelLoader(level_folder_path=str(RESOURCES_PATH))
+
+
+def level(n_players: int) -> Level:
+    """The level the server plays for the number of players."""
+    return _level_loader().get_level(n_players)
+
+
+@cache
+def board_templates() -> BoardTemplates:
+    return BoardTemplates(level, PLAYERS_NUMBERS)
+
+
+def players(n_players: int) -> list[Player]:
+    return [
+        Player(id=Player.random_id(), username=f"seat{i}") for i in range(n_players)
+    ]
+
+
+def mid_game(
+    n_players: int, turns: int = 6, seed: int = 1234
+) -> tuple[GameStatus, list[list[GameAction]]]:
+    """A game status after some random turns and the actions of the next turn,
+    by seat."""
+    rng = random.Random(seed)
+    game_status = generate_game_status(
+        set(players(n_players)), board_templates().generate_board, rng
+    )
+    random_players = [RandomPlayer(player, rng) for player in game_status.players]
+
+    def _next_actions() -> list[list[GameAction]]:
+        return [
+            random_player.choose_actions(game_status, 3)
+            if seat in game_status.player_order.seats
+            else []
+            for seat, random_player in enumerate(random_players)
+        ]
+
+    for _ in range(turns):
+        _, game_status = update_game_status(
+            game_status, _next_actions(), is_valid_action
+        )
+    return game_status, _next_actions()
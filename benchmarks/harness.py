@@ -0,0 +1,119 @@
+import json
+import platform
+import statistics
+import time
+from collections.abc import Callable, Generator
+from contextlib import closing
+from dataclasses import asdict, dataclass
+from datetime import UTC, datetime
+from pathlib import Path
+
+Operation = Callable[[], object]
+# a benchmark prepares its data and returns the operation to time, or yields it
+# when the data must be cleaned up once the operation is timed
+BenchmarkSetup = Callable[[], Operation | Generator[Operation, None, None]]
+
+_benchmarks: dict[str, BenchmarkSetup] = {}
+
+
+def benchmark(name: str) -> Callable[[BenchmarkSetup], BenchmarkSetup]:
+    def _register(setup: BenchmarkSetup) -> BenchmarkSetup:
+        if name in _benchmarks:
+            raise ValueError(f"Benchmark {name} already registered")
+        _benchmarks[name] = setup
+        return setup
+
+    return _register
+
+
+def registered_benchmarks() -> dict[str, BenchmarkSetup]:
+    return dict(_benchmarks)
+
+
+@dataclass(frozen=True)
+class BenchmarkResult:
+    median_s: float
+    min_s: float
+    stdev_s: float
+    loops: int
+    repeats: int
+
+
+def run_benchmark(
+    setup: BenchmarkSetup, repeats: int = 5, min_repeat_time: float = 0.05
+) -> BenchmarkResult:
+    prepared = setup()
+    if not isinstance(prepared, Generator):
+        return _time_operation(prepared, repeats, min_repeat_time)
+    # closing the generator runs the cleanup of the benchmark
+    with closing(prepared):
+        return _time_operation(next(prepared), repeats, min_repeat_time)
+
+
+def _time_operation(
+    operation: Operation, repeats: int, min_repeat_time: float
+) -> BenchmarkResult:
+    # calibrate the loops so every repeat lasts at least min_repeat_time
+    loops = 1
+    while True:
+        elapsed = _time_loops(operation, loops)
+        if elapsed >= min_repeat_time:
+            break
+        loops *= 2 if elapsed == 0 else max(2, int(min_repeat_time / elapsed) + 1)
+
+    timings = [_time_loops(operation, loops) / loops for _ in range(repeats)]
+    return BenchmarkResult(
+        median_s=statistics.median(timings),
+        min_s=min(timings),
+        stdev_s=statistics.stdev(timings) if repeats > 1 else 0.0,
+        loops=loops,
+        repeats=repeats,
+    )
+
+
+def _time_loops(operation: Operation, loops: int) -> float:
+    start = time.perf_counter()
+    for _ in range(loops):
+        operation()
+    return time.perf_counter() - start
+
+
+def write_results(path: Path, results: dict[str, BenchmarkResult]):
+    data = {
+        "meta": {
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "created_at": datetime.now(UTC).isoformat(),
+        },
+        "results": {name: asdict(result) for name, result in results.items()},
+    }
+    path.write_text(json.dumps(data, indent=2, sort_keys=True), encoding="utf-8")
+
+
+def read_results(path: Path) -> dict[str, BenchmarkResult]:
+    data = json.loads(path.read_text(encoding="utf-8"))
+    return {name: BenchmarkResult(**result) for name, result in data["results"].items()}
+
+
+@dataclass(frozen=True)
+class Comparison:
+    name: str
+    baseline_s: float
+    current_s: float
+
+    @property
+    def ratio(self) -> float:
+        return self.current_s / self.baseline_s if self.baseline_s else float("inf")
+
+    def is_regression(self, threshold: float) -> bool:
+        return self.ratio > 1 + threshold
+
+
+def compare_results(
+    baseline: dict[str, BenchmarkResult], current: dict[str, BenchmarkResult]
+) -> list[Comparison]:
+    """Compare the medians of the benchmarks present in both result sets."""
+    return [
+        Comparison(name, baseline[name].median_s, current[name].median_s)
+        for name in sorted(baseline.keys() & current.keys())
+    ]
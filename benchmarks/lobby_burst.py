@@ -0,0 +1,108 @@
+"""Measure time-to-game, lobby latency and lobby CPU while a burst of players
+connects.
+
+Run with ``PYTHONPATH=src python benchmarks/lobby_burst.py --players 10000``;
+``--session-ms`` adds the CPU cost of creating the session of every game.
+"""
+
+import argparse
+import random
+import statistics
+import time
+from threading import Event
+
+from lobby.lobbies_controller import LobbiesController
+from lobby.lobby_config import lobby_config
+from metrics.metrics import metrics_registry
+from player.player import Player
+from session.session import Session
+
+
+class _NoOpSession(Session):
+    def __init__(self, on_start):
+        self._on_start = on_start
+
+    def start(self):
+        self._on_start()
+
+    def send_private_update(self, player_id, update):
+        pass
+
+    def send_broadcast_update(self, update, player_views=None):
+        pass
+
+    def game_is_over(self):
+        pass
+
+
+def _burn(seconds: float):
+    end = time.thread_time() + seconds
+    while time.thread_time() < end:
+        pass
+
+
+def run(n_players: int, seed: int, session_ms: float = 0.0) -> dict[str, float]:
+    rng = random.Random(seed)
+    joined_at: dict[Player, float] = {}
+    time_to_game: list[float] = []
+    done = Event()
+
+    def _session_factory(players: set[Player]) -> Session:
+        _burn(session_ms / 1000)
+
+        def _on_start():
+            now = time.perf_counter()
+            time_to_game.extend(now - joined_at[player] for player in players)
+            if len(time_to_game) == n_players:
+                done.set()
+
+        return _NoOpSession(_on_start)
+
+    controller = LobbiesController(_session_factory)
+    cpu_counter = metrics_registry.get("lobby_cpu_seconds_total")
+    cpu_before = cpu_counter.value
+
+    # the latency of a no-op task queued on the lobby thread, like a join
+    probes = []
+    start = time.perf_counter()
+    for i in range(n_players):
+        player = Player(id=Player.random_id(), username=f"p{i}")
+        joined_at[player] = time.perf_counter()
+        controller.add_player_in_lobby(
+            rng.randint(
+                lobby_config.min_number_of_player, lobby_config.max_number_of_player
+            ),
+            player,
+        )
+        if i % 100 == 0:
+            probes.append(
+                (time.perf_counter(), controller._executor.submit(time.perf_counter))
+            )
+    # players left over in partially filled lobbies wait for the flexible policy
+    done.wait(timeout=lobby_config.flexible_matchmaking_wait + 10)
+    elapsed = time.perf_counter() - start
+
+    quantiles = statistics.quantiles(time_to_game, n=100)
+    latencies = [future.result() - submitted_at for submitted_at, future in probes]
+    latency_quantiles = statistics.quantiles(latencies, n=100)
+    return {
+        "players": n_players,
+        "matched_players": len(time_to_game),
+        "elapsed_seconds": elapsed,
+        "time_to_game_p50_seconds": quantiles[49],
+        "time_to_game_p99_seconds": quantiles[98],
+        "lobby_latency_p50_ms": latency_quantiles[49] * 1e3,
+        "lobby_latency_p99_ms": latency_quantiles[98] * 1e3,
+        "lobby_cpu_us_per_join": (cpu_counter.value - cpu_before) / n_players * 1e6,
+    }
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--players", type=int, default=10_000)
+    parser.add_argument("--seed", type=int, default=1234)
+    parser.add_argument("--session-ms", type=float, default=0.0)
+    args = parser.parse_args()
+
+    for key, value in run(args.players, args.seed, args.session_ms).items():
+        print(f"{key}: {value:.6g}")
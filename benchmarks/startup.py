@@ -0,0 +1,125 @@
+"""Measure the cold start of the server: the import of ``main``.
+
+Every run is a fresh interpreter started with ``-X importtime``; the fastest
+run is reported with its slowest modules. The exit status is non-zero when
+the import is over the budget or pulls one of the heavy modules the server
+does not need to accept a connection.
+
+Run with ``PYTHONPATH=src python -m benchmarks.startup --runs 5``.
+"""
+
+import argparse
+import os
+import subprocess
+import sys
+from dataclasses import dataclass
+from pathlib import Path
+
+_REPOSITORY_ROOT = Path(__file__).resolve().parent.parent
+
+# generous for slow CI machines, the import takes about half of it
+STARTUP_BUDGET_SECONDS = 1.5
+# imported only by tools, simulations, the __main__ block or the first game of
+# each size, which parses its level
+HEAVY_MODULES = (
+    "black",
+    "numpy",
+    "uvicorn",
+    "model.board.level_format",
+    "model.board.level_generator",
+)
+
+_MEASURE_IMPORT = (
+    "import time; start = time.perf_counter(); import {module}; "
+    "print(time.perf_counter() - start)"
+)
+
+
+@dataclass(frozen=True)
+class ImportTime:
+    module: str
+    self_seconds: float
+    cumulative_seconds: float
+
+
+@dataclass(frozen=True)
+class StartupReport:
+    seconds: float
+    imports: list[ImportTime]
+
+    def imported(self, module: str) -> bool:
+        return any(
+            i.module == module or i.module.startswith(f"{module}.")
+            for i in self.imports
+        )
+
+    def slowest(self, n: int) -> list[ImportTime]:
+        return sorted(self.imports, key=lambda i: i.self_seconds, reverse=True)[:n]
+
+
+def measure_startup(module: str = "main", runs: int = 3) -> StartupReport:
+    return min((_measure_once(module) for _ in range(runs)), key=lambda r: r.seconds)
+
+
+def _measure_once(module: str) -> StartupReport:
+    env = {**os.environ, "PYTHONPATH": str(_REPOSITORY_ROOT / "src")}
+    completed = subprocess.run(
+        [
+            sys.executable,
+            "-X",
+            "importtime",
+            "-c",
+            _MEASURE_IMPORT.format(module=module),
+        ],
+        cwd=_REPOSITORY_ROOT,
+        env=env,
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    return StartupReport(
+        seconds=float(completed.stdout.strip().splitlines()[-1]),
+        imports=_parse_importtime(completed.stderr),
+    )
+
+
+def _parse_importtime(stderr: str) -> list[ImportTime]:
+    # import time: self [us] | cumulative | imported package
+    imports = []
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or "imported package" in line:
+            continue
+        self_us, cumulative_us, module = line.removeprefix("import time:").split("|")
+        imports.append(
+            ImportTime(module.strip(), int(self_us) / 1e6, int(cumulative_us) / 1e6)
+        )
+    return imports
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--module", default="main")
+    parser.add_argument("--runs", type=int, default=3)
+    parser.add_argument("--top", type=int, default=20)
+    parser.add_argument("--budget", type=float, default=STARTUP_BUDGET_SECONDS)
+    args = parser.parse_args()
+
+    report = measure_startup(args.module, args.runs)
+    for i in report.slowest(args.top):
+        print(
+            f"{i.module:<60} {i.self_seconds * 1e3:>8.2f} ms "
+            f"{i.cumulative_seconds * 1e3:>8.2f} ms cumulative"
+        )
+    print(f"\nimport {args.module}: {report.seconds * 1e3:.1f} ms")
+    print(f"modules imported: {len(report.imports)}")
+
+    heavy = [module for module in HEAVY_MODULES if report.imported(module)]
+    if heavy:
+        print(f"heavy modules imported: {', '.join(heavy)}")
+    if report.seconds > args.budget:
+        print(f"over the budget of {args.budget * 1e3:.0f} ms")
+    return 1 if heavy or report.seconds > args.budget else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
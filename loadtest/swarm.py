@@ -0,0 +1,374 @@
+"""Websocket load generator for the /hex-core endpoint.
+
+Starts ``main.app`` in a local uvicorn process (or targets ``--url``), opens
+many concurrent clients that join with varied lobby sizes and play scripted
+actions, then reports latencies as p50/p99:
+
+- join to game start: from connecting to the first game status;
+- action acknowledgement: from sending an action to its approved, illegal or
+  insufficient points answer;
+- broadcast fan-out skew: spread of the arrival times of one broadcast among
+  the players of a game;
+- dropped messages: broadcasts that reached only part of a game's players.
+
+Run from the repository root, raising the open files limit for big swarms:
+
+    ulimit -n 65536
+    PYTHONPATH=src python -m loadtest.swarm --clients 2000 --duration 60
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import random
+import socket
+import statistics
+import subprocess
+import sys
+import time
+from collections import Counter, defaultdict
+from contextlib import contextmanager, suppress
+from dataclasses import dataclass, field
+from pathlib import Path
+
+from websockets.asyncio.client import connect
+from websockets.exceptions import WebSocketException
+
+_REPOSITORY_ROOT = Path(__file__).resolve().parent.parent
+
+# shorter turns than production, so games complete during a run
+DEFAULT_SERVER_ENV = {
+    "TURN_PREPARATION_TIME": "2",
+    "SEND_UPDATE_RATION": "0.05",
+    "MAX_TURNS": "5",
+    "FLEXIBLE_MATCHMAKING_WAIT": "5",
+}
+
+_ACK_TYPES = {
+    "approved_action_update",
+    "illegal_action_update",
+    "insufficient_action_points_update",
+}
+_PERSONAL_TYPES = _ACK_TYPES | {
+    "remaining_action_points_update",
+    "cancelled_action_update",
+    "resume_token_update",
+}
+_TROOP_TYPES = ("triangle_troop", "square_troop", "pentagon_troop")
+
+
+@dataclass
+class SwarmStats:
+    join_to_game_start: list[float] = field(default_factory=list)
+    action_ack: list[float] = field(default_factory=list)
+    # broadcast key -> arrival time at each receiving client
+    broadcast_arrivals: dict[tuple, list[float]] = field(
+        default_factory=lambda: defaultdict(list)
+    )
+    game_sizes: dict[tuple, int] = field(default_factory=dict)
+    games_over: set[tuple] = field(default_factory=set)
+    messages: int = 0
+    refused_connections: int = 0
+    errors: Counter[str] = field(default_factory=Counter)
+
+
+def _percentiles(values: list[float]) -> tuple[float, float]:
+    if not values:
+        return float("nan"), float("nan")
+    if len(values) == 1:
+        return values[0], values[0]
+    quantiles = statistics.quantiles(values, n=100, method="inclusive")
+    return quantiles[49], quantiles[98]
+
+
+def _scripted_actions(game_status: dict, username: str, rng: random.Random):
+    """Spawn next to the home base and march a troop, as a casual player would."""
+    tiles = {
+        (q, r): troop
+        for q, r, troop in game_status["board"]["coordinates_to_occupation"]
+    }
+    # troops refer to the players by seat, the index in the players of the game
+    seat = next(
+        seat
+        for seat, player in enumerate(game_status["players"])
+        if player["username"] == username
+    )
+
+    def _neighbours(q: int, r: int):
+        for dq, dr in ((1, 0), (1, -1), (0, -1), (-1, 0), (-1, 1), (0, 1)):
+            if (q + dq, r + dr) in tiles:
+                yield q + dq, r + dr
+
+    def _is_own(troop) -> bool:
+        return troop is not None and troop["owner"] == seat
+
+    actions = []
+    for (q, r), troop in tiles.items():
+        if not _is_own(troop):
+            continue
+        if troop["troop_type"] == "home_base_troop":
+            free = [tile for tile in _neighbours(q, r) if tiles[tile] is None]
+            if free:
+                spawn_q, spawn_r = rng.choice(free)
+                actions.append(
+                    {
+                        "action_type": "spawn_troop_action",
+                        "coordinates": {"q": spawn_q, "r": spawn_r},
+                        "troop": {
+                            "troop_type": rng.choice(_TROOP_TYPES),
+                            "owner": seat,
+                        },
+                    }
+                )
+        else:
+            targets = [tile for tile in _neighbours(q, r) if not _is_own(tiles[tile])]
+            if targets:
+                to_q, to_r = rng.choice(targets)
+                actions.append(
+                    {
+                        "player_action_type": "march_troop_action",
+                        "starting_coordinates": {"q": q, "r": r},
+                        "destination_coordinates": {"q": to_q, "r": to_r},
+                    }
+                )
+    rng.shuffle(actions)
+    return actions[:2]
+
+
+async def _play(
+    url: str,
+    username: str,
+    lobby_size: int,
+    stats: SwarmStats,
+    stop: asyncio.Event,
+    rng: random.Random,
+):
+    connected_at = time.perf_counter()
+    pending_actions: list[float] = []
+    game_key: tuple | None = None
+    turn = 0
+
+    try:
+        while not stop.is_set():
+            retry_after = None
+            async with connect(
+                f"{url}?username={username}&lobby_size={lobby_size}", max_size=None
+            ) as websocket:
+                while not stop.is_set():
+                    try:
+                        message = await asyncio.wait_for(websocket.recv(), timeout=1.0)
+                    except TimeoutError:
+                        continue
+                    received_at = time.perf_counter()
+                    stats.messages += 1
+                    update = json.loads(message)
+                    update_type = update.get("update_type")
+                    # a broadcast reaches every player with the seq of its stream
+                    broadcast = message.partition(",")[2]
+
+                    if update_type == "retry_after_update":
+                        stats.refused_connections += 1
+                        retry_after = update["retry_after"]
+                        break
+
+                    if update_type in _ACK_TYPES and pending_actions:
+                        stats.action_ack.append(received_at - pending_actions.pop(0))
+
+                    if update_type not in _PERSONAL_TYPES and game_key is not None:
+                        stats.broadcast_arrivals[
+                            (game_key, turn, update_type, broadcast)
+                        ].append(received_at)
+
+                    if update_type == "game_status_update":
+                        game_status = update["game_status"]
+                        if game_key is None:
+                            players = game_status["players"]
+                            game_key = tuple(sorted(player["id"] for player in players))
+                            stats.game_sizes[game_key] = len(players)
+                            stats.join_to_game_start.append(received_at - connected_at)
+                            stats.broadcast_arrivals[
+                                (game_key, turn, update_type, broadcast)
+                            ].append(received_at)
+                        turn += 1
+
+                        for action in _scripted_actions(game_status, username, rng):
+                            pending_actions.append(time.perf_counter())
+                            await websocket.send(
+                                json.dumps(
+                                    {
+                                        "request_type": "save_action_request",
+                                        "game_action": action,
+                                    }
+                                )
+                            )
+                    elif update_type == "game_over_update":
+                        stats.games_over.add(game_key)
+                        return
+            if retry_after is None:
+                return
+            # refused under load, connect again later
+            with suppress(TimeoutError):
+                await asyncio.wait_for(stop.wait(), retry_after)
+    except (OSError, WebSocketException, ValueError) as e:
+        # connection failures and malformed messages, counted by type
+        stats.errors[type(e).__name__] += 1
+
+
+def _report(stats: SwarmStats, clients: int, elapsed: float, cutoff: float) -> dict:
+    skews = []
+    delivered = 0
+    dropped = 0
+    for (game_key, *_), arrivals in stats.broadcast_arrivals.items():
+        # broadcasts still in flight when the run stopped are not counted
+        if min(arrivals) > cutoff:
+            continue
+        expected = stats.game_sizes.get(game_key, len(arrivals))
+        delivered += len(arrivals)
+        dropped += max(0, expected - len(arrivals))
+        if len(arrivals) > 1:
+            skews.append(max(arrivals) - min(arrivals))
+
+    join_p50, join_p99 = _percentiles(stats.join_to_game_start)
+    ack_p50, ack_p99 = _percentiles(stats.action_ack)
+    skew_p50, skew_p99 = _percentiles(skews)
+    return {
+        "clients": clients,
+        "elapsed_seconds": elapsed,
+        "games_started": len(stats.game_sizes),
+        "games_over": len(stats.games_over),
+        "messages_per_second": stats.messages / elapsed,
+        "join_to_game_start_p50_ms": join_p50 * 1e3,
+        "join_to_game_start_p99_ms": join_p99 * 1e3,
+        "action_ack_p50_ms": ack_p50 * 1e3,
+        "action_ack_p99_ms": ack_p99 * 1e3,
+        "broadcast_skew_p50_ms": skew_p50 * 1e3,
+        "broadcast_skew_p99_ms": skew_p99 * 1e3,
+        "broadcasts_delivered": delivered,
+        "broadcasts_dropped": dropped,
+        "refused_connections": stats.refused_connections,
+        "connection_errors": dict(stats.errors),
+    }
+
+
+async def run_swarm(
+    url: str,
+    clients: int,
+    duration: float,
+    ramp_up: float,
+    lobby_sizes: list[int],
+    seed: int,
+) -> dict:
+    rng = random.Random(seed)
+    stats = SwarmStats()
+    stop = asyncio.Event()
+    start = time.perf_counter()
+
+    tasks = []
+    for client in range(clients):
+        await asyncio.sleep(ramp_up / clients)
+        tasks.append(
+            asyncio.create_task(
+                _play(
+                    url,
+                    f"u{client:05x}",
+                    rng.choice(lobby_sizes),
+                    stats,
+                    stop,
+                    random.Random(rng.random()),
+                )
+            )
+        )
+
+    await asyncio.wait(tasks, timeout=max(0.0, duration - ramp_up))
+    stop.set()
+    cutoff = time.perf_counter() - 1.0
+    await asyncio.gather(*tasks)
+
+    return _report(stats, clients, time.perf_counter() - start, cutoff)
+
+
+def _free_port() -> int:
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+@contextmanager
+def local_server(port: int, server_env: dict[str, str]):
+    env = {
+        **os.environ,
+        **server_env,
+        "PYTHONPATH": str(_REPOSITORY_ROOT / "src"),
+    }
+    process = subprocess.Popen(
+        [
+            sys.executable,
+            "-m",
+            "uvicorn",
+            "main:app",
+            "--port",
+            str(port),
+            "--log-level",
+            "warning",
+        ],
+        cwd=_REPOSITORY_ROOT,
+        env=env,
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.DEVNULL,
+    )
+    try:
+        deadline = time.monotonic() + 30
+        while time.monotonic() < deadline:
+            try:
+                socket.create_connection(("127.0.0.1", port), timeout=0.5).close()
+                break
+            except OSError:
+                time.sleep(0.1)
+        else:
+            raise RuntimeError("Local server did not start within 30 seconds")
+        yield f"ws://127.0.0.1:{port}/hex-core"
+    finally:
+        process.terminate()
+        try:
+            process.wait(timeout=10)
+        except subprocess.TimeoutExpired:
+            # running games keep non-daemon executor threads alive
+            process.kill()
+            process.wait()
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter
+    )
+    parser.add_argument("--clients", type=int, default=300)
+    parser.add_argument("--duration", type=float, default=60.0)
+    parser.add_argument("--ramp-up", type=float, default=5.0)
+    parser.add_argument("--lobby-sizes", default="3,4,5,6,7,8")
+    parser.add_argument("--seed", type=int, default=1234)
+    parser.add_argument(
+        "--url", default=None, help="target a running server, e.g. ws://host/hex-core"
+    )
+    args = parser.parse_args()
+    lobby_sizes = [int(size) for size in args.lobby_sizes.split(",")]
+
+    def _run(url: str) -> dict:
+        return asyncio.run(
+            run_swarm(
+                url, args.clients, args.duration, args.ramp_up, lobby_sizes, args.seed
+            )
+        )
+
+    if args.url is not None:
+        report = _run(args.url)
+    else:
+        with local_server(_free_port(), DEFAULT_SERVER_ENV) as url:
+            report = _run(url)
+
+    for key, value in report.items():
+        print(f"{key}: {value:.3f}" if isinstance(value, float) else f"{key}: {value}")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,53 +1,82 @@
+import asyncio
 import logging
+import random
+import secrets
 from contextlib import asynccontextmanager
+from uuid import UUID
 
-import uvicorn
-from fastapi import FastAPI, WebSocket
+from fastapi import Depends, FastAPI, Header, HTTPException, WebSocket
+from fastapi.responses import PlainTextResponse
 from pydantic import BaseModel, Field, ValidationError
 
-from controller.action_point_calculator import calculate_action_points
+from controller.action_point_calculator import action_points_cost
 from controller.game_controller import GameController
 from controller.game_controller_setup import GameControllerSetup
+from controller.game_update import RetryAfterUpdate
 from controller.level_loader import LevelLoader
+from game_log.game_log_writer import game_log_writer
 from lobby.lobbies_controller import LobbiesController
 from lobby.lobby_config import lobby_config
-from model.board.board_factory import generate_board
+from metrics.admin_config import admin_config
+from metrics.admission_controller import admission_controller
+from metrics.game_accounting import game_accounting
+from metrics.log_pipeline import log_pipeline
+from metrics.logging_config import logging_config
+from metrics.metrics import metrics_registry
+from metrics.runtime_monitor import runtime_monitor
+from model.board.board_factory import BoardTemplates
+from model.game_model.game_rng import game_rng
 from model.game_model.game_status.game_status_factory import generate_game_status
 from model.game_model.game_status.game_status_updater import update_game_status
+from model.game_model.legal_actions import legal_actions_by_seat
 from model.game_model.player_action_validator import is_valid_action
 from player.player import Player
 from player.player_config import player_config
 from session.game_session import GameSession
 from session.remote_player_interface import RemotePlayerInterface
+from session.remote_update import encode_update
 from session.session import Session
+from session.spectator_config import spectator_config
+from session.spectator_hub import spectator_hub
 
+# levels and board templates are built by the first game of each size
 level_loader = LevelLoader(level_folder_path="src/resources/")
-level_loader.load_levels()
+board_templates = BoardTemplates(level_loader.get_level)
 
 
-def _board_factory(players: list[Player]):
-    return generate_board(players, level_loader.get_level)
+def _game_status_factory(players: set[Player], rng: random.Random):
+    return generate_game_status(players, board_templates.generate_board, rng)
 
 
-def _game_status_factory(players: set[Player]):
-    return generate_game_status(players, _board_factory)
-
-
-def _game_controller_factory(players: set[Player], session: Session) -> GameController:
+def _game_controller_factory(
+    players: set[Player], session: GameSession
+) -> GameController:
     return GameController(
         GameControllerSetup(
             update_game_status,
             is_valid_action,
-            calculate_action_points,
+            action_points_cost,
             _game_status_factory,
+            legal_actions_by_seat,
         ),
         players,
         session,
+        game_log=game_log_writer.open_game_log(session.game_id),
+        # a game is reproduced from the root seed and its id
+        rng=game_rng(session.game_id),
+        account=game_accounting.open_account(session.game_id),
     )
 
 
+def _session_buffers(session: GameSession) -> dict[str, object]:
+    return {
+        "update_streams": player_interface.update_rings(session.players_id),
+        "spectator_ring": spectator_hub.ring(session.game_id),
+    }
+
+
 def _session_factory(players: set[Player]) -> Session:
-    return GameSession(players, _game_controller_factory)
+    return GameSession(players, _game_controller_factory, _session_buffers)
 
 
 class _JoinRequest(BaseModel):
@@ -63,33 +92,101 @@ class _JoinRequest(BaseModel):
     )
 
 
+class _ResumeRequest(BaseModel):
+    resume_token: str = Field(..., min_length=1)
+    # -1 when no update was received
+    last_seq: int = Field(default=-1, ge=-1)
+
+
+class _SpectateRequest(BaseModel):
+    game_id: UUID
+    delay: float = Field(default=0, ge=0, le=spectator_config.spectator_max_delay)
+
+
+# websocket close code of a connection refused under load
+_TRY_AGAIN_LATER = 1013
+
 player_interface = RemotePlayerInterface()
-lobbies_controller = LobbiesController(_session_factory)
-logging.basicConfig(level=logging.INFO)
+lobbies_controller = LobbiesController(
+    _session_factory, admit_game_start=admission_controller.admit_game_start
+)
+logging.basicConfig(level=logging_config.log_level)
 
 
 @asynccontextmanager
 async def lifespan(_):
     """Application lifespan - startup and shutdown"""
     # Startup
+    log_pipeline.start()
     player_interface.start()
+    runtime_monitor.watch_event_loop("main", asyncio.get_running_loop())
+    runtime_monitor.start()
+    spectator_hub.start(asyncio.get_running_loop())
     yield
     # Shutdown
+    spectator_hub.stop()
+    runtime_monitor.stop()
     player_interface.shutdown()
+    game_log_writer.shutdown()
+    log_pipeline.stop()
 
 
 app = FastAPI(lifespan=lifespan)
 
 
+def _require_admin(authorization: str | None = Header(default=None)):
+    # no token configured, the admin endpoints stay closed
+    expected = f"Bearer {admin_config.admin_token}"
+    if not admin_config.admin_token or not secrets.compare_digest(
+        authorization or "", expected
+    ):
+        raise HTTPException(status_code=403)
+
+
+@app.get(
+    "/metrics",
+    response_class=PlainTextResponse,
+    dependencies=[Depends(_require_admin)],
+)
+async def metrics():
+    return PlainTextResponse(
+        metrics_registry.exposition(), media_type="text/plain; version=0.0.4"
+    )
+
+
+@app.get("/admin/games", dependencies=[Depends(_require_admin)])
+async def admin_games():
+    # CPU time and retained memory by game, to find the expensive ones
+    return game_accounting.report()
+
+
 @app.websocket("/hex-core")
 async def websocket_endpoint(websocket: WebSocket):
     params = websocket.query_params
+    if "resume_token" in params:
+        try:
+            resume_request = _ResumeRequest(
+                resume_token=params.get("resume_token"),
+                last_seq=params.get("last_seq", -1),
+            )
+        except ValidationError:
+            await websocket.close(code=400)
+            return
+
+        await player_interface.resume_connection(
+            resume_request.resume_token, resume_request.last_seq, websocket
+        )
+        return
+
     lobby_size = params.get("lobby_size")
     try:
         join_request = _JoinRequest(
             lobby_size=int(lobby_size) if lobby_size is not None else None,
             username=params.get("username"),
         )
+        if not admission_controller.admit_connection():
+            await _refuse_connection(websocket)
+            return
         player_id = Player.random_id()
 
         await player_interface.new_connection(
@@ -100,5 +197,37 @@ async def websocket_endpoint(websocket: WebSocket):
         await websocket.close(code=400)
 
 
+async def _refuse_connection(websocket: WebSocket):
+    # the games running keep their latency, the client comes back later
+    retry_after = admission_controller.retry_after
+    await websocket.accept()
+    await websocket.send_text(encode_update(RetryAfterUpdate(retry_after=retry_after)))
+    await websocket.close(code=_TRY_AGAIN_LATER, reason=f"retry after {retry_after}s")
+
+
+@app.get("/games")
+async def games():
+    return {"game_ids": spectator_hub.game_ids()}
+
+
+@app.websocket("/hex-core/spectate")
+async def spectate_endpoint(websocket: WebSocket):
+    params = websocket.query_params
+    try:
+        spectate_request = _SpectateRequest(
+            game_id=params.get("game_id"), delay=params.get("delay", 0)
+        )
+    except ValidationError:
+        await websocket.close(code=400)
+        return
+
+    # served on this loop, the frames are already encoded
+    await spectator_hub.spectate(
+        spectate_request.game_id, websocket, spectate_request.delay
+    )
+
+
 if __name__ == "__main__":
+    import uvicorn
+
     uvicorn.run(app, host="0.0.0.0", port=8000)
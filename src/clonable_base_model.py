@@ -1,14 +1,14 @@
 from typing import Self
 
-from pydantic import BaseModel
+from pydantic import BaseModel, ConfigDict
 
 
 class ClonableBaseModel(BaseModel):
+    model_config = ConfigDict(defer_build=True)
 
     def copy_with(self, **kwargs) -> Self:
-        data = self.model_dump()
-        data.update(kwargs)
-        return type(self)(**data)
+        # models are never mutated in place, a shallow copy is enough
+        return self.model_copy(update=kwargs)
 
     def just_copy(self):
         return self.copy_with()
@@ -1,21 +1,26 @@
-from typing import Callable
+import random
+from collections.abc import Callable, Sequence
 
+from model.board.hexagon_coordinates import HexagonCoordinates
 from model.game_model.game_event import GameEvent
 from model.game_model.game_status.game_status import GameStatus
 from model.game_model.player_actions import GameAction
-from player.player import Player
+from player.player import Player, Seat
 
 UpdateModelFunction = Callable[
     [
         GameStatus,
-        dict[Player, list[GameAction]],
-        Callable[[Player, GameAction, GameStatus], bool],
+        Sequence[list[GameAction]],
+        Callable[[Seat, GameAction, GameStatus], bool],
+        Callable[[GameStatus, set[HexagonCoordinates]], None] | None,
     ],
     tuple[list[GameEvent], GameStatus],
 ]
 
-ActionValidationFunction = Callable[[Player, GameAction, GameStatus], bool]
+ActionValidationFunction = Callable[[Seat, GameAction, GameStatus], bool]
 
-ActionPointCalculationFunction = Callable[[list[GameAction]], int]
+ActionCostFunction = Callable[[GameAction], int]
 
-GameStatusFactory = Callable[[set[Player]], GameStatus]
+GameStatusFactory = Callable[[set[Player], random.Random], GameStatus]
+
+LegalActionsFunction = Callable[[GameStatus], dict[Seat, list[GameAction]]]
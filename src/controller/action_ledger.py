@@ -0,0 +1,55 @@
+from collections.abc import Callable
+
+from model.game_model.player_actions import GameAction
+
+ActionID = int
+
+
+class ActionLedger:
+    """Actions selected by a player during a planning phase.
+
+    The spent action points are kept as a running total, so appending,
+    cancelling and undoing an action never re-sums the whole list.
+    """
+
+    def __init__(self, action_points: int, action_cost_fn: Callable[[GameAction], int]):
+        self._action_points = action_points
+        self._action_cost_fn = action_cost_fn
+        self._spent_action_points = 0
+        # dicts keep insertion order: O(1) append, cancel by id and undo of the last
+        self._actions: dict[ActionID, GameAction] = {}
+        self._next_action_id: ActionID = 0
+
+    @property
+    def remaining_action_points(self) -> int:
+        return self._action_points - self._spent_action_points
+
+    def can_afford(self, action: GameAction) -> bool:
+        return self._action_cost_fn(action) <= self.remaining_action_points
+
+    def append(self, action: GameAction) -> ActionID:
+        action_id = self._next_action_id
+        self._next_action_id += 1
+        self._actions[action_id] = action
+        self._spent_action_points += self._action_cost_fn(action)
+        return action_id
+
+    def cancel(self, action_id: ActionID) -> GameAction | None:
+        action = self._actions.pop(action_id, None)
+        if action is not None:
+            self._spent_action_points -= self._action_cost_fn(action)
+        return action
+
+    def undo_last(self) -> tuple[ActionID, GameAction] | None:
+        if not self._actions:
+            return None
+        action_id, action = self._actions.popitem()
+        self._spent_action_points -= self._action_cost_fn(action)
+        return action_id, action
+
+    def clear(self):
+        self._actions.clear()
+        self._spent_action_points = 0
+
+    def actions(self) -> list[GameAction]:
+        return list(self._actions.values())
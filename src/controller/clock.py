@@ -0,0 +1,20 @@
+import time
+from abc import ABC, abstractmethod
+
+
+class Clock(ABC):
+    @abstractmethod
+    def monotonic(self) -> float:
+        pass
+
+    @abstractmethod
+    def sleep(self, seconds: float) -> None:
+        pass
+
+
+class WallClock(Clock):
+    def monotonic(self) -> float:
+        return time.monotonic()
+
+    def sleep(self, seconds: float) -> None:
+        time.sleep(seconds)
@@ -3,9 +3,14 @@ from pydantic_settings import BaseSettings
 
 
 class ControllerConfig(BaseSettings):
-    turn_preparation_time: int = Field(default=30, gt=0)
+    turn_preparation_time: float = Field(default=30, gt=0)
     default_action_points: int = Field(default=3, gt=0)
-    send_update_ration: int = Field(default=2, gt=0)
+    send_update_ration: float = Field(default=2, gt=0)
+    push_legal_actions: bool = Field(default=False)
+    # boards with fewer tiles are sent whole to every player
+    interest_min_tiles: int = Field(default=2000, ge=0)
+    interest_radius: int = Field(default=4, ge=1)
+    interest_cell_size: int = Field(default=8, gt=0)
 
 
 controller_config = ControllerConfig()
@@ -1,23 +1,70 @@
+import logging
+import random
 import time
-from collections import defaultdict
-from concurrent.futures.thread import ThreadPoolExecutor
-from typing import DefaultDict
+import uuid
+from collections.abc import Callable
+from concurrent.futures import Executor
+from contextlib import contextmanager, nullcontext
 
+from controller.action_ledger import ActionID, ActionLedger
+from controller.clock import Clock, WallClock
 from controller.controller_config import controller_config
 from controller.game_controller_setup import GameControllerSetup
 from controller.game_update import (
-    GameStatusUpdate,
-    RemainingActionPointsUpdate,
-    PlanningPhaseTimeUpdate,
-    GameOverUpdate,
-    InsufficientActionPointsUpdate,
     ApprovedActionUpdate,
+    CancelledActionUpdate,
+    GameOverUpdate,
+    GameStatusUpdate,
     IllegalActionUpdate,
+    InsufficientActionPointsUpdate,
+    LegalActionsUpdate,
+    PersonalUpdate,
+    PlanningPhaseTimeUpdate,
+    RemainingActionPointsUpdate,
 )
+from controller.validation_cache import ValidationCache
+from game_log.game_log_writer import GameLog
+from metrics.game_accounting import GameAccount, retained_bytes
+from metrics.metrics import FAST_BUCKETS, metrics_registry
+from metrics.runtime_monitor import MonitoredThreadPoolExecutor
+from metrics.tracing import Trace
+from model.board.hexagon_coordinates import HexagonCoordinates
+from model.game_model.game_event import GameEvent
+from model.game_model.game_rng import game_rng
+from model.game_model.game_status.game_status import GameStatus
 from model.game_model.player_actions import GameAction
-from player.player import Player
+from player.player import Player, PlayerID, Seat
 from session.session import Session
 
+logger = logging.getLogger(__name__)
+
+_phase_seconds = metrics_registry.histogram(
+    "game_controller_phase_seconds",
+    "Time spent in each game controller phase, deliberate sleeps excluded.",
+    ("phase",),
+    buckets=FAST_BUCKETS,
+)
+# children bound once, labels lookups stay off the game loop
+_phases = {
+    phase: _phase_seconds.labels(phase)
+    for phase in (
+        "status_send",
+        "planning",
+        "update_game_status",
+        "event_broadcast",
+        "game_over_check",
+    )
+}
+
+
+@contextmanager
+def _measure_phase(phase: str):
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        _phases[phase].observe(time.perf_counter() - start)
+
 
 class GameController:
     def __init__(
@@ -25,137 +72,345 @@ class GameController:
         setup: GameControllerSetup,
         players: set[Player],
         session: Session,
+        clock: Clock | None = None,
+        executor: Executor | None = None,
+        game_log: GameLog | None = None,
+        rng: random.Random | None = None,
+        account: GameAccount | None = None,
     ):
         self._setup = setup
-        self._players_actions: DefaultDict[Player, list[GameAction]] = defaultdict(list)
-        self._game_status = setup.game_status_factory(players)
-        self._executor = ThreadPoolExecutor(max_workers=1)
+        # every random choice of the game comes from its own stream
+        self._rng = rng or game_rng(uuid.uuid4())
+        self._game_status = setup.game_status_factory(players, self._rng)
+        # the engine refers to players by seat, the ids are only seen here
+        self._players = list(self._game_status.players)
+        self._seats: dict[PlayerID, Seat] = {
+            player.id: seat for seat, player in enumerate(self._players)
+        }
+        self._ledgers = [
+            ActionLedger(controller_config.default_action_points, setup.action_cost_fn)
+            for _ in self._players
+        ]
+        self._validation_cache = ValidationCache(setup.action_validator_fn)
+        self._interest_manager = self._new_interest_manager()
+        self._executor = executor or MonitoredThreadPoolExecutor(
+            "game_controller", max_workers=1
+        )
+        self._clock = clock or WallClock()
         self._is_in_selection_phase = True
         self._session = session
+        self._game_log = game_log
+        self._account = account
+        self._is_over = False
 
     def start(self):
-        self._executor.submit(self._send_status_phase)
+        self._submit_phase(self._send_status_phase)
 
     # 1
     def _send_status_phase(self):
-        self._session.send_broadcast_update(
-            GameStatusUpdate(game_status=self._game_status)
-        )
+        with _measure_phase("status_send"):
+            # open the selection before sending the status, players may answer at once
+            for ledger in self._ledgers:
+                ledger.clear()
+            self._is_in_selection_phase = True
 
-        for player in self._game_status.player_order.players:
-            self._session.send_private_update(
-                player.id,
-                RemainingActionPointsUpdate(
-                    remaining_action_points=controller_config.default_action_points,
-                ),
+            self._session.send_broadcast_update(
+                GameStatusUpdate(game_status=self._game_status),
+                self._status_views(),
             )
-        self._executor.submit(self._action_selection_phase_setup)
+
+            for seat in self._game_status.player_order.seats:
+                self._send_remaining_action_points(seat)
+
+            if (
+                controller_config.push_legal_actions
+                and self._setup.legal_actions_fn is not None
+            ):
+                self._send_legal_actions()
+
+        self._submit_phase(self._action_selection_phase_setup)
 
     # 2
     def _action_selection_phase_setup(self):
         duration = controller_config.turn_preparation_time
-        self._is_in_selection_phase = True
-        start = time.monotonic()
-        self._players_actions.clear()
-        self._executor.submit(self._action_selection_phase, start, duration)
+        start = self._clock.monotonic()
+        self._submit_phase(self._action_selection_phase, start, duration)
 
     # 3
-    def _action_selection_phase(self, start_time: float, duration: int):
-        elapsed = time.monotonic() - start_time
+    def _action_selection_phase(self, start_time: float, duration: float):
+        elapsed = self._clock.monotonic() - start_time
         remaining = round(duration - elapsed, 2)
 
-        self._session.send_broadcast_update(
-            PlanningPhaseTimeUpdate(remaining_time=max(remaining, 0))
-        )
+        with _measure_phase("planning"):
+            self._session.send_broadcast_update(
+                PlanningPhaseTimeUpdate(remaining_time=max(remaining, 0))
+            )
 
         # if > 0.2, sleep 0.2, if 0 <= remaining < 0.2 sleep remaining, if < 0 sleep 0
-        time.sleep(min(max(0.0, remaining), 0.2))
+        self._clock.sleep(min(max(0.0, remaining), 0.2))
 
         if remaining <= 0:
-            self._executor.submit(self._game_update_phase)
+            self._submit_phase(self._game_update_phase)
         else:
-            self._executor.submit(self._action_selection_phase, start_time, duration)
+            self._submit_phase(self._action_selection_phase, start_time, duration)
 
     # 4
     def _game_update_phase(self):
         self._is_in_selection_phase = False
 
-        game_events, new_game_status = self._setup.update_game_status_fn(
-            self._game_status, self._players_actions, self._setup.action_validator_fn
-        )
+        players_actions = [ledger.actions() for ledger in self._ledgers]
+        if self._interest_manager is not None:
+            self._interest_manager.start_turn()
+        with _measure_phase("update_game_status"), self._measure_resolution():
+            game_events, new_game_status = self._setup.update_game_status_fn(
+                self._game_status,
+                players_actions,
+                self._validation_cache,
+                self._on_action_applied,
+            )
+        # the turn change does not touch any tile, keep the cache for the next turn
+        self._validation_cache.rebase(new_game_status, set())
+        if self._game_log is not None:
+            self._game_log.record_turn(self._game_status, players_actions)
+        self._game_status = new_game_status
+        if self._account is not None:
+            # the ledgers still hold the actions of the turn
+            self._account.end_turn(self._retained_bytes)
 
         for game_update in game_events:
-            time.sleep(controller_config.send_update_ration)
-            self._session.send_broadcast_update(game_update)
+            self._clock.sleep(controller_config.send_update_ration)
+            with _measure_phase("event_broadcast"):
+                self._session.send_broadcast_update(
+                    game_update, self._event_views(game_update)
+                )
 
-        time.sleep(controller_config.send_update_ration)
+        self._clock.sleep(controller_config.send_update_ration)
 
-        self._executor.submit(self._check_game_over)
+        self._submit_phase(self._check_game_over)
 
     # 5
     def _check_game_over(self):
-        winner = self._game_status.winner
+        with _measure_phase("game_over_check"):
+            winner = self._game_status.winner
+            if winner is not None:
+                self._session.send_broadcast_update(
+                    GameOverUpdate(winner=self._players[winner])
+                )
+
         if winner is not None:
-            self._session.send_broadcast_update(GameOverUpdate(winner=winner))
-            self._session.game_is_over()
+            self._end_game()
+        else:
+            self._submit_phase(self._send_status_phase)
+
+    def _end_game(self):
+        # the only way out of a game, over or stopped by a failed phase
+        if self._is_over:
+            return
+        self._is_over = True
+        self._is_in_selection_phase = False
+        self._session.game_is_over()
+        if self._game_log is not None:
+            self._game_log.close(self._game_status)
+        if self._account is not None:
+            self._account.close()
+        self._executor.shutdown(wait=False)
+
+    def _submit_phase(self, phase: Callable[..., None], *args):
+        self._submit(self._run_phase, phase, *args)
+
+    def _run_phase(self, phase: Callable[..., None], *args):
+        # a phase submits the next one, the game cannot go on without it
+        try:
+            phase(*args)
+        except Exception:
+            logger.exception("Phase %s failed, ending the game", phase.__name__)
+            self._end_game()
+
+    def _submit(self, task: Callable[..., None], *args):
+        # the CPU time of every task is accounted to the game
+        if self._account is None:
+            self._executor.submit(task, *args)
         else:
-            self._executor.submit(self._send_status_phase)
+            self._executor.submit(self._account.run, task, *args)
+
+    def _measure_resolution(self):
+        if self._account is None:
+            return nullcontext()
+        return self._account.resolution()
+
+    def _retained_bytes(self) -> dict[str, int]:
+        # the tiles are shared with the level of the game, not counted
+        seen = {id(tile) for tile in self._game_status.board.coordinates_to_occupation}
+        retained = {
+            "game_status": retained_bytes(self._game_status, seen),
+            "action_ledgers": retained_bytes(self._ledgers, seen),
+            "validation_cache": retained_bytes(self._validation_cache, seen),
+        }
+        for name, buffer in self._session.buffers().items():
+            retained[name] = retained_bytes(buffer, seen)
+        return retained
 
-    def process_player_request(self, player: Player, game_action: GameAction):
-        def _process_player_request():
+    def _new_interest_manager(self):
+        if (
+            len(self._game_status.board.coordinates_to_occupation)
+            < controller_config.interest_min_tiles
+        ):
+            return None
+        # the spatial index loads numpy, only large boards need it
+        from controller.interest_manager import InterestManager
+
+        return InterestManager(
+            self._game_status,
+            controller_config.interest_radius,
+            controller_config.interest_cell_size,
+        )
 
-            previous_player_actions = [
-                action_with_id.action
-                for action_with_id in self._players_actions[player]
-            ]
+    def _on_action_applied(
+        self, game_status: GameStatus, touched_tiles: set[HexagonCoordinates]
+    ):
+        self._validation_cache.rebase(game_status, touched_tiles)
+        if self._interest_manager is not None:
+            self._interest_manager.rebase(game_status, touched_tiles)
+
+    def _status_views(self) -> dict[PlayerID, GameStatusUpdate] | None:
+        # on large boards every player is sent the tiles of its region only
+        if self._interest_manager is None:
+            return None
+        return {
+            player.id: GameStatusUpdate(
+                game_status=self._interest_manager.visible_game_status(
+                    seat, self._game_status
+                )
+            )
+            for seat, player in enumerate(self._players)
+        }
 
-            remaining_action_points = self._setup.calculate_action_points_fn(
-                previous_player_actions + [game_action]
+    def _event_views(self, event: GameEvent) -> dict[PlayerID, GameEvent] | None:
+        if self._interest_manager is None:
+            return None
+        return {
+            self._players[seat].id: event
+            for seat in self._interest_manager.event_audience(
+                event, range(len(self._players))
             )
+        }
+
+    def process_player_request(
+        self, player: Player, game_action: GameAction, trace: Trace | None = None
+    ):
+        def _process_player_request(seat: Seat):
+            ledger = self._ledgers[seat]
 
             # no action points
-            if remaining_action_points < 0:
-                self._session.send_private_update(
-                    player.id, InsufficientActionPointsUpdate()
-                )
+            if not ledger.can_afford(game_action):
+                self._send_answer(seat, InsufficientActionPointsUpdate(), trace)
                 return
 
             # invalid action
-            if not self._setup.action_validator_fn(
-                player, game_action, self._game_status
-            ):
-                self._session.send_private_update(
-                    player.id, IllegalActionUpdate(game_action=game_action)
+            if not self._validation_cache(seat, game_action, self._game_status):
+                self._send_answer(
+                    seat, IllegalActionUpdate(game_action=game_action), trace
                 )
                 return
 
             # save action and send updates
-            self._players_actions[player].append(game_action)
+            action_id = ledger.append(game_action)
 
-            self._session.send_private_update(
-                player.id, ApprovedActionUpdate(game_action=game_action)
-            )
-            self._session.send_private_update(
-                player.id,
-                RemainingActionPointsUpdate(
-                    remaining_action_points=remaining_action_points
-                ),
+            self._send_answer(
+                seat,
+                ApprovedActionUpdate(action_id=action_id, selected_action=game_action),
+                trace,
             )
+            self._send_remaining_action_points(seat)
 
-        if not self._is_in_selection_phase:
-            return
+        self._submit_in_selection_phase(player, _process_player_request, trace)
+
+    def cancel_player_action(
+        self, player: Player, action_id: ActionID, trace: Trace | None = None
+    ):
+        def _cancel_player_action(seat: Seat):
+            cancelled_action = self._ledgers[seat].cancel(action_id)
+            if cancelled_action is not None:
+                self._send_cancelled_action(seat, action_id, cancelled_action, trace)
+            elif trace is not None:
+                trace.finish("nothing_cancelled")
 
-        self._executor.submit(_process_player_request)
+        self._submit_in_selection_phase(player, _cancel_player_action, trace)
 
-    def clear_player_actions(self, player: Player):
-        def _clear_player_actions():
-            self._players_actions[player].clear()
+    def undo_last_player_action(self, player: Player, trace: Trace | None = None):
+        def _undo_last_player_action(seat: Seat):
+            undone = self._ledgers[seat].undo_last()
+            if undone is not None:
+                self._send_cancelled_action(seat, *undone, trace)
+            elif trace is not None:
+                trace.finish("nothing_cancelled")
 
-            player.send_update(
-                RemainingActionPointsUpdate(controller_config.default_action_points)
-            )
+        self._submit_in_selection_phase(player, _undo_last_player_action, trace)
+
+    def clear_player_actions(self, player: Player, trace: Trace | None = None):
+        def _clear_player_actions(seat: Seat):
+            self._ledgers[seat].clear()
+            self._send_remaining_action_points(seat, trace)
 
-        if not self._is_in_selection_phase:
+        self._submit_in_selection_phase(player, _clear_player_actions, trace)
+
+    def _submit_in_selection_phase(
+        self, player: Player, task: Callable[[Seat], None], trace: Trace | None = None
+    ):
+        def _run_in_selection_phase():
+            # the selection may have closed while the task was queued
+            if not self._is_in_selection_phase:
+                if trace is not None:
+                    trace.finish("selection_closed")
+                return
+            if trace is not None:
+                trace.mark("controller_queue")
+            task(seat)
+
+        seat = self._seats.get(player.id)
+        if not self._is_in_selection_phase or seat is None:
+            if trace is not None:
+                trace.finish("selection_closed" if seat is not None else "not_a_player")
             return
 
-        self._executor.submit(_clear_player_actions)
+        self._submit(_run_in_selection_phase)
+
+    def _send_answer(
+        self, seat: Seat, update: PersonalUpdate, trace: Trace | None = None
+    ):
+        # the answer to a request closes the processing hop of its trace
+        if trace is not None:
+            trace.mark("processing")
+        self._session.send_private_update(self._players[seat].id, update, trace)
+
+    def _send_cancelled_action(
+        self,
+        seat: Seat,
+        action_id: ActionID,
+        cancelled_action: GameAction,
+        trace: Trace | None = None,
+    ):
+        self._send_answer(
+            seat,
+            CancelledActionUpdate(
+                action_id=action_id, cancelled_action=cancelled_action
+            ),
+            trace,
+        )
+        self._send_remaining_action_points(seat)
+
+    def _send_legal_actions(self):
+        seats_legal_actions = self._setup.legal_actions_fn(self._game_status)
+        for seat, legal_actions in seats_legal_actions.items():
+            self._session.send_private_update(
+                self._players[seat].id, LegalActionsUpdate(legal_actions=legal_actions)
+            )
+
+    def _send_remaining_action_points(self, seat: Seat, trace: Trace | None = None):
+        self._send_answer(
+            seat,
+            RemainingActionPointsUpdate(
+                remaining_action_points=self._ledgers[seat].remaining_action_points
+            ),
+            trace,
+        )
@@ -1,10 +1,11 @@
 from dataclasses import dataclass
 
 from common.common_types import (
-    UpdateModelFunction,
+    ActionCostFunction,
     ActionValidationFunction,
-    ActionPointCalculationFunction,
     GameStatusFactory,
+    LegalActionsFunction,
+    UpdateModelFunction,
 )
 
 
@@ -12,5 +13,6 @@ from common.common_types import (
 class GameControllerSetup:
     update_game_status_fn: UpdateModelFunction
     action_validator_fn: ActionValidationFunction
-    calculate_action_points_fn: ActionPointCalculationFunction
+    action_cost_fn: ActionCostFunction
     game_status_factory: GameStatusFactory
+    legal_actions_fn: LegalActionsFunction | None = None
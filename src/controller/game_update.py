@@ -1,7 +1,8 @@
 from typing import Literal, Union
 
-from pydantic import BaseModel
+from pydantic import BaseModel, ConfigDict
 
+from controller.action_ledger import ActionID
 from model.game_model.game_event import GameEvent
 from model.game_model.game_status.game_status import GameStatus
 from model.game_model.player_actions import GameAction
@@ -9,7 +10,7 @@ from player.player import Player
 
 
 class GameUpdate(BaseModel):
-    pass
+    model_config = ConfigDict(defer_build=True)
 
 
 class GameStatusUpdate(GameUpdate):
@@ -33,7 +34,7 @@ class PlanningPhaseTimeUpdate(GameUpdate):
 
 
 class PersonalUpdate(BaseModel):
-    pass
+    model_config = ConfigDict(defer_build=True)
 
 
 class RemainingActionPointsUpdate(PersonalUpdate):
@@ -45,9 +46,21 @@ class RemainingActionPointsUpdate(PersonalUpdate):
 
 class ApprovedActionUpdate(PersonalUpdate):
     update_type: Literal["approved_action_update"] = "approved_action_update"
+    action_id: ActionID
     selected_action: GameAction
 
 
+class CancelledActionUpdate(PersonalUpdate):
+    update_type: Literal["cancelled_action_update"] = "cancelled_action_update"
+    action_id: ActionID
+    cancelled_action: GameAction
+
+
+class LegalActionsUpdate(PersonalUpdate):
+    update_type: Literal["legal_actions_update"] = "legal_actions_update"
+    legal_actions: list[GameAction]
+
+
 class InsufficientActionPointsUpdate(PersonalUpdate):
     update_type: Literal["insufficient_action_points_update"] = (
         "insufficient_action_points_update"
@@ -59,6 +72,18 @@ class IllegalActionUpdate(PersonalUpdate):
     game_action: GameAction
 
 
+class ResumeTokenUpdate(PersonalUpdate):
+    update_type: Literal["resume_token_update"] = "resume_token_update"
+    player_id: str
+    resume_token: str
+
+
+class RetryAfterUpdate(PersonalUpdate):
+    update_type: Literal["retry_after_update"] = "retry_after_update"
+    # seconds to wait before connecting again
+    retry_after: float
+
+
 GameUpdate = Union[
     GameStatusUpdate,
     GameEventUpdate,
@@ -69,8 +94,12 @@ GameUpdate = Union[
 PersonalUpdate = Union[
     RemainingActionPointsUpdate,
     ApprovedActionUpdate,
+    CancelledActionUpdate,
+    LegalActionsUpdate,
     InsufficientActionPointsUpdate,
     IllegalActionUpdate,
+    ResumeTokenUpdate,
+    RetryAfterUpdate,
 ]
 
 Update = Union[
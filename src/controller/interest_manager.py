@@ -0,0 +1,120 @@
+from collections import Counter
+
+from metrics.metrics import metrics_registry
+from model.board.board import Board
+from model.board.hexagon_coordinates import HexagonCoordinates
+from model.board.tile_grid import Cell, tile_grid
+from model.game_model.game_event import (
+    AttackLostEvent,
+    AttackWonEvent,
+    GameEvent,
+    NoChangesEvent,
+    TroopMovedEvent,
+    TroopSpawnedEvent,
+)
+from model.game_model.game_status.game_status import GameStatus
+from model.game_model.player_actions import MarchTroopAction, SpawnTroopAction
+from player.player import Seat
+
+_region_tiles = metrics_registry.histogram(
+    "interest_region_tiles",
+    "Tiles in the game status sent to a player, under interest management.",
+    buckets=(16, 64, 256, 1024, 4096, 16384),
+)
+
+
+class InterestManager:
+    """Per seat interest regions over a large board.
+
+    The region of a seat is made of the cells of a TileGrid holding tiles
+    within ``radius`` of its troops and of the core. Each cell counts the
+    owned tiles that cover it, so ``rebase`` updates the regions with the
+    touched tiles only, like the ValidationCache.
+    """
+
+    def __init__(self, game_status: GameStatus, radius: int, cell_size: int):
+        board = game_status.board
+        self._radius = radius
+        self._grid = tile_grid(frozenset(board.coordinates_to_occupation), cell_size)
+        self._core_cells = frozenset(
+            self._grid.cells_around(board.core_coordinates, radius)
+        )
+        self._owners: dict[HexagonCoordinates, Seat] = {}
+        self._cell_refs: list[Counter[Cell]] = [Counter() for _ in game_status.players]
+        self._turn_start_regions: list[set[Cell]] = [set() for _ in self._cell_refs]
+        self.rebase(game_status, board.coordinates_to_occupation.keys())
+
+    def rebase(self, game_status: GameStatus, touched_tiles):
+        occupation = game_status.board.coordinates_to_occupation
+        for tile in touched_tiles:
+            troop = occupation[tile]
+            owner = troop.owner if troop is not None else None
+            previous_owner = self._owners.get(tile)
+            if owner == previous_owner:
+                continue
+            if previous_owner is not None:
+                self._cover(previous_owner, tile, -1)
+                del self._owners[tile]
+            if owner is not None:
+                self._cover(owner, tile, 1)
+                self._owners[tile] = owner
+
+    def region(self, seat: Seat) -> frozenset[Cell]:
+        return self._core_cells.union(self._cell_refs[seat])
+
+    def start_turn(self):
+        # events are sent at the end of the turn, players also hear about the
+        # tiles they could see when it started
+        self._turn_start_regions = [set(refs) for refs in self._cell_refs]
+
+    def visible_game_status(self, seat: Seat, game_status: GameStatus) -> GameStatus:
+        occupation = game_status.board.coordinates_to_occupation
+        visible = {
+            tile: occupation[tile]
+            for cell in self.region(seat)
+            for tile in self._grid.tiles_in(cell)
+        }
+        _region_tiles.observe(len(visible))
+        return game_status.copy_with(
+            board=Board.model_construct(
+                coordinates_to_occupation=visible,
+                core_coordinates=game_status.board.core_coordinates,
+            )
+        )
+
+    def event_audience(self, event: GameEvent, seats) -> list[Seat]:
+        tiles = _event_tiles(event)
+        if tiles is None:
+            return list(seats)
+
+        cells = {self._grid.cell_of(tile) for tile in tiles}
+        if not cells.isdisjoint(self._core_cells):
+            return list(seats)
+        return [
+            seat
+            for seat in seats
+            if not cells.isdisjoint(self._cell_refs[seat])
+            or not cells.isdisjoint(self._turn_start_regions[seat])
+        ]
+
+    def _cover(self, seat: Seat, tile: HexagonCoordinates, delta: int):
+        refs = self._cell_refs[seat]
+        for cell in self._grid.cells_around(tile, self._radius):
+            refs[cell] += delta
+            if refs[cell] == 0:
+                del refs[cell]
+
+
+def _event_tiles(event: GameEvent) -> list[HexagonCoordinates] | None:
+    # None for the events every player hears about
+    match event:
+        case TroopMovedEvent() | AttackWonEvent() | AttackLostEvent():
+            return [event.from_coordinates, event.to_coordinates]
+        case TroopSpawnedEvent():
+            return [event.coordinates]
+        case NoChangesEvent(game_action=MarchTroopAction() as action):
+            return [action.starting_coordinates, action.destination_coordinates]
+        case NoChangesEvent(game_action=SpawnTroopAction() as action):
+            return [action.coordinates]
+        case _:
+            return None
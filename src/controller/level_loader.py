@@ -1,22 +1,54 @@
 import json
 from pathlib import Path
 
+from model.board.board_factory import as_level
 from model.board.hexagon_coordinates import HexagonCoordinates
+from model.board.level import Level
 
 
 class LevelLoader:
+    """Levels by number of players: compiled ``.hexlevel`` files first, then
+    ``.json`` lists of tiles, then a procedural level for the other sizes."""
+
     def __init__(self, level_folder_path: str) -> None:
         self._level_folder_path = level_folder_path
-        self._levels = dict()
+        self._levels = {}
 
     def load_levels(self):
-        for filename in Path(self._level_folder_path).iterdir():
-            with open(filename, "r", encoding="utf-8") as f:
+        for n_players in self.levels_sizes():
+            self.get_level(n_players)
+
+    def levels_sizes(self) -> list[int]:
+        folder = Path(self._level_folder_path)
+        return sorted(
+            {int(filename.stem) for filename in folder.glob("*.hexlevel")}
+            | {int(filename.stem) for filename in folder.glob("*.json")}
+        )
+
+    def get_level(self, participants_number: int) -> Level:
+        # levels are read on first use, the server starts without parsing them
+        if participants_number not in self._levels:
+            self._levels[participants_number] = self._read_level(participants_number)
+        return self._levels[participants_number]
+
+    def _read_level(self, participants_number: int) -> Level:
+        folder = Path(self._level_folder_path)
+        compiled_path = folder / f"{participants_number}.hexlevel"
+        if compiled_path.exists():
+            from model.board.level_format import read_level
+
+            return read_level(compiled_path)
+
+        level_path = folder / f"{participants_number}.json"
+        if level_path.exists():
+            with open(level_path, "r", encoding="utf-8") as f:
                 data = json.load(f)
+            return as_level(
+                (HexagonCoordinates.model_validate(coordinate) for coordinate in data),
+                participants_number,
+            )
 
-            self._levels[int(filename.stem)] = {
-                HexagonCoordinates.model_validate(coordinate) for coordinate in data
-            }
+        # the generator loads numpy, only the sizes without a level file need it
+        from model.board.level_generator import generate_level
 
-    def get_level(self, participants_number: int) -> set[HexagonCoordinates]:
-        return self._levels.get(participants_number, set())
+        return generate_level(participants_number)
@@ -1,18 +1,19 @@
 from typing import Literal, Union
 
-from pydantic import BaseModel
+from pydantic import BaseModel, ConfigDict
 
+from controller.action_ledger import ActionID
 from model.game_model.player_actions import GameAction
 from player.player import Player
 
 
 class PlayerRequest(BaseModel):
+    model_config = ConfigDict(defer_build=True)
     player: Player
 
 
 class ClearActions(PlayerRequest):
     request_type: Literal["clear_actions_request"] = "clear_actions_request"
-    pass
 
 
 class PerformActionRequest(PlayerRequest):
@@ -20,4 +21,15 @@ class PerformActionRequest(PlayerRequest):
     game_action: GameAction
 
 
-PlayerRequest = Union[ClearActions, PerformActionRequest]
+class CancelActionRequest(PlayerRequest):
+    request_type: Literal["cancel_action_request"] = "cancel_action_request"
+    action_id: ActionID
+
+
+class UndoLastActionRequest(PlayerRequest):
+    request_type: Literal["undo_last_action_request"] = "undo_last_action_request"
+
+
+PlayerRequest = Union[
+    ClearActions, PerformActionRequest, CancelActionRequest, UndoLastActionRequest
+]
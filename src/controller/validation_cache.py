@@ -0,0 +1,107 @@
+from collections import defaultdict
+from collections.abc import Hashable
+
+from common.common_types import ActionValidationFunction
+from metrics.metrics import metrics_registry
+from model.board.hexagon_coordinates import HexagonCoordinates
+from model.game_model.game_status.game_status import GameStatus
+from model.game_model.player_actions import (
+    GameAction,
+    MarchTroopAction,
+    SpawnTroopAction,
+)
+from player.player import Seat
+
+_validation_requests = metrics_registry.counter(
+    "validation_cache_requests_total",
+    "Action validations answered by the validation cache, by result.",
+    ("result",),
+)
+_validation_invalidations = metrics_registry.counter(
+    "validation_cache_invalidations_total",
+    "Cached validations dropped because an applied action touched their tiles.",
+)
+
+_ValidationKey = tuple[Seat, Hashable]
+
+
+class ValidationCache:
+    """Memo of action validations for a single GameStatus snapshot.
+
+    While the snapshot does not change (the planning phase) every validation is
+    computed once. When an action is applied, ``rebase`` moves the cache to the
+    new snapshot dropping only the validations depending on the touched tiles.
+    A validation against any other snapshot clears the cache.
+    """
+
+    def __init__(self, is_valid_action: ActionValidationFunction):
+        self._is_valid_action = is_valid_action
+        self._game_status: GameStatus | None = None
+        self._results: dict[_ValidationKey, bool] = {}
+        self._keys_by_tile: defaultdict[HexagonCoordinates, set[_ValidationKey]] = (
+            defaultdict(set)
+        )
+        self.hits = 0
+        self.misses = 0
+
+    def __call__(self, seat: Seat, action: GameAction, game_status: GameStatus) -> bool:
+        if game_status is not self._game_status:
+            self.reset(game_status)
+
+        key = (seat, _action_key(action))
+        result = self._results.get(key)
+        if result is not None:
+            self.hits += 1
+            _validation_requests.labels("hit").inc()
+            return result
+
+        self.misses += 1
+        _validation_requests.labels("miss").inc()
+        result = self._is_valid_action(seat, action, game_status)
+        self._results[key] = result
+        for tile in _dependent_tiles(action):
+            self._keys_by_tile[tile].add(key)
+        return result
+
+    @property
+    def hit_rate(self) -> float:
+        total = self.hits + self.misses
+        return self.hits / total if total else 0.0
+
+    def rebase(self, game_status: GameStatus, touched_tiles: set[HexagonCoordinates]):
+        self._game_status = game_status
+        for tile in touched_tiles:
+            for key in self._keys_by_tile.pop(tile, ()):
+                if self._results.pop(key, None) is not None:
+                    _validation_invalidations.inc()
+
+    def reset(self, game_status: GameStatus | None = None):
+        self._game_status = game_status
+        self._results.clear()
+        self._keys_by_tile.clear()
+
+
+def _action_key(action: GameAction) -> Hashable:
+    # actions and troops are not hashable, key them by the fields that matter
+    match action:
+        case MarchTroopAction():
+            return (
+                action.player_action_type,
+                action.starting_coordinates,
+                action.destination_coordinates,
+            )
+        case SpawnTroopAction():
+            return action.action_type, action.coordinates, action.troop.troop_type
+        case _:
+            raise ValueError("Invalid PlayerAction provided")
+
+
+def _dependent_tiles(action: GameAction) -> list[HexagonCoordinates]:
+    match action:
+        case MarchTroopAction():
+            return [action.starting_coordinates, action.destination_coordinates]
+        case SpawnTroopAction():
+            # the home base the troop spawns near is one of the neighbours
+            return [action.coordinates, *action.coordinates.neighbours()]
+        case _:
+            raise ValueError("Invalid PlayerAction provided")
@@ -0,0 +1,20 @@
+import tempfile
+from pathlib import Path
+
+from pydantic import Field
+from pydantic_settings import BaseSettings
+
+
+class GameLogConfig(BaseSettings):
+    # out of the working directory unless configured, empty to disable the logs
+    game_log_folder: str = Field(
+        default=str(Path(tempfile.gettempdir()) / "hex-core" / "game_logs")
+    )
+    # a GameStatus snapshot every n turns bounds the turns replayed by a seek
+    game_log_snapshot_interval: int = Field(default=10, gt=0)
+    game_log_buffer_size: int = Field(default=1 << 16, gt=0)
+    # records waiting for the writer thread, a log is dropped when it is full
+    game_log_queue_size: int = Field(default=10_000, gt=0)
+
+
+game_log_config = GameLogConfig()
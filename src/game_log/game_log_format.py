@@ -0,0 +1,63 @@
+"""Binary layout of a game log.
+
+A log is a file header followed by records, each a fixed header (kind, turn,
+payload length) and a zlib compressed JSON payload:
+
+- ``SNAPSHOT``: the GameStatus at the start of the turn;
+- ``ACTIONS``: the actions selected by every seat during the turn;
+- ``INDEX``: written when the game is over, one entry per turn with the offset
+  of its actions and of the nearest snapshot at or before it.
+
+A closed log ends with a trailer pointing at the index, so that the entry of a
+turn is read at a computed offset.
+"""
+
+import struct
+import zlib
+from enum import IntEnum
+
+from pydantic import ConfigDict, TypeAdapter
+
+from model.game_model.game_status.game_status import GameStatus
+from model.game_model.player_actions import GameAction
+
+MAGIC = b"HEXLOG"
+END_MAGIC = b"HEXEND"
+VERSION = 2
+
+FILE_HEADER = struct.Struct("<6sH")  # magic, version
+RECORD_HEADER = struct.Struct("<BII")  # kind, turn, payload length
+INDEX_ENTRY = struct.Struct("<QQ")  # actions offset, snapshot offset
+TRAILER = struct.Struct("<QII6s")  # index offset, first turn, turns, end magic
+
+# the file header is at offset 0, no record can start there
+NO_RECORD = 0
+
+
+class RecordKind(IntEnum):
+    SNAPSHOT = 1
+    ACTIONS = 2
+    INDEX = 3
+
+
+_game_status_adapter = TypeAdapter(GameStatus)
+# indexed by seat, the players are in the snapshots
+_players_actions_adapter = TypeAdapter(
+    list[list[GameAction]], config=ConfigDict(defer_build=True)
+)
+
+
+def encode_snapshot(game_status: GameStatus) -> bytes:
+    return zlib.compress(_game_status_adapter.dump_json(game_status), 1)
+
+
+def decode_snapshot(payload: bytes) -> GameStatus:
+    return _game_status_adapter.validate_json(zlib.decompress(payload))
+
+
+def encode_actions(players_actions: list[list[GameAction]]) -> bytes:
+    return zlib.compress(_players_actions_adapter.dump_json(players_actions), 1)
+
+
+def decode_actions(payload: bytes) -> list[list[GameAction]]:
+    return _players_actions_adapter.validate_json(zlib.decompress(payload))
@@ -0,0 +1,132 @@
+"""Random access to a game log.
+
+The file is memory mapped: the index entry of a turn is read at a computed
+offset, then the turn is rebuilt from its nearest snapshot, replaying at most
+``game_log_snapshot_interval`` turns of actions. Replays use the game config
+of the reading process, which must match the one the game was played with.
+
+    with GameLogReader(path) as game_log:
+        game_status = game_log.game_status(game_log.last_turn)
+"""
+
+import mmap
+from pathlib import Path
+from typing import Self
+
+from game_log.game_log_format import (
+    END_MAGIC,
+    FILE_HEADER,
+    INDEX_ENTRY,
+    MAGIC,
+    NO_RECORD,
+    RECORD_HEADER,
+    TRAILER,
+    VERSION,
+    RecordKind,
+    decode_actions,
+    decode_snapshot,
+)
+from model.game_model.game_status.game_status import GameStatus
+from model.game_model.game_status.game_status_updater import update_game_status
+from model.game_model.player_action_validator import is_valid_action
+from model.game_model.player_actions import GameAction
+
+
+class GameLogReader:
+    def __init__(self, path: Path | str):
+        with open(path, "rb") as f:
+            self._map = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+        magic, version = FILE_HEADER.unpack_from(self._map, 0)
+        if magic != MAGIC or version != VERSION:
+            self._map.close()
+            raise ValueError(f"{path} is not a version {VERSION} game log")
+
+        self.closed = self._has_trailer()
+        if self.closed:
+            index_offset, self.first_turn, turns, _ = TRAILER.unpack_from(
+                self._map, len(self._map) - TRAILER.size
+            )
+            self._index = memoryview(self._map)[
+                index_offset : index_offset + turns * INDEX_ENTRY.size
+            ]
+        else:
+            # the game is still running or the server stopped: rebuild the index
+            self.first_turn, turns, self._index = self._scan_index()
+        self.last_turn = self.first_turn + turns - 1
+
+    def game_status(self, turn: int) -> GameStatus:
+        """The status at the start of the turn, the final one for the last turn."""
+        _, snapshot_offset = self._entry(turn)
+        _, snapshot_turn, payload = self._record(snapshot_offset)
+        game_status = decode_snapshot(payload)
+        for replayed_turn in range(snapshot_turn, turn):
+            _, game_status = update_game_status(
+                game_status, self.players_actions(replayed_turn), is_valid_action
+            )
+        return game_status
+
+    def players_actions(self, turn: int) -> list[list[GameAction]]:
+        """The actions selected during the turn by seat, before validation."""
+        actions_offset, _ = self._entry(turn)
+        if actions_offset == NO_RECORD:
+            return []
+        _, _, payload = self._record(actions_offset)
+        return decode_actions(payload)
+
+    def close(self):
+        self._index.release()
+        self._map.close()
+
+    def __enter__(self) -> Self:
+        return self
+
+    def __exit__(self, *_):
+        self.close()
+
+    def _entry(self, turn: int) -> tuple[int, int]:
+        if not self.first_turn <= turn <= self.last_turn:
+            raise IndexError(
+                f"Turn {turn} is not in the log [{self.first_turn}, {self.last_turn}]"
+            )
+        return INDEX_ENTRY.unpack_from(
+            self._index, (turn - self.first_turn) * INDEX_ENTRY.size
+        )
+
+    def _record(self, offset: int) -> tuple[RecordKind, int, memoryview]:
+        kind, turn, length = RECORD_HEADER.unpack_from(self._map, offset)
+        start = offset + RECORD_HEADER.size
+        return RecordKind(kind), turn, memoryview(self._map)[start : start + length]
+
+    def _has_trailer(self) -> bool:
+        if len(self._map) < FILE_HEADER.size + TRAILER.size:
+            return False
+        *_, end_magic = TRAILER.unpack_from(self._map, len(self._map) - TRAILER.size)
+        return end_magic == END_MAGIC
+
+    def _scan_index(self) -> tuple[int, int, memoryview]:
+        snapshots: dict[int, int] = {}
+        actions: dict[int, int] = {}
+        offset = FILE_HEADER.size
+        # the last record may be cut short by a crash, it is ignored
+        while offset + RECORD_HEADER.size <= len(self._map):
+            kind, turn, length = RECORD_HEADER.unpack_from(self._map, offset)
+            if offset + RECORD_HEADER.size + length > len(self._map):
+                break
+            if kind == RecordKind.SNAPSHOT:
+                snapshots[turn] = offset
+            elif kind == RecordKind.ACTIONS:
+                actions[turn] = offset
+            offset += RECORD_HEADER.size + length
+
+        if not snapshots:
+            raise ValueError("The game log has no snapshot")
+        first_turn = min(snapshots)
+        last_turn = max(max(snapshots), max(actions, default=first_turn))
+
+        index = bytearray()
+        snapshot = NO_RECORD
+        for turn in range(first_turn, last_turn + 1):
+            snapshot = snapshots.get(turn, snapshot)
+            index += INDEX_ENTRY.pack(actions.get(turn, NO_RECORD), snapshot)
+        return first_turn, last_turn - first_turn + 1, memoryview(bytes(index))
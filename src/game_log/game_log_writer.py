@@ -0,0 +1,269 @@
+"""Append-only logs of the played games, written off the game threads.
+
+The game controller hands the status and the actions of every turn to its
+GameLog, which only enqueues them: encoding and buffered writes happen on a
+single writer thread shared by all the games. The queue is bounded, a game
+whose records do not fit is left unfinished rather than slowing down.
+"""
+
+import logging
+import uuid
+import weakref
+from collections.abc import Callable
+from functools import partial
+from pathlib import Path
+from queue import Full, Queue
+from threading import Lock, Thread
+from typing import BinaryIO
+
+from game_log.game_log_config import GameLogConfig, game_log_config
+from game_log.game_log_format import (
+    END_MAGIC,
+    FILE_HEADER,
+    INDEX_ENTRY,
+    MAGIC,
+    NO_RECORD,
+    RECORD_HEADER,
+    TRAILER,
+    VERSION,
+    RecordKind,
+    encode_actions,
+    encode_snapshot,
+)
+from metrics.metrics import metrics_registry
+from model.game_model.game_status.game_status import GameStatus
+from model.game_model.player_actions import GameAction
+
+logger = logging.getLogger(__name__)
+
+_written_bytes = metrics_registry.counter(
+    "game_log_written_bytes_total", "Bytes appended to the game logs."
+)
+_queue_depth = metrics_registry.gauge(
+    "game_log_queue_depth", "Game log records waiting for the writer thread."
+)
+_dropped_logs = metrics_registry.counter(
+    "game_log_dropped_total", "Game logs left unfinished by a full writer queue."
+)
+
+
+class _GameLogFile:
+    """The file of one game log, only touched by the writer thread."""
+
+    def __init__(self, path: Path, snapshot_interval: int, buffer_size: int):
+        self.path = path
+        # set by the writer thread when a write fails, the log is abandoned
+        self.failed = False
+        self._snapshot_interval = snapshot_interval
+        self._buffer_size = buffer_size
+        self._file: BinaryIO | None = None
+        self._offset = 0
+        self._first_turn: int | None = None
+        self._last_snapshot_turn: int | None = None
+        # turn -> offset of its records
+        self._snapshots: dict[int, int] = {}
+        self._actions: dict[int, int] = {}
+
+    def write_turn(
+        self, game_status: GameStatus, players_actions: list[list[GameAction]]
+    ):
+        turn = game_status.turn_number
+        if (
+            self._last_snapshot_turn is None
+            or turn - self._last_snapshot_turn >= self._snapshot_interval
+        ):
+            self._write_snapshot(game_status)
+        self._actions[turn] = self._write_record(
+            RecordKind.ACTIONS, turn, encode_actions(players_actions)
+        )
+
+    def close(self, final_game_status: GameStatus):
+        self._write_snapshot(final_game_status)
+        index = b"".join(
+            INDEX_ENTRY.pack(self._actions.get(turn, NO_RECORD), snapshot)
+            for turn, snapshot in self._turn_snapshots(final_game_status.turn_number)
+        )
+        index_offset = self._write_record(
+            RecordKind.INDEX, final_game_status.turn_number, index
+        )
+        self._write(
+            TRAILER.pack(
+                index_offset + RECORD_HEADER.size,
+                self._first_turn,
+                len(index) // INDEX_ENTRY.size,
+                END_MAGIC,
+            )
+        )
+        self._file.close()
+
+    def flush(self):
+        if self._file is not None and not self._file.closed:
+            self._file.flush()
+
+    def abandon(self):
+        self.failed = True
+        if self._file is not None:
+            try:
+                self._file.close()
+            except OSError:
+                pass
+
+    def _turn_snapshots(self, last_turn: int):
+        snapshot = NO_RECORD
+        for turn in range(self._first_turn, last_turn + 1):
+            snapshot = self._snapshots.get(turn, snapshot)
+            yield turn, snapshot
+
+    def _write_snapshot(self, game_status: GameStatus):
+        turn = game_status.turn_number
+        if self._first_turn is None:
+            self._first_turn = turn
+        self._last_snapshot_turn = turn
+        self._snapshots[turn] = self._write_record(
+            RecordKind.SNAPSHOT, turn, encode_snapshot(game_status)
+        )
+
+    def _write_record(self, kind: RecordKind, turn: int, payload: bytes) -> int:
+        if self._file is None:
+            self._open()
+        offset = self._offset
+        self._write(RECORD_HEADER.pack(kind, turn, len(payload)) + payload)
+        return offset
+
+    def _open(self):
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        # kept open until the game ends, closed by close() or abandon()
+        self._file = open(self.path, "wb", buffering=self._buffer_size)  # noqa: SIM115
+        self._write(FILE_HEADER.pack(MAGIC, VERSION))
+
+    def _write(self, data: bytes):
+        self._file.write(data)
+        self._offset += len(data)
+        _written_bytes.inc(len(data))
+
+
+class GameLog:
+    """Handle given to the game controller, its methods never block on I/O."""
+
+    def __init__(self, path: Path, log_file: _GameLogFile, writer: "GameLogWriter"):
+        self.path = path
+        self._log_file = log_file
+        self._writer = writer
+        # a turn did not fit in the writer queue, the later ones are skipped
+        self._dropped = False
+
+    def record_turn(
+        self, game_status: GameStatus, players_actions: list[list[GameAction]]
+    ):
+        """Record the actions of the turn starting with ``game_status``, by seat."""
+        if self._dropped:
+            return
+        # statuses and actions are never mutated, they are encoded later
+        try:
+            self._writer.submit(
+                self._log_file,
+                partial(self._log_file.write_turn, game_status, players_actions),
+                block=False,
+            )
+        except Full:
+            logger.warning("Game log queue is full, %s left unfinished", self.path)
+            _dropped_logs.inc()
+            self._dropped = True
+
+    def close(self, final_game_status: GameStatus):
+        # a dropped log misses turns, it is only closed; unfinished logs are
+        # indexed by scanning
+        write = (
+            self._log_file.abandon
+            if self._dropped
+            else partial(self._log_file.close, final_game_status)
+        )
+        self._writer.submit(self._log_file, write)
+
+
+class GameLogWriter:
+    def __init__(self, config: GameLogConfig = game_log_config):
+        self._config = config
+        self._records: Queue[tuple[_GameLogFile, Callable[[], None]]] = Queue(
+            config.game_log_queue_size
+        )
+        self._writer: Thread | None = None
+        self._writer_lock = Lock()
+        # closed by shutdown() when their game is still running
+        self._log_files: weakref.WeakSet[_GameLogFile] = weakref.WeakSet()
+        _queue_depth.set_function(self._records.qsize)
+
+    def open_game_log(self, game_id: uuid.UUID) -> GameLog | None:
+        """The log of a new game, named after its id, None when the game logs
+        are disabled."""
+        if not self._config.game_log_folder:
+            return None
+
+        path = Path(self._config.game_log_folder) / f"{game_id.hex}.hexlog"
+        log_file = _GameLogFile(
+            path,
+            self._config.game_log_snapshot_interval,
+            self._config.game_log_buffer_size,
+        )
+        self._log_files.add(log_file)
+        return GameLog(path, log_file, self)
+
+    def submit(
+        self, log_file: _GameLogFile, write: Callable[[], None], block: bool = True
+    ):
+        """Enqueue ``write``, raises ``queue.Full`` when not blocking."""
+        self._start_writer()
+        self._records.put((log_file, write), block)
+
+    def flush(self):
+        """Wait until the records submitted so far are written to the files."""
+        if self._writer is not None:
+            self._records.join()
+
+    def shutdown(self):
+        """Write the pending records and close the logs of the games still
+        running, left unfinished."""
+        for log_file in list(self._log_files):
+            self.submit(log_file, log_file.abandon)
+        self.flush()
+
+    def _start_writer(self):
+        if self._writer is None:
+            with self._writer_lock:
+                if self._writer is None:
+                    self._writer = Thread(
+                        target=self._write_records, name="game-log-writer", daemon=True
+                    )
+                    self._writer.start()
+
+    def _write_records(self):
+        # files written since the queue was last drained
+        written: set[_GameLogFile] = set()
+        while True:
+            log_file, write = self._records.get()
+            try:
+                if not log_file.failed and self._try_write(log_file, write):
+                    written.add(log_file)
+                # write in batches, flush once the queue is drained
+                if self._records.empty():
+                    for written_file in written:
+                        self._try_write(written_file, written_file.flush)
+                    written.clear()
+            finally:
+                # flush() waits for every record, failed ones included
+                self._records.task_done()
+
+    @staticmethod
+    def _try_write(log_file: _GameLogFile, write: Callable[[], None]) -> bool:
+        try:
+            write()
+            return True
+        except Exception:
+            # a broken log is abandoned, the writer thread goes on with the
+            # logs of the other games
+            logger.exception("Cannot write game log %s, abandoned", log_file.path)
+            log_file.abandon()
+            return False
+
+
+game_log_writer = GameLogWriter()
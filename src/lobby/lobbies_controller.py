@@ -1,15 +1,54 @@
+import heapq
 import logging
-from collections import deque
-from concurrent.futures.thread import ThreadPoolExecutor
-from typing import Callable
+import time
+from collections.abc import Callable
+from concurrent.futures import Executor
+from dataclasses import dataclass
+from functools import partial
+from itertools import islice, takewhile
+from threading import Lock, Timer
 
 from lobby.lobby_config import lobby_config
-from player.player import PlayerID, Player
+from metrics.metrics import metrics_registry
+from metrics.runtime_monitor import MonitoredThreadPoolExecutor
+from player.player import Player, PlayerID
 from session.pub_sub import pub_sub
 from session.session import Session
 
 logger = logging.getLogger(__name__)
 
+_time_to_game_seconds = metrics_registry.histogram(
+    "lobby_time_to_game_seconds",
+    "Time spent by a player in the lobby before its game starts.",
+    buckets=(0.01, 0.1, 0.5, 1.0, 5.0, 10.0, 30.0, 60.0, 120.0, 300.0),
+)
+_lobby_cpu_seconds = metrics_registry.counter(
+    "lobby_cpu_seconds_total",
+    "CPU time spent by the lobby worker thread.",
+)
+_game_creation_seconds = metrics_registry.histogram(
+    "lobby_game_creation_seconds",
+    "Time spent creating and starting the session of a new game.",
+    buckets=(0.001, 0.005, 0.01, 0.05, 0.1, 0.5, 1.0, 5.0),
+)
+_games_started = metrics_registry.counter(
+    "lobby_games_started_total",
+    "Games started by the lobby, by matchmaking policy.",
+    ("policy",),
+)
+_queue_depth = metrics_registry.gauge(
+    "lobby_queue_depth",
+    "Players waiting in the lobby queue, by requested lobby size.",
+    ("lobby_size",),
+)
+
+
+@dataclass(frozen=True)
+class _WaitingPlayer:
+    player: Player
+    lobby_size: int
+    joined_at: float
+
 
 class LobbiesController:
     REMOVE_PLAYER_TOPIC = "remove_player_lobby"
@@ -18,67 +57,199 @@ class LobbiesController:
     def __init__(
         self,
         game_session_factory: Callable[[set[Player]], Session],
+        clock: Callable[[], float] = time.monotonic,
+        session_executor: Executor | None = None,
+        admit_game_start: Callable[[int], bool] | None = None,
     ):
         self._session_factory = game_session_factory
-        self._active_lobbies: dict[int, deque[PlayerID]] = self._create_lobbies()
-        self._player_to_lobby: dict[PlayerID, int] = dict()
-        self._player_id_to_player: dict[PlayerID, Player] = dict()
-        self._executor = ThreadPoolExecutor(max_workers=1)
+        self._clock = clock
+        # given the games started whose session is still being created
+        self._admit_game_start = admit_game_start or (lambda starting_games: True)
+        self._starting_games = 0
+        self._starting_games_lock = Lock()
+        # full lobbies held back by the admission, checked again every tick
+        self._are_games_delayed = False
+        # dicts keep insertion order, giving FIFO queues with O(1) join and leave
+        self._active_lobbies: dict[int, dict[PlayerID, None]] = self._create_lobbies()
+        self._waiting_players: dict[PlayerID, _WaitingPlayer] = {}
+        self._flexible_check_timer: Timer | None = None
+        self._executor = MonitoredThreadPoolExecutor("lobby", max_workers=1)
+        # sessions are created off the lobby thread, joins and leaves never
+        # wait behind the board generation of a new game
+        self._session_executor = session_executor or MonitoredThreadPoolExecutor(
+            "game_creation", max_workers=lobby_config.game_creation_workers
+        )
+
+        # read at collection time, the queues are never replaced
+        for lobby_size, lobby in self._active_lobbies.items():
+            _queue_depth.labels(lobby_size).set_function(partial(len, lobby))
 
         pub_sub.subscribe(self.REMOVE_PLAYER_TOPIC, self.remove_player_from_lobby)
         pub_sub.subscribe(self.ADD_PLAYER_TOPIC, self.add_player_in_lobby)
 
     def add_player_in_lobby(self, lobby_size: int, player: Player):
         def _add_player_in_lobby():
-            if player.id not in self._active_lobbies[lobby_size]:
+            if player.id not in self._waiting_players:
                 player_id = player.id
-                self._active_lobbies[lobby_size].append(player_id)
-                self._player_to_lobby[player_id] = lobby_size
-                self._player_id_to_player[player_id] = player
-                self._check_lobbies()
+                self._waiting_players[player_id] = _WaitingPlayer(
+                    player, lobby_size, self._clock()
+                )
+                self._active_lobbies[lobby_size][player_id] = None
+                self._check_lobby(lobby_size)
+                self._schedule_flexible_check()
 
-        self._executor.submit(_add_player_in_lobby)
+        self._executor.submit(self._measured, _add_player_in_lobby)
 
     def remove_player_from_lobby(self, player_id: PlayerID):
         def _remove_player_from_lobby():
-            if player_id in self._player_to_lobby:
-                lobby_size = self._player_to_lobby[player_id]
-                self._active_lobbies[lobby_size].remove(player_id)
-                del self._player_to_lobby[player_id]
-                del self._player_id_to_player[player_id]
-
-        self._executor.submit(_remove_player_from_lobby)
-
-    def _check_lobbies(self):
-        # select ready lobbies
-        ready_lobbies_sizes = filter(
-            lambda k: len(self._active_lobbies[k]) >= k,
-            self._active_lobbies.keys(),
-        )
+            waiting_player = self._waiting_players.pop(player_id, None)
+            if waiting_player is not None:
+                del self._active_lobbies[waiting_player.lobby_size][player_id]
+
+        self._executor.submit(self._measured, _remove_player_from_lobby)
+
+    def queue_depths(self) -> dict[int, int]:
+        return {
+            lobby_size: len(lobby) for lobby_size, lobby in self._active_lobbies.items()
+        }
+
+    def _check_lobby(self, lobby_size: int):
+        lobby = self._active_lobbies[lobby_size]
 
         # pop players in queue and start new game
-        for lobby_size in ready_lobbies_sizes:
-            in_lobby_ids = {
-                self._active_lobbies[lobby_size].popleft() for _ in range(lobby_size)
-            }
+        while len(lobby) >= lobby_size and self._can_start_game():
+            in_lobby_ids = list(islice(lobby, lobby_size))
+            self._start_game(in_lobby_ids, "exact")
+
+    def _check_flexible_lobbies(self):
+        # players that waited long enough accept any size; they are a prefix of
+        # the waiting players because these are ordered by join time
+        while True:
+            deadline = self._clock() - lobby_config.flexible_matchmaking_wait
+            flexible_players = list(
+                takewhile(
+                    lambda waiting, deadline=deadline: waiting.joined_at <= deadline,
+                    self._waiting_players.values(),
+                )
+            )
+            if not flexible_players:
+                return
 
-            # get players
-            players = set(map(self._player_id_to_player.get, in_lobby_ids))
+            # prefer the biggest game that can be filled
+            for lobby_size in range(
+                lobby_config.max_number_of_player,
+                lobby_config.min_number_of_player - 1,
+                -1,
+            ):
+                in_lobby_ids = self._flexible_candidates(flexible_players, lobby_size)
+                if len(in_lobby_ids) == lobby_size:
+                    if not self._can_start_game():
+                        return
+                    self._start_game(in_lobby_ids, "flexible")
+                    break
+            else:
+                return
+
+    def _flexible_candidates(
+        self, flexible_players: list[_WaitingPlayer], lobby_size: int
+    ) -> list[PlayerID]:
+        # the oldest players among who asked for this size and who accepts any size
+        exact_players = (
+            self._waiting_players[player_id]
+            for player_id in self._active_lobbies[lobby_size]
+        )
+        candidates: dict[PlayerID, None] = {}
+        for waiting in heapq.merge(
+            flexible_players, exact_players, key=lambda waiting: waiting.joined_at
+        ):
+            candidates[waiting.player.id] = None
+            if len(candidates) == lobby_size:
+                break
+        return list(candidates)
+
+    def _can_start_game(self) -> bool:
+        if self._admit_game_start(self._starting_games):
+            return True
+        if not self._are_games_delayed:
+            self._are_games_delayed = True
+            # the next check is a tick away, not a flexible matchmaking wait
+            if self._flexible_check_timer is not None:
+                self._flexible_check_timer.cancel()
+                self._flexible_check_timer = None
+        return False
 
-            # remove from other dicts
-            for player_id in in_lobby_ids:
-                del self._player_to_lobby[player_id]
-                del self._player_id_to_player[player_id]
+    def _start_game(self, in_lobby_ids: list[PlayerID], policy: str):
+        now = self._clock()
+        players = set()
 
-            # crate session
-            logger.info(f"Start Game with size {lobby_size} and players: {players}")
+        # remove players from every queue
+        for player_id in in_lobby_ids:
+            waiting_player = self._waiting_players.pop(player_id)
+            del self._active_lobbies[waiting_player.lobby_size][player_id]
+            players.add(waiting_player.player)
+            _time_to_game_seconds.observe(now - waiting_player.joined_at)
+
+        logger.info("Start game with size %d and players: %s", len(players), players)
+        _games_started.labels(policy).inc()
+        with self._starting_games_lock:
+            self._starting_games += 1
+        self._session_executor.submit(self._create_session, players)
+
+    def _create_session(self, players: set[Player]):
+        start = time.perf_counter()
+        try:
             session = self._session_factory(players)
             session.start()
+        except Exception:
+            logger.exception("Cannot create the game of %s", players)
+        finally:
+            # once started the game is counted by the admission as running
+            with self._starting_games_lock:
+                self._starting_games -= 1
+            _game_creation_seconds.observe(time.perf_counter() - start)
+
+    def _schedule_flexible_check(self):
+        if self._flexible_check_timer is not None or not self._waiting_players:
+            return
+
+        oldest_player = next(iter(self._waiting_players.values()))
+        delay = lobby_config.matchmaking_tick_interval
+        if not self._are_games_delayed:
+            delay = max(
+                oldest_player.joined_at
+                + lobby_config.flexible_matchmaking_wait
+                - self._clock(),
+                delay,
+            )
+        self._flexible_check_timer = Timer(
+            delay,
+            self._executor.submit,
+            args=(self._measured, self._flexible_check_tick),
+        )
+        self._flexible_check_timer.daemon = True
+        self._flexible_check_timer.start()
+
+    def _flexible_check_tick(self):
+        self._flexible_check_timer = None
+        if self._are_games_delayed:
+            self._are_games_delayed = False
+            for lobby_size in self._active_lobbies:
+                self._check_lobby(lobby_size)
+        self._check_flexible_lobbies()
+        self._schedule_flexible_check()
+
+    @staticmethod
+    def _measured(task: Callable[[], None]):
+        start = time.thread_time()
+        try:
+            task()
+        finally:
+            _lobby_cpu_seconds.inc(time.thread_time() - start)
 
     @staticmethod
-    def _create_lobbies() -> dict[int, deque[PlayerID]]:
+    def _create_lobbies() -> dict[int, dict[PlayerID, None]]:
         return {
-            lobby_size: deque()
+            lobby_size: {}
             for lobby_size in range(
                 lobby_config.min_number_of_player, lobby_config.max_number_of_player + 1
             )
@@ -5,6 +5,12 @@ from pydantic_settings import BaseSettings
 class LobbyConfig(BaseSettings):
     min_number_of_player: int = Field(default=3, gt=2)
     max_number_of_player: int = Field(default=8, lt=10)
+    # seconds a player waits for the requested size before accepting any size
+    flexible_matchmaking_wait: float = Field(default=30.0, ge=0)
+    # polling interval while flexible players are still waiting for a game
+    matchmaking_tick_interval: float = Field(default=1.0, gt=0)
+    # threads creating the sessions of the games started by the lobby
+    game_creation_workers: int = Field(default=4, gt=0)
 
 
 lobby_config = LobbyConfig()
@@ -0,0 +1,12 @@
+from pydantic import Field
+from pydantic_settings import BaseSettings
+
+
+class AccountingConfig(BaseSettings):
+    # turns between two estimates of the memory retained by a game
+    game_memory_sample_interval: int = Field(default=5, gt=0)
+    # finished games listed by the admin endpoint, the most recent ones
+    finished_games_kept: int = Field(default=100, ge=0)
+
+
+accounting_config = AccountingConfig()
@@ -0,0 +1,10 @@
+from pydantic import Field
+from pydantic_settings import BaseSettings
+
+
+class AdminConfig(BaseSettings):
+    # bearer token of /metrics and /admin/*, empty to refuse every request
+    admin_token: str = Field(default="")
+
+
+admin_config = AdminConfig()
@@ -0,0 +1,18 @@
+from pydantic import Field
+from pydantic_settings import BaseSettings
+
+
+class AdmissionConfig(BaseSettings):
+    # crossing any of these stops new connections and new games
+    admission_max_event_loop_lag: float = Field(default=0.25, gt=0)
+    # tasks waiting in the executors with the same name, e.g. all the games
+    admission_max_executor_queue: int = Field(default=500, gt=0)
+    # 0 for no limit
+    admission_max_active_games: int = Field(default=0, ge=0)
+    # share of the thresholds to go back under before admitting again
+    admission_recovery_ratio: float = Field(default=0.5, gt=0, le=1)
+    # seconds a refused client is told to wait before connecting again
+    admission_retry_after: float = Field(default=5.0, gt=0)
+
+
+admission_config = AdmissionConfig()
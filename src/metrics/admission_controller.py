@@ -0,0 +1,103 @@
+"""Admission of new players and new games under load.
+
+Every sample of the runtime monitor is checked against the admission
+thresholds. While one is crossed the server is overloaded: new connections are
+told to retry later and the lobby holds its full lobbies, so the games already
+running keep their latency. Admissions resume once every measure is back under
+a share of its threshold.
+"""
+
+import logging
+from collections.abc import Callable
+
+from metrics.admission_config import AdmissionConfig, admission_config
+from metrics.game_accounting import game_accounting
+from metrics.metrics import metrics_registry
+from metrics.runtime_monitor import RuntimeMonitor, RuntimeSample, runtime_monitor
+
+logger = logging.getLogger(__name__)
+
+_overloaded = metrics_registry.gauge(
+    "admission_overloaded", "1 while new connections and new games are held back."
+)
+_refused = metrics_registry.counter(
+    "admission_refused_total",
+    "Connections refused and game starts delayed because of the load.",
+    ("admission",),
+)
+_refused_connections = _refused.labels("connection")
+_delayed_game_starts = _refused.labels("game_start")
+
+
+class AdmissionController:
+    def __init__(
+        self,
+        active_games: Callable[[], int],
+        config: AdmissionConfig = admission_config,
+        monitor: RuntimeMonitor | None = None,
+    ):
+        self._active_games = active_games
+        self._config = config
+        # what crossed its threshold, empty while admitting
+        self._overload: list[str] = []
+        (monitor or runtime_monitor).add_listener(self.update)
+
+    @property
+    def is_overloaded(self) -> bool:
+        return bool(self._overload)
+
+    @property
+    def retry_after(self) -> float:
+        return self._config.admission_retry_after
+
+    def update(self, sample: RuntimeSample):
+        # once overloaded, the measures must go well under the thresholds
+        ratio = self._config.admission_recovery_ratio if self._overload else 1.0
+        overload = self._overload_of(sample, ratio)
+
+        if overload and not self._overload:
+            logger.warning("Overloaded, holding back new players: %s", overload)
+            _overloaded.set(1)
+        elif not overload and self._overload:
+            logger.info("Load back to normal, admitting new players")
+            _overloaded.set(0)
+        self._overload = overload
+
+    def admit_connection(self) -> bool:
+        if self._overload:
+            _refused_connections.inc()
+            return False
+        return True
+
+    def admit_game_start(self, starting_games: int = 0) -> bool:
+        """``starting_games`` are started but not running yet: their session
+        is still being created."""
+        active_games = self._active_games() + starting_games
+        if self._overload or self._is_at_max_games(active_games, 1.0):
+            _delayed_game_starts.inc()
+            return False
+        return True
+
+    def _overload_of(self, sample: RuntimeSample, ratio: float) -> list[str]:
+        config = self._config
+        overload = [
+            f"event loop {name} {lag:.3f}s late"
+            for name, lag in sample.event_loop_lags.items()
+            if lag >= config.admission_max_event_loop_lag * ratio
+        ]
+        overload += [
+            f"{queue_depth} tasks queued in {name}"
+            for name, queue_depth in sample.executor_queue_depths.items()
+            if queue_depth >= config.admission_max_executor_queue * ratio
+        ]
+        active_games = self._active_games()
+        if self._is_at_max_games(active_games, ratio):
+            overload.append(f"{active_games} games running")
+        return overload
+
+    def _is_at_max_games(self, active_games: int, ratio: float) -> bool:
+        max_active_games = self._config.admission_max_active_games
+        return max_active_games > 0 and active_games >= max_active_games * ratio
+
+
+admission_controller = AdmissionController(game_accounting.running_games)
@@ -0,0 +1,210 @@
+"""CPU time and retained memory of every game.
+
+The game controller runs its tasks through the GameAccount of its game, which
+adds up the CPU time of the thread running them, and every few turns hands it
+an estimate of the memory retained by its state. The accounts of the running
+games and of the last finished ones are reported by ``GameAccounting``.
+"""
+
+import logging
+import sys
+import time
+import uuid
+from collections import deque
+from collections.abc import Callable
+from contextlib import contextmanager
+from enum import Enum
+from threading import Lock
+from types import BuiltinFunctionType, FunctionType, MethodType, ModuleType
+from typing import Any
+
+from metrics.accounting_config import AccountingConfig, accounting_config
+from metrics.metrics import metrics_registry
+
+logger = logging.getLogger(__name__)
+
+_cpu_seconds = metrics_registry.counter(
+    "game_cpu_seconds_total",
+    "CPU time spent by the game controllers, resolution is part of the tasks.",
+    ("work",),
+)
+_retained_bytes = metrics_registry.gauge(
+    "games_retained_bytes", "Estimated memory retained by the running games."
+)
+_task_cpu_seconds = _cpu_seconds.labels("controller_task")
+_resolution_cpu_seconds = _cpu_seconds.labels("resolution")
+
+# shared by every game, never counted
+_SHARED_TYPES = (
+    type,
+    ModuleType,
+    FunctionType,
+    BuiltinFunctionType,
+    MethodType,
+    Enum,
+)
+
+
+def retained_bytes(root: Any, seen: set[int]) -> int:
+    """Estimate of the memory held by ``root`` and the objects it refers to.
+
+    Objects whose id is in ``seen`` are skipped and the counted ones are added
+    to it, so objects shared by the roots of a game are counted once.
+    """
+    size = 0
+    stack = [root]
+    while stack:
+        obj = stack.pop()
+        if id(obj) in seen or isinstance(obj, _SHARED_TYPES):
+            continue
+        seen.add(id(obj))
+        size += sys.getsizeof(obj)
+        if isinstance(obj, dict):
+            stack.extend(obj.keys())
+            stack.extend(obj.values())
+        elif isinstance(obj, (list, tuple, set, frozenset, deque)):
+            stack.extend(obj)
+        elif hasattr(obj, "__dict__"):
+            # pydantic models included
+            stack.append(obj.__dict__)
+    return size
+
+
+class GameAccount:
+    """Resources used by one game, updated by its controller thread and read
+    by the admin endpoint."""
+
+    def __init__(
+        self,
+        game_id: uuid.UUID,
+        accounting: "GameAccounting",
+        memory_sample_interval: int,
+    ):
+        self.game_id = game_id
+        self.started_at = time.time()
+        self.finished_at: float | None = None
+        self.turns = 0
+        self.tasks = 0
+        self.cpu_seconds = 0.0
+        self.resolution_cpu_seconds = 0.0
+        # bytes by part of the game, of the latest estimate
+        self.retained_bytes: dict[str, int] = {}
+        self.peak_retained_bytes = 0
+        self._accounting = accounting
+        self._memory_sample_interval = memory_sample_interval
+
+    def run(self, task: Callable[..., None], *args):
+        """Run a task of the controller, adding the CPU time of its thread."""
+        start = time.thread_time()
+        try:
+            task(*args)
+        finally:
+            seconds = time.thread_time() - start
+            self.tasks += 1
+            self.cpu_seconds += seconds
+            _task_cpu_seconds.inc(seconds)
+
+    @contextmanager
+    def resolution(self):
+        start = time.thread_time()
+        try:
+            yield
+        finally:
+            seconds = time.thread_time() - start
+            self.resolution_cpu_seconds += seconds
+            _resolution_cpu_seconds.inc(seconds)
+
+    def end_turn(self, estimate_retained_bytes: Callable[[], dict[str, int]]):
+        """``estimate_retained_bytes`` walks the state of the game, it is only
+        called every few turns."""
+        if self.turns % self._memory_sample_interval == 0:
+            self.retained_bytes = estimate_retained_bytes()
+            self.peak_retained_bytes = max(
+                self.peak_retained_bytes, self.total_retained_bytes
+            )
+        self.turns += 1
+
+    @property
+    def total_retained_bytes(self) -> int:
+        return sum(self.retained_bytes.values())
+
+    def close(self):
+        """Called once the game has ended, closing twice is a no-op."""
+        if self.finished_at is not None:
+            return
+        self.finished_at = time.time()
+        self._accounting.close(self)
+
+    def to_dict(self) -> dict:
+        return {
+            "game_id": str(self.game_id),
+            "started_at": self.started_at,
+            "finished_at": self.finished_at,
+            "turns": self.turns,
+            "tasks": self.tasks,
+            "cpu_seconds": self.cpu_seconds,
+            "resolution_cpu_seconds": self.resolution_cpu_seconds,
+            "retained_bytes": dict(self.retained_bytes),
+            "peak_retained_bytes": self.peak_retained_bytes,
+        }
+
+
+class GameAccounting:
+    def __init__(self, config: AccountingConfig = accounting_config):
+        self._config = config
+        self._running: dict[uuid.UUID, GameAccount] = {}
+        self._finished: deque[GameAccount] = deque(maxlen=config.finished_games_kept)
+        self._lock = Lock()
+        _retained_bytes.set_function(self.running_retained_bytes)
+
+    def open_account(self, game_id: uuid.UUID) -> GameAccount:
+        account = GameAccount(game_id, self, self._config.game_memory_sample_interval)
+        with self._lock:
+            self._running[game_id] = account
+        return account
+
+    def close(self, account: GameAccount):
+        with self._lock:
+            self._running.pop(account.game_id, None)
+            self._finished.append(account)
+        logger.info(
+            "Game %s over after %s turns: %.3fs CPU in %s tasks, "
+            "%.3fs resolving turns, %s bytes retained at peak",
+            account.game_id,
+            account.turns,
+            account.cpu_seconds,
+            account.tasks,
+            account.resolution_cpu_seconds,
+            account.peak_retained_bytes,
+        )
+
+    def running_games(self) -> int:
+        return len(self._running)
+
+    def running_retained_bytes(self) -> float:
+        with self._lock:
+            accounts = list(self._running.values())
+        return sum(account.total_retained_bytes for account in accounts)
+
+    def report(self) -> dict:
+        """The running and the last finished games, most CPU first."""
+        with self._lock:
+            running = list(self._running.values())
+            finished = list(self._finished)
+        return {
+            "running": [
+                account.to_dict()
+                for account in sorted(running, key=_by_cpu, reverse=True)
+            ],
+            "finished": [
+                account.to_dict()
+                for account in sorted(finished, key=_by_cpu, reverse=True)
+            ],
+        }
+
+
+def _by_cpu(account: GameAccount) -> float:
+    return account.cpu_seconds
+
+
+game_accounting = GameAccounting()
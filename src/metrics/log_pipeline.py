@@ -0,0 +1,187 @@
+"""Logging off the hot paths.
+
+Once started, the records of the root logger are put on a bounded queue and
+formatted and written in batches by a background thread. Before they are queued, the
+records of every message class, the template of the message, are sampled and
+rate limited: with lazy formatting (``logger.info("Player %s left", id)``) all
+the records of a call site share their template. Warnings and errors are always
+kept.
+"""
+
+import logging
+import random
+import time
+from collections import OrderedDict, deque
+from functools import partial
+from threading import Event, Lock, Thread
+
+from metrics.logging_config import LoggingConfig, logging_config
+from metrics.metrics import metrics_registry
+
+_dropped = metrics_registry.counter(
+    "log_records_dropped_total",
+    "Log records dropped before being written, by reason.",
+    ("reason",),
+)
+_sampled_out = _dropped.labels("sampled")
+_rate_limited = _dropped.labels("rate_limited")
+_queue_full = _dropped.labels("queue_full")
+_queue_depth = metrics_registry.gauge(
+    "log_queue_depth", "Log records waiting for the writer thread."
+)
+
+# message classes with a rate limit bucket, the least recently logged are
+# forgotten beyond it
+_MAX_TRACKED_CLASSES = 1024
+
+
+class SamplingFilter(logging.Filter):
+    def __init__(
+        self,
+        sample_rates: dict[str, float],
+        rate_limit: float,
+        burst: int,
+        clock=time.monotonic,
+    ):
+        super().__init__()
+        self._sample_rates = sample_rates
+        self._rate_limit = rate_limit
+        self._burst = burst
+        self._clock = clock
+        # not the global random, seeded for the games
+        self._sampler = random.Random()
+        # message class -> (tokens, refilled at), least recently logged first
+        self._buckets: OrderedDict[str, tuple[float, float]] = OrderedDict()
+        self._lock = Lock()
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        # warnings and errors are neither sampled nor rate limited
+        if record.levelno >= logging.WARNING:
+            return True
+        message_class = record.msg if isinstance(record.msg, str) else ""
+        sample_rate = self._sample_rates.get(message_class)
+        if sample_rate is not None and self._sampler.random() >= sample_rate:
+            _sampled_out.inc()
+            return False
+        if self._rate_limit and not self._take_token(message_class):
+            _rate_limited.inc()
+            return False
+        return True
+
+    def _take_token(self, message_class: str) -> bool:
+        now = self._clock()
+        with self._lock:
+            tokens, refilled_at = self._buckets.get(message_class, (self._burst, now))
+            tokens = min(self._burst, tokens + (now - refilled_at) * self._rate_limit)
+            if message_class in self._buckets:
+                self._buckets.move_to_end(message_class)
+            elif len(self._buckets) >= _MAX_TRACKED_CLASSES:
+                # f-string messages are a class each: they push out the
+                # classes not logged lately, not the busy templates
+                self._buckets.popitem(last=False)
+            if tokens < 1:
+                self._buckets[message_class] = (tokens, now)
+                return False
+            self._buckets[message_class] = (tokens - 1, now)
+        return True
+
+
+class _QueueHandler(logging.Handler):
+    """Appends the records to the queue of the writer thread, without taking
+    the handler lock: appending to a deque is thread safe."""
+
+    def __init__(self, records: deque[logging.LogRecord], max_size: int):
+        super().__init__()
+        self._records = records
+        self._max_size = max_size
+
+    def handle(self, record: logging.LogRecord) -> bool:
+        if not self.filter(record):
+            return False
+        self.emit(record)
+        return True
+
+    def emit(self, record: logging.LogRecord):
+        if len(self._records) >= self._max_size:
+            _queue_full.inc()
+            return
+        # the arguments may change once the call returns, they are merged
+        # here; the formatting and the I/O are left to the writer thread.
+        # Only this handler sees the record, it is not copied
+        try:
+            record.msg = record.getMessage()
+        except Exception:  # noqa: BLE001 handled by handleError
+            # arguments not matching the message, reported like stdlib handlers
+            self.handleError(record)
+            return
+        record.args = None
+        self._records.append(record)
+
+
+class LogPipeline:
+    def __init__(
+        self,
+        config: LoggingConfig = logging_config,
+        logger: logging.Logger | None = None,
+    ):
+        self._config = config
+        # the root logger by default, every record goes through it
+        self._logger = logger or logging.getLogger()
+        self._records: deque[logging.LogRecord] = deque()
+        self._handler: _QueueHandler | None = None
+        self._handlers: list[logging.Handler] = []
+        self._writer: Thread | None = None
+        self._stop = Event()
+        _queue_depth.set_function(partial(len, self._records))
+
+    def start(self):
+        """Move the handlers of the logger to the writer thread."""
+        if self._writer is not None:
+            return
+        self._handler = _QueueHandler(self._records, self._config.log_queue_size)
+        self._handler.addFilter(
+            SamplingFilter(
+                self._config.log_sample_rates,
+                self._config.log_rate_limit,
+                self._config.log_rate_burst,
+            )
+        )
+        self._handlers = list(self._logger.handlers)
+        for handler in self._handlers:
+            self._logger.removeHandler(handler)
+        self._logger.addHandler(self._handler)
+
+        self._stop.clear()
+        self._writer = Thread(
+            target=self._write_records, name="log-writer", daemon=True
+        )
+        self._writer.start()
+
+    def stop(self):
+        """Write the queued records and give the handlers back to the logger."""
+        if self._writer is None:
+            return
+        self._logger.removeHandler(self._handler)
+        for handler in self._handlers:
+            self._logger.addHandler(handler)
+        self._stop.set()
+        self._writer.join(timeout=5.0)
+        self._writer = None
+        self._handler = None
+
+    def _write_records(self):
+        # woken every interval rather than by every record, the logging
+        # threads never wait for the writer
+        while not self._stop.wait(self._config.log_flush_interval):
+            self._write_queued()
+        self._write_queued()
+
+    def _write_queued(self):
+        while self._records:
+            record = self._records.popleft()
+            for handler in self._handlers:
+                if record.levelno >= handler.level:
+                    handler.handle(record)
+
+
+log_pipeline = LogPipeline()
@@ -0,0 +1,21 @@
+from pydantic import Field
+from pydantic_settings import BaseSettings
+
+
+class LoggingConfig(BaseSettings):
+    log_level: str = Field(default="INFO")
+    # records waiting for the writer thread, new ones are dropped when full
+    log_queue_size: int = Field(default=10000, gt=0)
+    # seconds between two batches written by the writer thread
+    log_flush_interval: float = Field(default=0.1, gt=0)
+    # records per second of every message class, 0 for no limit
+    log_rate_limit: float = Field(default=50, ge=0)
+    log_rate_burst: int = Field(default=100, gt=0)
+    # share of the records kept by message template, warnings are never sampled
+    log_sample_rates: dict[str, float] = Field(
+        # one record for every broadcast of every game
+        default_factory=lambda: {"Broadcast %s to %d players": 0.01}
+    )
+
+
+logging_config = LoggingConfig()
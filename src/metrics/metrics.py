@@ -0,0 +1,267 @@
+import bisect
+import math
+from collections.abc import Callable
+from threading import Lock
+
+DEFAULT_BUCKETS = (
+    0.001,
+    0.005,
+    0.01,
+    0.025,
+    0.05,
+    0.1,
+    0.25,
+    0.5,
+    1.0,
+    2.5,
+    5.0,
+    10.0,
+    30.0,
+    60.0,
+)
+# for work done in a request or a game phase, from 100us to a second
+FAST_BUCKETS = (
+    0.0001,
+    0.00025,
+    0.0005,
+    0.001,
+    0.0025,
+    0.005,
+    0.01,
+    0.025,
+    0.05,
+    0.1,
+    0.25,
+    0.5,
+    1.0,
+)
+
+
+class _Metric:
+    metric_type = ""
+
+    def __init__(self, name: str, documentation: str, labelnames: tuple[str, ...]):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = labelnames
+        self._children: dict[tuple[str, ...], _Metric] = {}
+        self._lock = Lock()
+
+    def labels(self, *labelvalues: str) -> "_Metric":
+        key = tuple(str(value) for value in labelvalues)
+        child = self._children.get(key)
+        if child is None:
+            with self._lock:
+                child = self._children.setdefault(key, self._new_child())
+        return child
+
+    def children(self) -> dict[tuple[str, ...], "_Metric"]:
+        if not self.labelnames:
+            return {(): self}
+        return dict(self._children)
+
+    def _new_child(self) -> "_Metric":
+        raise NotImplementedError
+
+
+class Counter(_Metric):
+    metric_type = "counter"
+
+    def __init__(self, name: str, documentation: str, labelnames: tuple[str, ...] = ()):
+        super().__init__(name, documentation, labelnames)
+        self._value = 0.0
+
+    def inc(self, amount: float = 1.0):
+        with self._lock:
+            self._value += amount
+
+    @property
+    def value(self) -> float:
+        return self._value
+
+    def _new_child(self) -> "Counter":
+        return Counter(self.name, self.documentation)
+
+
+class Gauge(_Metric):
+    metric_type = "gauge"
+
+    def __init__(self, name: str, documentation: str, labelnames: tuple[str, ...] = ()):
+        super().__init__(name, documentation, labelnames)
+        self._value = 0.0
+        self._function: Callable[[], float] | None = None
+
+    def set(self, value: float):
+        with self._lock:
+            self._value = value
+
+    def inc(self, amount: float = 1.0):
+        with self._lock:
+            self._value += amount
+
+    def dec(self, amount: float = 1.0):
+        self.inc(-amount)
+
+    def set_function(self, function: Callable[[], float]):
+        """Read the value from ``function`` when collected, e.g. a queue length."""
+        self._function = function
+
+    @property
+    def value(self) -> float:
+        if self._function is not None:
+            return self._function()
+        return self._value
+
+    def _new_child(self) -> "Gauge":
+        return Gauge(self.name, self.documentation)
+
+
+class Histogram(_Metric):
+    metric_type = "histogram"
+
+    def __init__(
+        self,
+        name: str,
+        documentation: str,
+        labelnames: tuple[str, ...] = (),
+        buckets: tuple[float, ...] = DEFAULT_BUCKETS,
+    ):
+        super().__init__(name, documentation, labelnames)
+        self.buckets = tuple(sorted(buckets))
+        # the last slot counts the observations above the highest bucket (+Inf)
+        self._bucket_counts = [0] * (len(self.buckets) + 1)
+        self._sum = 0.0
+        self._count = 0
+
+    def observe(self, value: float):
+        index = bisect.bisect_left(self.buckets, value)
+        with self._lock:
+            self._bucket_counts[index] += 1
+            self._sum += value
+            self._count += 1
+
+    @property
+    def count(self) -> int:
+        return self._count
+
+    @property
+    def sum(self) -> float:
+        return self._sum
+
+    def cumulative_counts(self) -> list[tuple[float, int]]:
+        """Return the cumulative count of every bucket, +Inf included, as Prometheus expects."""
+        with self._lock:
+            bucket_counts = list(self._bucket_counts)
+
+        result = []
+        total = 0
+        for upper_bound, count in zip(self.buckets + (float("inf"),), bucket_counts):
+            total += count
+            result.append((upper_bound, total))
+        return result
+
+    def quantile(self, q: float) -> float:
+        """Estimate a quantile as the upper bound of the bucket containing it."""
+        if self._count == 0:
+            return 0.0
+        rank = q * self._count
+        for upper_bound, cumulative_count in self.cumulative_counts():
+            if cumulative_count >= rank:
+                return upper_bound
+        return float("inf")
+
+    def _new_child(self) -> "Histogram":
+        return Histogram(self.name, self.documentation, buckets=self.buckets)
+
+
+class MetricsRegistry:
+    def __init__(self):
+        self._metrics: dict[str, _Metric] = {}
+        self._lock = Lock()
+
+    def counter(
+        self, name: str, documentation: str, labelnames: tuple[str, ...] = ()
+    ) -> Counter:
+        return self._register(Counter(name, documentation, labelnames))
+
+    def histogram(
+        self,
+        name: str,
+        documentation: str,
+        labelnames: tuple[str, ...] = (),
+        buckets: tuple[float, ...] = DEFAULT_BUCKETS,
+    ) -> Histogram:
+        return self._register(Histogram(name, documentation, labelnames, buckets))
+
+    def gauge(
+        self, name: str, documentation: str, labelnames: tuple[str, ...] = ()
+    ) -> Gauge:
+        return self._register(Gauge(name, documentation, labelnames))
+
+    def get(self, name: str) -> _Metric | None:
+        return self._metrics.get(name)
+
+    def metrics(self) -> list[_Metric]:
+        with self._lock:
+            return list(self._metrics.values())
+
+    def exposition(self) -> str:
+        """All the metrics in the Prometheus text format, version 0.0.4."""
+        lines = []
+        for metric in self.metrics():
+            lines.append(f"# HELP {metric.name} {_escape_help(metric.documentation)}")
+            lines.append(f"# TYPE {metric.name} {metric.metric_type}")
+            for labelvalues, child in sorted(metric.children().items()):
+                labels = list(zip(metric.labelnames, labelvalues))
+                if isinstance(child, Histogram):
+                    for upper_bound, count in child.cumulative_counts():
+                        bucket_labels = labels + [("le", _format_value(upper_bound))]
+                        lines.append(
+                            f"{metric.name}_bucket{_format_labels(bucket_labels)} {count}"
+                        )
+                    lines.append(
+                        f"{metric.name}_sum{_format_labels(labels)} "
+                        f"{_format_value(child.sum)}"
+                    )
+                    lines.append(
+                        f"{metric.name}_count{_format_labels(labels)} {child.count}"
+                    )
+                else:
+                    lines.append(
+                        f"{metric.name}{_format_labels(labels)} "
+                        f"{_format_value(child.value)}"
+                    )
+        return "\n".join(lines) + "\n"
+
+    def _register(self, metric: _Metric):
+        # registering twice returns the existing metric, so modules can be reloaded
+        with self._lock:
+            return self._metrics.setdefault(metric.name, metric)
+
+
+def _escape_help(documentation: str) -> str:
+    return documentation.replace("\\", "\\\\").replace("\n", "\\n")
+
+
+def _format_labels(labels: list[tuple[str, str]]) -> str:
+    if not labels:
+        return ""
+    formatted = ",".join(
+        f'{name}="{_escape_label_value(value)}"' for name, value in labels
+    )
+    return f"{{{formatted}}}"
+
+
+def _escape_label_value(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _format_value(value: float) -> str:
+    if math.isinf(value):
+        return "+Inf" if value > 0 else "-Inf"
+    if math.isnan(value):
+        return "NaN"
+    return repr(float(value))
+
+
+metrics_registry = MetricsRegistry()
@@ -0,0 +1,13 @@
+from pydantic import Field
+from pydantic_settings import BaseSettings
+
+
+class MonitorConfig(BaseSettings):
+    # seconds between two samples of the event loops and executors
+    monitor_interval: float = Field(default=0.5, gt=0)
+    event_loop_lag_warning: float = Field(default=0.1, gt=0)
+    executor_wait_warning: float = Field(default=0.5, gt=0)
+    executor_queue_warning: int = Field(default=100, gt=0)
+
+
+monitor_config = MonitorConfig()
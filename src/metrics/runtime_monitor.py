@@ -0,0 +1,271 @@
+"""Saturation monitor for the event loops and the executors of the server.
+
+A daemon thread samples, every ``monitor_interval`` seconds, how late each
+watched event loop runs a callback and how many tasks wait in each executor and
+for how long. Crossing a threshold logs a warning, once, and sets
+``runtime_saturated{resource}`` until the resource recovers.
+"""
+
+import asyncio
+import itertools
+import logging
+import time
+import weakref
+from collections import defaultdict
+from collections.abc import Callable
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from functools import partial
+from threading import Event, Lock, Thread
+
+from metrics.metrics import FAST_BUCKETS, metrics_registry
+from metrics.monitor_config import MonitorConfig, monitor_config
+
+logger = logging.getLogger(__name__)
+
+_event_loop_lag_seconds = metrics_registry.histogram(
+    "event_loop_lag_seconds",
+    "Delay between scheduling a callback on an event loop and running it.",
+    ("loop",),
+    buckets=FAST_BUCKETS,
+)
+_executor_wait_seconds = metrics_registry.histogram(
+    "executor_task_wait_seconds",
+    "Time a task waits in an executor queue before a worker runs it.",
+    ("executor",),
+    buckets=FAST_BUCKETS,
+)
+_executor_queue_depth = metrics_registry.gauge(
+    "executor_queue_depth",
+    "Tasks waiting in the executors with the same name, summed: one series "
+    "for the game controllers of all the games.",
+    ("executor",),
+)
+_executor_oldest_wait = metrics_registry.gauge(
+    "executor_oldest_task_wait_seconds",
+    "Age of the oldest task still waiting in the executors with the same name.",
+    ("executor",),
+)
+_saturated = metrics_registry.gauge(
+    "runtime_saturated",
+    "1 while an event loop or executor is over its warning threshold.",
+    ("resource",),
+)
+_saturations = metrics_registry.counter(
+    "runtime_saturations_total",
+    "Times an event loop or executor went over its warning threshold.",
+    ("resource",),
+)
+
+
+@dataclass(frozen=True)
+class RuntimeSample:
+    # seconds late, by event loop
+    event_loop_lags: dict[str, float]
+    # tasks waiting, by executor name
+    executor_queue_depths: dict[str, int]
+
+
+class MonitoredThreadPoolExecutor(ThreadPoolExecutor):
+    """ThreadPoolExecutor measuring how long its tasks wait for a worker.
+
+    Executors with the same name, like the one of every game controller, are
+    reported together: their queue depths are summed and the oldest wait is
+    the longest among them. Games are not labelled, the series stay bounded.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        max_workers: int | None = None,
+        monitor: "RuntimeMonitor | None" = None,
+    ):
+        super().__init__(max_workers=max_workers, thread_name_prefix=name)
+        self.name = name
+        self._wait_seconds = _executor_wait_seconds.labels(name)
+        # submit times of the queued tasks by task number, oldest first
+        self._queued: dict[int, float] = {}
+        self._queued_lock = Lock()
+        self._task_numbers = itertools.count()
+        self._monitor = monitor or runtime_monitor
+        self._monitor.watch_executor(self)
+
+    def submit(self, fn, /, *args, **kwargs):
+        task = next(self._task_numbers)
+        with self._queued_lock:
+            self._queued[task] = time.monotonic()
+        try:
+            future = super().submit(self._run_task, task, fn, *args, **kwargs)
+        except RuntimeError:
+            # shut down, the task will never run
+            self._dequeue(task)
+            raise
+        # a cancelled task never runs, it leaves the queue with its future
+        future.add_done_callback(partial(self._on_done, task))
+        return future
+
+    def shutdown(self, wait: bool = True, *, cancel_futures: bool = False):
+        self._monitor.unwatch_executor(self)
+        super().shutdown(wait, cancel_futures=cancel_futures)
+
+    def queue_depth(self) -> int:
+        return len(self._queued)
+
+    def oldest_task_wait(self) -> float:
+        with self._queued_lock:
+            oldest = next(iter(self._queued.values()), None)
+        return time.monotonic() - oldest if oldest is not None else 0.0
+
+    def _run_task(self, task: int, fn, /, *args, **kwargs):
+        submitted_at = self._dequeue(task)
+        if submitted_at is not None:
+            self._wait_seconds.observe(time.monotonic() - submitted_at)
+        return fn(*args, **kwargs)
+
+    def _on_done(self, task: int, _):
+        self._dequeue(task)
+
+    def _dequeue(self, task: int) -> float | None:
+        with self._queued_lock:
+            return self._queued.pop(task, None)
+
+
+class _LoopProbe:
+    def __init__(self, name: str, loop: asyncio.AbstractEventLoop):
+        self.name = name
+        self.loop = loop
+        self.sent_at: float | None = None
+        self.last_lag = 0.0
+        self._lag_seconds = _event_loop_lag_seconds.labels(name)
+
+    def send(self):
+        self.sent_at = time.monotonic()
+        self.loop.call_soon_threadsafe(self._answer, self.sent_at)
+
+    def pending_for(self) -> float:
+        return time.monotonic() - self.sent_at if self.sent_at is not None else 0.0
+
+    def _answer(self, sent_at: float):
+        self.last_lag = time.monotonic() - sent_at
+        self._lag_seconds.observe(self.last_lag)
+        self.sent_at = None
+
+
+class RuntimeMonitor:
+    def __init__(self, config: MonitorConfig = monitor_config):
+        self._config = config
+        self._loops: dict[str, _LoopProbe] = {}
+        self._executors: weakref.WeakSet[MonitoredThreadPoolExecutor] = (
+            weakref.WeakSet()
+        )
+        self._saturated_resources: set[str] = set()
+        self._listeners: list[Callable[[RuntimeSample], None]] = []
+        self._lock = Lock()
+        self._stop = Event()
+        self._thread: Thread | None = None
+
+    def watch_event_loop(self, name: str, loop: asyncio.AbstractEventLoop):
+        with self._lock:
+            self._loops[name] = _LoopProbe(name, loop)
+
+    def watch_executor(self, executor: MonitoredThreadPoolExecutor):
+        with self._lock:
+            self._executors.add(executor)
+
+    def unwatch_executor(self, executor: MonitoredThreadPoolExecutor):
+        with self._lock:
+            self._executors.discard(executor)
+
+    def add_listener(self, listener: Callable[[RuntimeSample], None]):
+        """Call ``listener`` with every sample, on the monitor thread."""
+        with self._lock:
+            self._listeners.append(listener)
+
+    def start(self):
+        if self._thread is None or not self._thread.is_alive():
+            self._stop.clear()
+            self._thread = Thread(target=self._run, name="runtime-monitor", daemon=True)
+            self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout=5.0)
+
+    def check(self):
+        """Take one sample of every watched event loop and executor."""
+        with self._lock:
+            probes = list(self._loops.values())
+            executors = list(self._executors)
+            listeners = list(self._listeners)
+
+        event_loop_lags = {
+            probe.name: lag
+            for probe in probes
+            if (lag := self._check_event_loop(probe)) is not None
+        }
+
+        queue_depths: defaultdict[str, int] = defaultdict(int)
+        oldest_waits: defaultdict[str, float] = defaultdict(float)
+        for executor in executors:
+            queue_depths[executor.name] += executor.queue_depth()
+            oldest_waits[executor.name] = max(
+                oldest_waits[executor.name], executor.oldest_task_wait()
+            )
+        for name, queue_depth in queue_depths.items():
+            oldest_wait = oldest_waits[name]
+            _executor_queue_depth.labels(name).set(queue_depth)
+            _executor_oldest_wait.labels(name).set(oldest_wait)
+            self._update_saturation(
+                f"executor:{name}",
+                queue_depth >= self._config.executor_queue_warning
+                or oldest_wait >= self._config.executor_wait_warning,
+                f"{queue_depth} tasks queued, the oldest for {oldest_wait:.3f}s",
+            )
+
+        sample = RuntimeSample(event_loop_lags, dict(queue_depths))
+        for listener in listeners:
+            listener(sample)
+
+    def _check_event_loop(self, probe: _LoopProbe) -> float | None:
+        if probe.loop.is_closed():
+            with self._lock:
+                self._loops.pop(probe.name, None)
+            return None
+
+        # a probe still pending means the loop is busy since it was sent
+        lag = probe.pending_for() if probe.sent_at is not None else probe.last_lag
+        self._update_saturation(
+            f"event_loop:{probe.name}",
+            lag >= self._config.event_loop_lag_warning,
+            f"callbacks run {lag:.3f}s late",
+        )
+        if probe.sent_at is None:
+            try:
+                probe.send()
+            except RuntimeError:
+                # the loop was closed in the meantime
+                pass
+        return lag
+
+    def _update_saturation(self, resource: str, is_saturated: bool, details: str):
+        was_saturated = resource in self._saturated_resources
+        if is_saturated and not was_saturated:
+            self._saturated_resources.add(resource)
+            _saturated.labels(resource).set(1)
+            _saturations.labels(resource).inc()
+            logger.warning("%s is saturated: %s", resource, details)
+        elif not is_saturated and was_saturated:
+            self._saturated_resources.discard(resource)
+            _saturated.labels(resource).set(0)
+            logger.info("%s recovered: %s", resource, details)
+
+    def _run(self):
+        while not self._stop.wait(self._config.monitor_interval):
+            try:
+                self.check()
+            except Exception:
+                logger.exception("Runtime monitor check failed")
+
+
+runtime_monitor = RuntimeMonitor()
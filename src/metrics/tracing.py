@@ -0,0 +1,133 @@
+"""Lightweight tracing of a request across the threads it goes through.
+
+A Trace is created where a request enters the server and handed along with it,
+every hop marking the time it is done. When the answer is sent the trace feeds
+``trace_hop_seconds{trace,hop}``; sampled traces are also appended to a JSON
+lines file by a background thread.
+"""
+
+import json
+import logging
+import random
+import time
+import uuid
+from pathlib import Path
+from queue import Queue
+from threading import Lock, Thread
+
+from metrics.metrics import FAST_BUCKETS, metrics_registry
+from metrics.tracing_config import TracingConfig, tracing_config
+
+logger = logging.getLogger(__name__)
+
+_hop_seconds = metrics_registry.histogram(
+    "trace_hop_seconds",
+    "Time spent by a traced request in each hop, from the end of the previous one.",
+    ("trace", "hop"),
+    buckets=FAST_BUCKETS,
+)
+_total_seconds = metrics_registry.histogram(
+    "trace_total_seconds",
+    "Time from receiving a traced request to sending its answer.",
+    ("trace",),
+    buckets=FAST_BUCKETS,
+)
+
+
+class Trace:
+    __slots__ = ("_finished", "_marks", "_started_at", "_tracer", "name", "sampled")
+
+    def __init__(self, name: str, sampled: bool, tracer: "Tracer"):
+        self.name = name
+        self.sampled = sampled
+        self._tracer = tracer
+        self._started_at = time.time()
+        self._marks: list[tuple[str, float]] = [("start", time.perf_counter())]
+        self._finished = False
+
+    def mark(self, hop: str):
+        """Mark the end of a hop, which started at the previous mark."""
+        self._marks.append((hop, time.perf_counter()))
+
+    def finish(self, outcome: str):
+        # a request may be answered by more than one update, the first ends it
+        if self._finished:
+            return
+        self._finished = True
+        self._tracer.record(self, outcome)
+
+    def hops(self) -> list[tuple[str, float]]:
+        return [
+            (hop, end - start)
+            for (_, start), (hop, end) in zip(self._marks, self._marks[1:])
+        ]
+
+    def total_seconds(self) -> float:
+        return self._marks[-1][1] - self._marks[0][1]
+
+    def to_dict(self, outcome: str) -> dict:
+        return {
+            "trace_id": uuid.uuid4().hex,
+            "name": self.name,
+            "outcome": outcome,
+            "started_at": self._started_at,
+            "total_seconds": self.total_seconds(),
+            "hops": [{"hop": hop, "seconds": seconds} for hop, seconds in self.hops()],
+        }
+
+
+class Tracer:
+    def __init__(self, config: TracingConfig = tracing_config):
+        self._config = config
+        # not the global random, seeded for the games
+        self._sampler = random.Random()
+        self._dumps: Queue[dict] = Queue()
+        self._writer: Thread | None = None
+        self._writer_lock = Lock()
+
+    def start_trace(self, name: str) -> Trace:
+        return Trace(
+            name, self._sampler.random() < self._config.trace_sample_rate, self
+        )
+
+    def record(self, trace: Trace, outcome: str):
+        for hop, seconds in trace.hops():
+            _hop_seconds.labels(trace.name, hop).observe(seconds)
+        _total_seconds.labels(trace.name).observe(trace.total_seconds())
+
+        if trace.sampled and self._config.trace_dump_path:
+            self._start_writer()
+            self._dumps.put(trace.to_dict(outcome))
+
+    def flush(self):
+        """Wait until the sampled traces recorded so far are written."""
+        if self._writer is not None:
+            self._dumps.join()
+
+    def _start_writer(self):
+        if self._writer is None:
+            with self._writer_lock:
+                if self._writer is None:
+                    self._writer = Thread(
+                        target=self._write_dumps, name="trace-writer", daemon=True
+                    )
+                    self._writer.start()
+
+    def _write_dumps(self):
+        dump_path = Path(self._config.trace_dump_path)
+        dump_path.parent.mkdir(parents=True, exist_ok=True)
+        with open(dump_path, "a", encoding="utf-8") as f:
+            while True:
+                dump = self._dumps.get()
+                try:
+                    f.write(json.dumps(dump) + "\n")
+                    # write in batches, flush once the queue is drained
+                    if self._dumps.empty():
+                        f.flush()
+                except OSError as e:
+                    logger.error("Cannot write trace dump: %s", e)
+                finally:
+                    self._dumps.task_done()
+
+
+tracer = Tracer()
@@ -0,0 +1,17 @@
+import tempfile
+from pathlib import Path
+
+from pydantic import Field
+from pydantic_settings import BaseSettings
+
+
+class TracingConfig(BaseSettings):
+    # share of the traces written to the dump file, all feed the histograms
+    trace_sample_rate: float = Field(default=0.01, ge=0, le=1)
+    # out of the working directory unless configured, empty to disable
+    trace_dump_path: str = Field(
+        default=str(Path(tempfile.gettempdir()) / "hex-core" / "traces.jsonl")
+    )
+
+
+tracing_config = TracingConfig()
@@ -1,16 +1,16 @@
-import copy
 from collections import defaultdict
-from typing import DefaultDict
 
-from pydantic import BaseModel, field_serializer
+from pydantic import BaseModel, ConfigDict, field_serializer, field_validator
 
 from model.board.hexagon_coordinates import HexagonCoordinates
-from model.troops import Troop, PlayableTroopType, HomeBaseTroop
-from player.player import Player
+from model.troops import HomeBaseTroop, Troop
+from player.player import Seat
 
 
 class Board(BaseModel):
+    model_config = ConfigDict(defer_build=True)
     coordinates_to_occupation: dict[HexagonCoordinates, Troop | None]
+    core_coordinates: HexagonCoordinates = HexagonCoordinates(q=0, r=0)
 
     @field_serializer("coordinates_to_occupation")
     def serialize_coordinates_to_occupation(
@@ -22,46 +22,63 @@ class Board(BaseModel):
             for coord, troop in coordinates_to_occupation.items()
         ]
 
+    @field_validator("coordinates_to_occupation", mode="before")
+    @classmethod
+    def validate_coordinates_to_occupation(cls, coordinates_to_occupation):
+        # accept the serialized (q, r, troop) list back
+        if isinstance(coordinates_to_occupation, list):
+            return {
+                HexagonCoordinates(q=q, r=r): troop
+                for q, r, troop in coordinates_to_occupation
+            }
+        return coordinates_to_occupation
+
     def add_player_troop(self, troop: Troop, coordinate: HexagonCoordinates) -> "Board":
-        new_board_state = copy.deepcopy(self.coordinates_to_occupation)
+        new_board_state = dict(self.coordinates_to_occupation)
         new_board_state[coordinate] = troop
-        return Board(coordinates_to_occupation=new_board_state)
+        return self._with_occupation(new_board_state)
 
     def move_troop(
         self,
         starting_coordinate: HexagonCoordinates,
         destination_coordinate: HexagonCoordinates,
     ) -> "Board":
-        new_board_state = copy.deepcopy(self.coordinates_to_occupation)
+        new_board_state = dict(self.coordinates_to_occupation)
         troop = new_board_state[starting_coordinate]
         new_board_state[destination_coordinate] = troop
         new_board_state[starting_coordinate] = None
-        return Board(coordinates_to_occupation=new_board_state)
+        return self._with_occupation(new_board_state)
 
     def remove_troop(self, coordinate: HexagonCoordinates) -> "Board":
-        new_board_state = copy.deepcopy(self.coordinates_to_occupation)
+        new_board_state = dict(self.coordinates_to_occupation)
         new_board_state[coordinate] = None
-        return Board(coordinates_to_occupation=new_board_state)
+        return self._with_occupation(new_board_state)
 
-    def playable_troop_by_players(self) -> dict[Player, dict[PlayableTroopType, int]]:
-        count: DefaultDict[Player, DefaultDict[PlayableTroopType, int]] = defaultdict(
+    def playable_troop_by_seat(self) -> dict[Seat, dict[str, int]]:
+        count: defaultdict[Seat, defaultdict[str, int]] = defaultdict(
             lambda: defaultdict(int)
         )
 
         for occupation in self.coordinates_to_occupation.values():
             if occupation is not None and not isinstance(occupation, HomeBaseTroop):
-                count[occupation.owner][occupation] += 1
+                count[occupation.owner][occupation.troop_type] += 1
 
         return dict(count)
 
-    def remove_player_troops(self, player: Player) -> "Board":
-        new_board_state = copy.deepcopy(self.coordinates_to_occupation)
-        for coordinate in new_board_state.keys():
-
-            if (
-                new_board_state[coordinate] is not None
-                and new_board_state[coordinate].owner == player
-            ):
+    def remove_player_troops(self, seat: Seat) -> "Board":
+        new_board_state = dict(self.coordinates_to_occupation)
+        for coordinate, troop in self.coordinates_to_occupation.items():
+            if troop is not None and troop.owner == seat:
                 new_board_state[coordinate] = None
 
-        return Board(coordinates_to_occupation=new_board_state)
+        return self._with_occupation(new_board_state)
+
+    def _with_occupation(
+        self, coordinates_to_occupation: dict[HexagonCoordinates, Troop | None]
+    ) -> "Board":
+        # troops are never mutated, so boards can share them; the tiles are
+        # already validated and pydantic validation is skipped
+        return Board.model_construct(
+            coordinates_to_occupation=coordinates_to_occupation,
+            core_coordinates=self.core_coordinates,
+        )
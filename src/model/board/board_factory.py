@@ -1,24 +1,85 @@
 import math
-from typing import Callable
+from collections.abc import Callable, Iterable
+from threading import Lock
 
 from model.board.board import Board
 from model.board.hexagon_coordinates import HexagonCoordinates
+from model.board.level import Level
 from model.troops import HomeBaseTroop, Troop
-from player.player import Player
 
+# a level, or only its tiles
+MapGenerator = Callable[[int], Level | set[HexagonCoordinates]]
 
-def generate_board(
-    players: list[Player], map_generator: Callable[[int], set[HexagonCoordinates]]
-) -> Board:
-    n_players = len(players)
-    points = map_generator(n_players)
-    coordinates_to_occupation: dict[HexagonCoordinates, Troop | None] = {
-        coordinate: None for coordinate in points
-    }
-    for player, vertice in zip(players, _find_vertices(points, n_players)):
-        coordinates_to_occupation[vertice] = HomeBaseTroop(owner=player)
 
-    return Board(coordinates_to_occupation=coordinates_to_occupation)
+class BoardTemplate:
+    """Empty board of a level with its home bases already placed.
+
+    Tiles are computed and validated once; the board of a new game only copies
+    the tiles and gives the i-th home base of the level to seat i.
+    """
+
+    def __init__(self, level: Level):
+        self._empty_board: dict[HexagonCoordinates, Troop | None] = {
+            coordinate: None for coordinate in level.points
+        }
+        self._home_bases = level.home_bases
+        self._core = level.core
+
+    def new_board(self) -> Board:
+        coordinates_to_occupation = dict(self._empty_board)
+        for seat, vertice in enumerate(self._home_bases):
+            coordinates_to_occupation[vertice] = HomeBaseTroop.model_construct(
+                owner=seat
+            )
+
+        # tiles are already validated, skip pydantic validation
+        return Board.model_construct(
+            coordinates_to_occupation=coordinates_to_occupation,
+            core_coordinates=self._core,
+        )
+
+
+class BoardTemplates:
+    """Board templates by number of players, the ones of ``players_numbers``
+    built up front and the others by the first game of their size."""
+
+    def __init__(
+        self,
+        map_generator: MapGenerator,
+        players_numbers: Iterable[int] = (),
+    ):
+        self._map_generator = map_generator
+        self._templates: dict[int, BoardTemplate] = {
+            n_players: BoardTemplate(as_level(map_generator(n_players), n_players))
+            for n_players in players_numbers
+        }
+        self._lock = Lock()
+
+    def generate_board(self, n_players: int) -> Board:
+        template = self._templates.get(n_players)
+        if template is None:
+            # games are created on several threads, a template is built once
+            with self._lock:
+                template = self._templates.get(n_players)
+                if template is None:
+                    template = BoardTemplate(
+                        as_level(self._map_generator(n_players), n_players)
+                    )
+                    self._templates[n_players] = template
+        return template.new_board()
+
+
+def generate_board(n_players: int, map_generator: MapGenerator) -> Board:
+    return BoardTemplate(as_level(map_generator(n_players), n_players)).new_board()
+
+
+def as_level(level: Level | Iterable[HexagonCoordinates], n_players: int) -> Level:
+    """Levels given by their tiles alone, as the JSON levels, get the home
+    bases found by ``find_home_bases`` and the core at the center."""
+    if isinstance(level, Level):
+        return level
+    points = frozenset(level)
+    return Level(points, tuple(find_home_bases(points, n_players)))
 
 
 def _angle(coordinates: HexagonCoordinates) -> float:
@@ -31,7 +92,8 @@ def _dist2(coordinates: HexagonCoordinates) -> float:
     return x * x + y * y
 
 
-def _find_vertices(points, n_players) -> list[HexagonCoordinates]:
+def find_home_bases(points, n_players) -> list[HexagonCoordinates]:
+    """The farthest tile from the center in each of n_players angular sectors."""
     buckets = [[] for _ in range(n_players)]
     step = 2 * math.pi / n_players
 
@@ -44,7 +106,8 @@ def _find_vertices(points, n_players) -> list[HexagonCoordinates]:
     for bucket in buckets:
         if not bucket:
             continue
-        v = max(bucket, key=_dist2)
+        # ties broken by coordinates, not by the iteration order of the set
+        v = max(bucket, key=lambda c: (_dist2(c), c.q, c.r))
         vertices.append(v)
 
     return vertices
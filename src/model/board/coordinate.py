@@ -1,8 +1,11 @@
 from abc import ABC, abstractmethod
-from pydantic import BaseModel
+
+from pydantic import BaseModel, ConfigDict
 
 
 class Coordinate(ABC, BaseModel):
+    model_config = ConfigDict(defer_build=True)
+
     @abstractmethod
     def distance(self, other: "Coordinate") -> int:
         """Compute the distance between this coordinate and another coordinate.
@@ -11,7 +14,6 @@ class Coordinate(ABC, BaseModel):
         Returns:
             int: The distance between the two coordinates.
         """
-        pass
 
     def is_nearby(self, other: "Coordinate") -> bool:
         """Check if this coordinate is nearby another coordinate.
@@ -0,0 +1,164 @@
+"""Vectorized hex geometry over arrays of axial coordinates.
+
+Coordinates are NumPy arrays of shape (..., 2) holding (q, r). LevelGeometry
+indexes the tiles of a level, with the neighbours of every tile, for the
+queries walking the level; ``level_geometry`` computes it once per level.
+"""
+
+from collections.abc import Iterable
+from functools import lru_cache
+
+import numpy as np
+
+from model.board.hexagon_coordinates import HexagonCoordinates
+
+# same order as HexagonCoordinates.neighbours
+DIRECTIONS = np.array(
+    [(1, 0), (1, -1), (0, -1), (-1, 0), (-1, 1), (0, 1)], dtype=np.int32
+)
+NO_TILE = -1
+
+
+def as_axial(tiles: Iterable[HexagonCoordinates]) -> np.ndarray:
+    return np.array([(tile.q, tile.r) for tile in tiles], dtype=np.int32).reshape(-1, 2)
+
+
+def as_tiles(axial: np.ndarray) -> list[HexagonCoordinates]:
+    return [HexagonCoordinates(q=q, r=r) for q, r in axial.tolist()]
+
+
+def distances(origin: HexagonCoordinates, axial: np.ndarray) -> np.ndarray:
+    dq = axial[..., 0] - origin.q
+    dr = axial[..., 1] - origin.r
+    return np.maximum(np.maximum(np.abs(dq), np.abs(dr)), np.abs(dq + dr))
+
+
+def neighbours(axial: np.ndarray) -> np.ndarray:
+    """The six neighbours of every coordinate, shape (..., 6, 2)."""
+    return axial[..., None, :] + DIRECTIONS
+
+
+def ring(center: HexagonCoordinates, radius: int) -> np.ndarray:
+    """The 6 * radius coordinates at ``radius`` from ``center``."""
+    if radius == 0:
+        return np.array([(center.q, center.r)], dtype=np.int32)
+    start = np.array((center.q, center.r), dtype=np.int32) + DIRECTIONS[4] * radius
+    steps = np.repeat(DIRECTIONS, radius, axis=0)
+    return start + np.cumsum(steps, axis=0) - steps
+
+
+def spiral(center: HexagonCoordinates, radius: int) -> np.ndarray:
+    """The coordinates within ``radius`` of ``center``, ring by ring."""
+    return np.concatenate([ring(center, k) for k in range(radius + 1)])
+
+
+def line(start: HexagonCoordinates, end: HexagonCoordinates) -> np.ndarray:
+    """The coordinates of the hex line from ``start`` to ``end``, both included."""
+    n = start.distance(end)
+    t = np.linspace(0.0, 1.0, n + 1)[:, None]
+    # nudged off the edges between two hexagons, so that ties round the same way
+    a = np.array((start.q + 1e-6, start.r + 1e-6))
+    b = np.array((end.q + 1e-6, end.r + 1e-6))
+    return _cube_round(a + (b - a) * t)
+
+
+def to_xy(axial: np.ndarray) -> np.ndarray:
+    """Pixel coordinates of the centers, as HexagonCoordinates.to_xy."""
+    q = axial[..., 0].astype(np.float64)
+    r = axial[..., 1].astype(np.float64)
+    return np.stack((3 / 2 * q, np.sqrt(3) * (r + q / 2)), axis=-1)
+
+
+def _cube_round(fractional: np.ndarray) -> np.ndarray:
+    q, r = fractional[..., 0], fractional[..., 1]
+    s = -q - r
+    rq, rr, rs = np.round(q), np.round(r), np.round(s)
+    dq, dr, ds = np.abs(rq - q), np.abs(rr - r), np.abs(rs - s)
+    fix_q = (dq > dr) & (dq > ds)
+    fix_r = ~fix_q & (dr > ds)
+    rq = np.where(fix_q, -rr - rs, rq)
+    rr = np.where(fix_r, -rq - rs, rr)
+    return np.stack((rq, rr), axis=-1).astype(np.int32)
+
+
+class LevelGeometry:
+    """Tiles of a level as indexes, sorted by (q, r), with their neighbours."""
+
+    def __init__(self, tiles: Iterable[HexagonCoordinates]):
+        self.tiles = sorted(set(tiles), key=lambda tile: (tile.q, tile.r))
+        if not self.tiles:
+            raise ValueError("No tiles in the level")
+        self.index = {tile: index for index, tile in enumerate(self.tiles)}
+        self.axial = as_axial(self.tiles)
+
+        # dense lookup over the bounding box of the level
+        self._origin = self.axial.min(axis=0)
+        self._span = self.axial.max(axis=0) - self._origin + 1
+        self._lookup = np.full(self._span, NO_TILE, dtype=np.int32)
+        shifted = self.axial - self._origin
+        self._lookup[shifted[:, 0], shifted[:, 1]] = np.arange(len(self.tiles))
+
+        # neighbour tile indexes, NO_TILE where the neighbour is off the level
+        self.neighbours = self.indexes(neighbours(self.axial))
+
+    @property
+    def n_tiles(self) -> int:
+        return len(self.tiles)
+
+    def indexes(self, axial: np.ndarray) -> np.ndarray:
+        """Tile index of every coordinate, NO_TILE for the ones off the level."""
+        shifted = axial - self._origin
+        inside = np.all((shifted >= 0) & (shifted < self._span), axis=-1)
+        indexes = np.full(axial.shape[:-1], NO_TILE, dtype=np.int32)
+        indexes[inside] = self._lookup[shifted[inside][:, 0], shifted[inside][:, 1]]
+        return indexes
+
+    def distances_from(self, tile: HexagonCoordinates) -> np.ndarray:
+        return distances(tile, self.axial)
+
+    def within(self, tile: HexagonCoordinates, radius: int) -> list[HexagonCoordinates]:
+        return [
+            self.tiles[index]
+            for index in np.flatnonzero(self.distances_from(tile) <= radius)
+        ]
+
+    def neighbour_table(
+        self,
+    ) -> dict[HexagonCoordinates, tuple[HexagonCoordinates, ...]]:
+        return {
+            tile: tuple(self.tiles[index] for index in row if index != NO_TILE)
+            for tile, row in zip(self.tiles, self.neighbours.tolist())
+        }
+
+    def reachable(
+        self,
+        sources: Iterable[HexagonCoordinates],
+        max_steps: int | None = None,
+        passable: np.ndarray | None = None,
+    ) -> np.ndarray:
+        """Steps from the nearest source to every tile walking through
+        neighbours, NO_TILE for the tiles not reachable within ``max_steps``.
+        ``passable`` is a mask of the tiles that can be walked into."""
+        steps = np.full(self.n_tiles, NO_TILE, dtype=np.int32)
+        frontier = np.array(
+            [self.index[source] for source in sources if source in self.index],
+            dtype=np.int32,
+        )
+        steps[frontier] = 0
+        step = 0
+        while frontier.size and (max_steps is None or step < max_steps):
+            step += 1
+            candidates = self.neighbours[frontier].ravel()
+            candidates = candidates[candidates != NO_TILE]
+            candidates = candidates[steps[candidates] == NO_TILE]
+            if passable is not None:
+                candidates = candidates[passable[candidates]]
+            frontier = np.unique(candidates)
+            steps[frontier] = step
+        return steps
+
+
+@lru_cache(maxsize=64)
+def level_geometry(tiles: frozenset[HexagonCoordinates]) -> LevelGeometry:
+    """The geometry of a level, computed once per set of tiles."""
+    return LevelGeometry(tiles)
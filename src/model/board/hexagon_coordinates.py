@@ -10,6 +10,12 @@ class HexagonCoordinates(Coordinate):
     q: int
     r: int
 
+    def __init__(self, q: int, r: int, **data):
+        # HexagonCoordinates(q, r) as well as HexagonCoordinates(q=q, r=r)
+        self.__pydantic_validator__.validate_python(
+            {"q": q, "r": r, **data}, self_instance=self
+        )
+
     def __hash__(self):
         return hash((self.q, self.r))
 
@@ -35,6 +41,13 @@ class HexagonCoordinates(Coordinate):
         y2 = -x2 - z2
         return max(abs(x1 - x2), abs(y1 - y2), abs(z1 - z2))
 
+    def neighbours(self) -> list["HexagonCoordinates"]:
+        """Return the six hexagons adjacent to this one."""
+        return [
+            HexagonCoordinates(q=self.q + dq, r=self.r + dr)
+            for dq, dr in ((1, 0), (1, -1), (0, -1), (-1, 0), (-1, 1), (0, 1))
+        ]
+
     def to_xy(self):
         x = 3 / 2 * self.q
         y = sqrt(3) * (self.r + self.q / 2)
@@ -0,0 +1,15 @@
+from dataclasses import dataclass
+
+from model.board.hexagon_coordinates import HexagonCoordinates
+
+# the default core, the coordinates of a level are never mutated
+_CENTER = HexagonCoordinates(q=0, r=0)
+
+
+@dataclass(frozen=True)
+class Level:
+    """Tiles of a map, with the home base of each seat and the core."""
+
+    points: frozenset[HexagonCoordinates]
+    home_bases: tuple[HexagonCoordinates, ...]
+    core: HexagonCoordinates = _CENTER
@@ -0,0 +1,67 @@
+"""Compiled levels: a header, the home bases and the tiles as int16 pairs.
+
+Reading a compiled level memory maps the file and unpacks the tiles in bulk,
+with no JSON parsing.
+"""
+
+import mmap
+import struct
+from pathlib import Path
+
+from model.board.hexagon_coordinates import HexagonCoordinates
+from model.board.level import Level
+
+MAGIC = b"HEXLVL"
+VERSION = 1
+# magic, version, home bases, core q, core r, tiles
+HEADER = struct.Struct("<6sHHhhI")
+COORDINATES = struct.Struct("<hh")
+
+
+def write_level(path: Path | str, level: Level):
+    tiles = sorted(level.points, key=lambda c: (c.q, c.r))
+    with open(path, "wb") as f:
+        f.write(
+            HEADER.pack(
+                MAGIC,
+                VERSION,
+                len(level.home_bases),
+                level.core.q,
+                level.core.r,
+                len(tiles),
+            )
+        )
+        f.writelines(
+            COORDINATES.pack(coordinates.q, coordinates.r)
+            for coordinates in (*level.home_bases, *tiles)
+        )
+
+
+def read_level(path: Path | str) -> Level:
+    with open(path, "rb") as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as m:
+        magic, version, n_home_bases, core_q, core_r, n_tiles = HEADER.unpack_from(m)
+        if magic != MAGIC or version != VERSION:
+            raise ValueError(f"{path} is not a version {VERSION} compiled level")
+
+        home_bases_end = HEADER.size + n_home_bases * COORDINATES.size
+        tiles_end = home_bases_end + n_tiles * COORDINATES.size
+        if len(m) < tiles_end:
+            raise ValueError(f"{path} is truncated")
+        with memoryview(m) as view:
+            home_bases = _coordinates(view[HEADER.size : home_bases_end])
+            points = _coordinates(view[home_bases_end:tiles_end])
+
+    return Level(
+        frozenset(points),
+        tuple(home_bases),
+        HexagonCoordinates(q=core_q, r=core_r),
+    )
+
+
+def _coordinates(view: memoryview) -> list[HexagonCoordinates]:
+    # validating two ints is faster than model_construct
+    coordinates = [
+        HexagonCoordinates(q=q, r=r) for q, r in COORDINATES.iter_unpack(view)
+    ]
+    view.release()
+    return coordinates
@@ -0,0 +1,86 @@
+"""Deterministic procedural levels for any number of players.
+
+The map is a hexagon of tiles around the core cut in one angular sector per
+player. Holes are decided by a hash of the seed, the distance from the core
+and the distance from the middle of the sector, so every sector, mirrored
+around its middle, gets the same pattern. The middles and the ring around the
+core are never holed: every home base is connected to the core.
+
+Compile the levels shipped with the server with:
+
+    PYTHONPATH=src python -m model.board.level_generator --players 5 6 7 8
+"""
+
+import argparse
+import hashlib
+import math
+from pathlib import Path
+
+import numpy as np
+
+from model.board import hex_geometry
+from model.board.board_factory import find_home_bases
+from model.board.hex_geometry import NO_TILE, LevelGeometry, as_tiles, spiral, to_xy
+from model.board.hexagon_coordinates import HexagonCoordinates
+from model.board.level import Level
+from model.board.level_format import write_level
+
+CORE = HexagonCoordinates(q=0, r=0)
+
+
+def default_radius(n_players: int) -> int:
+    return max(5, n_players + 2)
+
+
+def generate_level(
+    n_players: int, radius: int | None = None, seed: int = 0, holes: float = 0.2
+) -> Level:
+    if n_players < 1:
+        raise ValueError("A level needs at least one player")
+    radius = radius if radius is not None else default_radius(n_players)
+    sector = 2 * math.pi / n_players
+
+    axial = spiral(CORE, radius)
+    distances = hex_geometry.distances(CORE, axial)
+    # same angle as the home bases sectors, from 0 to 2 pi
+    xy = to_xy(axial)
+    angles = np.arctan2(xy[:, 0], xy[:, 1]) + math.pi
+    offsets = np.abs((angles % sector) / sector - 0.5) * sector * distances
+    pairs = list(zip(distances.tolist(), np.round(offsets).astype(int).tolist()))
+
+    # one hash per (distance, offset), shared by the mirrored tiles
+    noise = {pair: _noise(seed, *pair) for pair in set(pairs)}
+    holed = np.array([noise[pair] for pair in pairs]) < holes
+    kept = (distances <= 1) | (offsets < 1) | ~holed
+
+    points = _connected_to_core(as_tiles(axial[kept]))
+    return Level(frozenset(points), tuple(find_home_bases(points, n_players)), CORE)
+
+
+def _noise(seed: int, distance: int, offset: int) -> float:
+    # stable across processes, unlike hash()
+    digest = hashlib.blake2b(f"{seed}:{distance}:{offset}".encode(), digest_size=8)
+    return int.from_bytes(digest.digest()) / 2**64
+
+
+def _connected_to_core(points: list[HexagonCoordinates]) -> set[HexagonCoordinates]:
+    geometry = LevelGeometry(points)
+    steps = geometry.reachable([CORE])
+    return {geometry.tiles[index] for index in np.flatnonzero(steps != NO_TILE)}
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--players", type=int, nargs="+", required=True)
+    parser.add_argument("--radius", type=int, default=None)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--holes", type=float, default=0.2)
+    parser.add_argument("--output", type=Path, default=Path("src/resources"))
+    args = parser.parse_args()
+
+    for n_players in args.players:
+        level = generate_level(n_players, args.radius, args.seed, args.holes)
+        path = args.output / f"{n_players}.hexlevel"
+        write_level(path, level)
+        home_bases = ", ".join(f"({c.q}, {c.r})" for c in level.home_bases)
+        print(f"{path}: {len(level.points)} tiles, home bases {home_bases}")
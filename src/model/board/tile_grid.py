@@ -0,0 +1,62 @@
+from functools import lru_cache
+
+import numpy as np
+
+from model.board.hex_geometry import LevelGeometry, level_geometry
+from model.board.hexagon_coordinates import HexagonCoordinates
+
+# the (q, r) of a square block of axial coordinates
+Cell = tuple[int, int]
+
+
+class TileGrid:
+    """Spatial index of the tiles of a level, bucketed in cells of
+    ``cell_size`` x ``cell_size`` axial coordinates."""
+
+    def __init__(self, geometry: LevelGeometry, cell_size: int = 8):
+        if cell_size < 1:
+            raise ValueError("The cell size must be positive")
+        self.cell_size = cell_size
+        cells, tile_cells = np.unique(
+            geometry.axial // cell_size, axis=0, return_inverse=True
+        )
+        by_cell = np.argsort(tile_cells, kind="stable")
+        bounds = np.searchsorted(tile_cells[by_cell], np.arange(len(cells) + 1))
+        self._tiles_by_cell = {
+            (cell_q, cell_r): tuple(
+                geometry.tiles[index] for index in by_cell[start:end].tolist()
+            )
+            for (cell_q, cell_r), start, end in zip(
+                cells.tolist(), bounds[:-1].tolist(), bounds[1:].tolist()
+            )
+        }
+
+    def cell_of(self, tile: HexagonCoordinates) -> Cell:
+        return tile.q // self.cell_size, tile.r // self.cell_size
+
+    def tiles_in(self, cell: Cell) -> tuple[HexagonCoordinates, ...]:
+        return self._tiles_by_cell.get(cell, ())
+
+    def cells(self) -> list[Cell]:
+        return list(self._tiles_by_cell)
+
+    def cells_around(self, tile: HexagonCoordinates, radius: int) -> list[Cell]:
+        """The cells holding tiles within ``radius`` of ``tile``, and possibly
+        some farther ones: the hexagon is covered by its axial bounding box."""
+        size = self.cell_size
+        return [
+            (cell_q, cell_r)
+            for cell_q in range(
+                (tile.q - radius) // size, (tile.q + radius) // size + 1
+            )
+            for cell_r in range(
+                (tile.r - radius) // size, (tile.r + radius) // size + 1
+            )
+            if (cell_q, cell_r) in self._tiles_by_cell
+        ]
+
+
+@lru_cache(maxsize=64)
+def tile_grid(tiles: frozenset[HexagonCoordinates], cell_size: int) -> TileGrid:
+    """The grid of a level, shared by all its games."""
+    return TileGrid(level_geometry(tiles), cell_size)
@@ -1,15 +1,21 @@
 from pydantic import Field
 
 from clonable_base_model import ClonableBaseModel
-from model.troops import BaseTroop
+from model.troops import BaseTroop, Troop
 
 
 class CoreControlScore(ClonableBaseModel):
-    troop: BaseTroop | None = None
+    # the concrete union, so that the troop type survives a round trip
+    troop: Troop | None = None
     n_turn_of_control: int = Field(..., ge=0)
 
     def score_for_troop(self, troop: BaseTroop) -> "CoreControlScore":
-        if self.troop == troop:
+        # troops compare by type only, the control is kept by one player
+        if (
+            self.troop is not None
+            and self.troop.owner == troop.owner
+            and self.troop == troop
+        ):
             return self.copy_with(n_turn_of_control=self.n_turn_of_control + 1)
         else:
             return CoreControlScore(troop=troop, n_turn_of_control=1)
@@ -1,6 +1,6 @@
-from typing import Union, Literal
+from typing import Literal, Union
 
-from pydantic import BaseModel
+from pydantic import BaseModel, ConfigDict
 
 from model.board.hexagon_coordinates import HexagonCoordinates
 from model.game_model.player_actions import (
@@ -9,10 +9,11 @@ from model.game_model.player_actions import (
     SpawnTroopAction,
 )
 from model.troops import PlayableTroopType
+from player.player import Seat
 
 
 class GameEvent(BaseModel):
-    pass
+    model_config = ConfigDict(defer_build=True)
 
 
 class TroopMovedEvent(GameEvent):
@@ -56,6 +57,7 @@ class TroopSpawnedEvent(GameEvent):
 
 class PlayerRemovedEvent(GameEvent):
     update_type: Literal["player_removed_event"] = "player_removed_event"
+    seat: Seat
 
 
 class NoChangesEvent(GameEvent):
@@ -0,0 +1,13 @@
+import random
+from collections.abc import Hashable
+
+from model.game_model.game_config import game_config
+
+
+def game_rng(game_id: Hashable, root_seed: int | None = None) -> random.Random:
+    """The random stream of a game, the same for the same root seed and game id
+    whatever the other games started or running meanwhile."""
+    if root_seed is None:
+        root_seed = game_config.random_seed
+    # a str seed is hashed with sha512, stable across processes
+    return random.Random(f"game-{root_seed}-{game_id}")
@@ -4,12 +4,21 @@ from clonable_base_model import ClonableBaseModel
 from model.board.board import Board
 from model.game_model.core_control_score import CoreControlScore
 from model.game_model.player_order import PlayerOrder
-from player.player import Player
+from player.player import Player, Seat
 
 
 class GameStatus(ClonableBaseModel):
     turn_number: int = Field(default=0, ge=0)
+    # the players of the game by seat, troops and turn order refer to seats
+    players: list[Player]
     player_order: PlayerOrder
-    winner: Player | None = None
+    winner: Seat | None = None
     board: Board
     control_score: CoreControlScore
+
+    def seat_of(self, player: Player) -> Seat:
+        return self.players.index(player)
+
+    def players_in_game(self) -> list[Player]:
+        """The players still in game, in turn order."""
+        return [self.players[seat] for seat in self.player_order.seats]
@@ -1,27 +1,31 @@
-import copy
 import random
-from typing import Callable
+from collections.abc import Callable
 
 from model.board.board import Board
 from model.game_model.core_control_score import CoreControlScore
-from model.game_model.game_config import game_config
 from model.game_model.game_status.game_status import GameStatus
 from model.game_model.player_order import PlayerOrder
 from player.player import Player
 
-random.seed(game_config.random_seed)
-
 
 def generate_game_status(
-    players: set[Player], board_generator: Callable[[list[Player]], Board]
+    players: set[Player],
+    board_generator: Callable[[int], Board],
+    rng: random.Random,
 ) -> GameStatus:
-    players_copy = copy.deepcopy(list(players))
-    random.shuffle(players_copy)
+    # sorted first, the order of a set is not part of the seed
+    seated_players = sorted(players, key=lambda player: player.id)
+    rng.shuffle(seated_players)
 
-    return GameStatus(
+    # every part is built from validated models, skip pydantic validation
+    return GameStatus.model_construct(
         turn_number=1,
-        player_order=PlayerOrder(players=players_copy),
+        players=seated_players,
+        # the first turn is played in seat order
+        player_order=PlayerOrder.model_construct(
+            seats=list(range(len(seated_players)))
+        ),
         winner=None,
-        board=board_generator(players_copy),
-        control_score=CoreControlScore(troop=None, n_turn_of_control=0),
+        board=board_generator(len(seated_players)),
+        control_score=CoreControlScore.model_construct(troop=None, n_turn_of_control=0),
     )
@@ -1,73 +1,72 @@
+from collections.abc import Callable, Sequence
 from dataclasses import dataclass
 from itertools import zip_longest
-from typing import Callable
 
+from model.board.hexagon_coordinates import HexagonCoordinates
 from model.game_model.game_config import game_config
 from model.game_model.game_event import (
+    AttackLostEvent,
+    AttackWonEvent,
     GameEvent,
     NoChangesEvent,
-    TroopMovedEvent,
     PlayerRemovedEvent,
+    TroopMovedEvent,
     TroopSpawnedEvent,
-    AttackWonEvent,
-    AttackLostEvent,
-    FailedSpawnEvent,
-    FailedMarchEvent,
 )
 from model.game_model.game_status.game_status import GameStatus
 from model.game_model.player_actions import (
-    SpawnTroopAction,
-    MarchTroopAction,
     GameAction,
+    MarchTroopAction,
+    SpawnTroopAction,
 )
-from model.troops import HomeBaseTroop, BaseTroop
-from player.player import Player
+from model.troops import BaseTroop, HomeBaseTroop
+from player.player import Seat
 
 
 @dataclass(frozen=True)
 class _PlayerDoAction:
-    player: Player
+    seat: Seat
     game_action: GameAction
 
 
 def update_game_status(
     game_status: GameStatus,
-    game_actions: dict[Player, list[GameAction]],
-    is_valid_action: Callable[[Player, GameAction, GameStatus], bool],
+    game_actions: Sequence[list[GameAction]],
+    is_valid_action: Callable[[Seat, GameAction, GameStatus], bool],
+    on_action_applied: Callable[[GameStatus, set[HexagonCoordinates]], None]
+    | None = None,
 ) -> tuple[list[GameEvent], GameStatus]:
-    actions_order = _generate_action_order(
-        game_actions, game_status.player_order.players
-    )
+    """Apply the actions of a turn, indexed by seat, in player order.
+
+    ``on_action_applied`` is called after every applied action with the new
+    status and the tiles whose occupation the action changed.
+    """
+    actions_order = _generate_action_order(game_actions, game_status.player_order.seats)
 
     new_game_status = game_status
     all_events = []
 
     for action in actions_order:
-        player = action.player
+        seat = action.seat
         game_action = action.game_action
 
-        if not is_valid_action(player, game_action, new_game_status):
-            all_events.append(NoChangesEvent(player=player, game_action=game_action))
+        if not is_valid_action(seat, game_action, new_game_status):
+            all_events.append(NoChangesEvent(game_action=game_action))
             continue
 
         if isinstance(game_action, SpawnTroopAction):
-            if not is_valid_action(player, game_action, new_game_status):
-                all_events.append(
-                    FailedSpawnEvent(player=player, game_action=game_action)
-                )
-                continue
             process_fn = _process_spawn_action
         else:
-            if not is_valid_action(player, game_action, new_game_status):
-                all_events.append(
-                    FailedMarchEvent(player=player, game_action=game_action)
-                )
-                continue
             process_fn = _process_march_action
 
-        updates, new_game_status = process_fn(player, game_action, new_game_status)
+        updates, new_game_status, touched_tiles = process_fn(
+            seat, game_action, new_game_status
+        )
         all_events.append(updates)
 
+        if on_action_applied is not None:
+            on_action_applied(new_game_status, touched_tiles)
+
     final_game_status = _update_turn_and_check_winner(new_game_status)
     return all_events, final_game_status
 
@@ -75,33 +74,36 @@ def update_game_status(
 def _update_turn_and_check_winner(
     game_status: GameStatus,
 ) -> GameStatus:
-    game_status.turn_number += 1
+    turn_number = game_status.turn_number + 1
     board = game_status.board
+    seats = game_status.player_order.seats
+
+    # The last player left in the game wins.
+    if len(seats) == 1:
+        return game_status.copy_with(turn_number=turn_number, winner=seats[0])
 
     # If max turns reached, determine winner by troop count. In case of tie,
     # the player who is earlier in the turn order wins.
-    if game_status.turn_number > game_config.max_turns:
-        player_to_troop_count = {
-            player: sum([count for count in troop_to_count.values()])
-            for player, troop_to_count in game_status.board.playable_troop_by_players().items()
+    if turn_number > game_config.max_turns:
+        seat_to_troop_count = {
+            seat: sum(troop_to_count.values())
+            for seat, troop_to_count in board.playable_troop_by_seat().items()
         }
         # sort by troop count and player order
-        winner_player = max(
-            game_status.player_order,
-            key=lambda p: (
-                player_to_troop_count[p],
-                -game_status.player_order.index(p),
+        winner_seat = max(
+            seats,
+            key=lambda s: (
+                seat_to_troop_count.get(s, 0),
+                -seats.index(s),
             ),
         )
-        return game_status.copy_with(
-            winner=winner_player, player_to_troop_count=player_to_troop_count
-        )
+        return game_status.copy_with(turn_number=turn_number, winner=winner_seat)
 
     # Check core control for winning condition. If a player's troop
     # occupies the core for a number of consecutive turns, they win.
-    core_troop: BaseTroop | None = board.coordinates_to_tile[
+    core_troop: BaseTroop | None = board.coordinates_to_occupation.get(
         board.core_coordinates
-    ].occupation
+    )
 
     if core_troop is not None:
         new_control_score = game_status.control_score.score_for_troop(core_troop)
@@ -111,21 +113,25 @@ def _update_turn_and_check_winner(
             >= game_config.winning_core_control_turns
         ):
             return game_status.copy_with(
-                winner=core_troop.owner, new_control_score=new_control_score
+                turn_number=turn_number,
+                winner=core_troop.owner,
+                control_score=new_control_score,
             )
     else:
         new_control_score = game_status.control_score.clear()
 
     return game_status.copy_with(
+        turn_number=turn_number,
         player_order=game_status.player_order.turn_players_order(),
-        new_control_score=new_control_score,
+        control_score=new_control_score,
     )
 
 
 def _process_spawn_action(
-    player: Player, spawn_troops_action: SpawnTroopAction, game_status: GameStatus
-) -> tuple[GameEvent, GameStatus]:
-    spawned_troop = spawn_troops_action.troop
+    seat: Seat, spawn_troops_action: SpawnTroopAction, game_status: GameStatus
+) -> tuple[GameEvent, GameStatus, set[HexagonCoordinates]]:
+    # the spawned troop always belongs to the player spawning it
+    spawned_troop = spawn_troops_action.troop.model_copy(update={"owner": seat})
     coordinates = spawn_troops_action.coordinates
 
     new_game_status = game_status.copy_with(
@@ -133,84 +139,87 @@ def _process_spawn_action(
     )
     return (
         TroopSpawnedEvent(
-            player=player,
             troop=spawned_troop,
-            coordinate=coordinates,
+            coordinates=coordinates,
         ),
         new_game_status,
+        {coordinates},
     )
 
 
 def _process_march_action(
-    player: Player, march_troops_action: MarchTroopAction, game_status: GameStatus
-) -> tuple[GameEvent, GameStatus]:
+    seat: Seat, march_troops_action: MarchTroopAction, game_status: GameStatus
+) -> tuple[GameEvent, GameStatus, set[HexagonCoordinates]]:
     new_board = game_status.board
     new_player_order = game_status.player_order
+    starting_coordinates = march_troops_action.starting_coordinates
+    destination_coordinates = march_troops_action.destination_coordinates
+    touched_tiles = {starting_coordinates, destination_coordinates}
 
-    moving_troop: BaseTroop = game_status.board.coordinates_to_tile[
-        march_troops_action.starting_coordinates
+    moving_troop: BaseTroop = game_status.board.coordinates_to_occupation[
+        starting_coordinates
     ]
-    defending_troop: BaseTroop | None = game_status.board.coordinates_to_tile[
-        march_troops_action.destination_coordinates
+    defending_troop: BaseTroop | None = game_status.board.coordinates_to_occupation[
+        destination_coordinates
     ]
 
     # destination is empty
     if defending_troop is None:
-        new_board = new_board.move_troop(
-            march_troops_action.starting_coordinates,
-            march_troops_action.destination_coordinates,
-        )
+        new_board = new_board.move_troop(starting_coordinates, destination_coordinates)
         game_update = TroopMovedEvent(
-            player=player,
             troop=moving_troop,
-            from_coordinate=march_troops_action.starting_coordinates,
-            to_coordinate=march_troops_action.destination_coordinates,
+            from_coordinates=starting_coordinates,
+            to_coordinates=destination_coordinates,
         )
     elif isinstance(defending_troop, HomeBaseTroop):
-        removed_player = defending_troop.owner
-        new_board = new_board.remove_player_troops(defending_troop.owner)
-        new_player_order = new_player_order.remove_player(removed_player)
-        game_update = PlayerRemovedEvent(player=removed_player)
+        removed_seat = defending_troop.owner
+        touched_tiles.update(
+            coordinates
+            for coordinates, troop in new_board.coordinates_to_occupation.items()
+            if troop is not None and troop.owner == removed_seat
+        )
+        new_board = new_board.remove_player_troops(removed_seat)
+        new_player_order = new_player_order.remove_seat(removed_seat)
+        game_update = PlayerRemovedEvent(seat=removed_seat)
     # destination is stronger
     elif moving_troop > defending_troop:
-        new_board = new_board.move_troop(
-            march_troops_action.starting_coordinates,
-            march_troops_action.destination_coordinates,
-        )
+        new_board = new_board.move_troop(starting_coordinates, destination_coordinates)
         game_update = AttackWonEvent(
             moving_troop=moving_troop,
             defending_troop=defending_troop,
-            from_coordinates=march_troops_action.starting_coordinates,
-            to_coordinates=march_troops_action.destination_coordinates,
+            from_coordinates=starting_coordinates,
+            to_coordinates=destination_coordinates,
         )
     # destination is weaker
     elif moving_troop < defending_troop:
-        new_board = new_board.remove_troop(march_troops_action.starting_coordinates)
+        new_board = new_board.remove_troop(starting_coordinates)
         game_update = AttackLostEvent(
             moving_troop=moving_troop,
             defending_troop=defending_troop,
-            from_coordinates=march_troops_action.starting_coordinates,
-            to_coordinates=march_troops_action.destination_coordinates,
+            from_coordinates=starting_coordinates,
+            to_coordinates=destination_coordinates,
         )
     # destination is equal no updates
     else:
-        game_update = NoChangesEvent()
+        game_update = NoChangesEvent(game_action=march_troops_action)
 
-    return game_update, game_status.copy_with(
-        board=new_board, player_order=new_player_order
+    return (
+        game_update,
+        game_status.copy_with(board=new_board, player_order=new_player_order),
+        touched_tiles,
     )
 
 
 def _generate_action_order(
-    game_actions: dict[Player, list[GameAction]], player_order: list[Player]
+    game_actions: Sequence[list[GameAction]], player_order: list[Seat]
 ) -> list[_PlayerDoAction]:
-    actions = [game_actions.get(player, []) for player in player_order]
+    actions = [game_actions[seat] for seat in player_order]
 
     result: list[_PlayerDoAction] = []
 
     for group in zip_longest(*actions, fillvalue=None):
-        for player, action in zip(player_order, group):
+        for seat, action in zip(player_order, group):
             if action is not None:
-                result.append(_PlayerDoAction(player, action))
+                result.append(_PlayerDoAction(seat, action))
 
     return result
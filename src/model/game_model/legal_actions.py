@@ -0,0 +1,115 @@
+"""Legal actions generator. Lists every action the validator accepts for a player
+on a game status, walking precomputed neighbour tables instead of trying actions."""
+
+from functools import lru_cache
+
+from model.board.hexagon_coordinates import HexagonCoordinates
+from model.game_model.game_status.game_status import GameStatus
+from model.game_model.player_actions import (
+    GameAction,
+    MarchTroopAction,
+    SpawnTroopAction,
+)
+from model.troops import (
+    HomeBaseTroop,
+    PentagonTroop,
+    SquareTroop,
+    TriangleTroop,
+    Troop,
+)
+from player.player import Seat
+
+_PLAYABLE_TROOP_TYPES = (TriangleTroop, SquareTroop, PentagonTroop)
+
+NeighbourTable = dict[HexagonCoordinates, tuple[HexagonCoordinates, ...]]
+# actions are never mutated, so the same instances are handed out on every call
+_MarchTable = dict[HexagonCoordinates, tuple[MarchTroopAction, ...]]
+_SpawnTable = tuple[tuple[HexagonCoordinates, tuple[SpawnTroopAction, ...]], ...]
+
+
+@lru_cache(maxsize=64)
+def neighbour_table(tiles: frozenset[HexagonCoordinates]) -> NeighbourTable:
+    """Neighbours of every tile that are tiles themselves, computed once per level."""
+    # numpy is loaded with the first game, not when the server starts
+    from model.board.hex_geometry import level_geometry
+
+    return level_geometry(tiles).neighbour_table()
+
+
+@lru_cache(maxsize=64)
+def _march_table(tiles: frozenset[HexagonCoordinates]) -> _MarchTable:
+    return {
+        tile: tuple(
+            # validated models, skip pydantic validation
+            MarchTroopAction.model_construct(
+                starting_coordinates=tile, destination_coordinates=neighbour
+            )
+            for neighbour in neighbours
+        )
+        for tile, neighbours in neighbour_table(tiles).items()
+    }
+
+
+# seats are the same in every game of a level, the spawns are shared by all of them
+@lru_cache(maxsize=1024)
+def _spawn_table(
+    tiles: frozenset[HexagonCoordinates], home_base: HexagonCoordinates, seat: Seat
+) -> _SpawnTable:
+    return tuple(
+        (
+            neighbour,
+            tuple(
+                SpawnTroopAction.model_construct(
+                    coordinates=neighbour,
+                    troop=troop_type.model_construct(owner=seat),
+                )
+                for troop_type in _PLAYABLE_TROOP_TYPES
+            ),
+        )
+        for neighbour in neighbour_table(tiles)[home_base]
+    )
+
+
+def legal_actions(seat: Seat, game_status: GameStatus) -> list[GameAction]:
+    return legal_actions_by_seat(game_status, {seat}).get(seat, [])
+
+
+def legal_actions_by_seat(
+    game_status: GameStatus, seats: set[Seat] | None = None
+) -> dict[Seat, list[GameAction]]:
+    """Legal actions of the given seats, all the players in game by default."""
+    occupation = game_status.board.coordinates_to_occupation
+    tiles = frozenset(occupation)
+    marches = _march_table(tiles)
+    if seats is None:
+        seats = game_status.player_order.seats
+
+    actions: dict[Seat, list[GameAction]] = {seat: [] for seat in seats}
+    for coordinates, troop in occupation.items():
+        if troop is None or troop.owner not in actions:
+            continue
+
+        player_actions = actions[troop.owner]
+        if isinstance(troop, HomeBaseTroop):
+            for neighbour, spawns in _spawn_table(tiles, coordinates, troop.owner):
+                if occupation[neighbour] is None:
+                    player_actions.extend(spawns)
+        else:
+            player_actions.extend(
+                march
+                for march in marches[coordinates]
+                if not _is_tile_of_player(
+                    occupation, march.destination_coordinates, troop.owner
+                )
+            )
+
+    return actions
+
+
+def _is_tile_of_player(
+    occupation: dict[HexagonCoordinates, Troop | None],
+    coordinates: HexagonCoordinates,
+    seat: Seat,
+) -> bool:
+    troop = occupation[coordinates]
+    return troop is not None and troop.owner == seat
@@ -2,33 +2,33 @@ from model.board.board import Board
 from model.board.hexagon_coordinates import HexagonCoordinates
 from model.game_model.game_status.game_status import GameStatus
 from model.game_model.player_actions import (
+    GameAction,
     MarchTroopAction,
     SpawnTroopAction,
-    GameAction,
 )
 from model.troops import (
-    HomeBaseTroop,
     BaseTroop,
+    HomeBaseTroop,
+    PentagonTroop,
     SquareTroop,
     TriangleTroop,
-    PentagonTroop,
 )
-from player.player import Player
+from player.player import Seat
 
 
 def _troop_is_present(board: Board, coordinates: HexagonCoordinates) -> bool:
-    return board.coordinates_to_tile[coordinates].occupation is not None
+    return board.coordinates_to_occupation[coordinates] is not None
 
 
 def _coordinates_out_of_board(board: Board, coordinates: HexagonCoordinates) -> bool:
-    return coordinates not in board.coordinates_to_tile
+    return coordinates not in board.coordinates_to_occupation
 
 
 def _is_tile_of_player(
-    board: Board, coordinates: HexagonCoordinates, player: Player
+    board: Board, coordinates: HexagonCoordinates, seat: Seat
 ) -> bool:
-    occupation = board.coordinates_to_tile[coordinates].occupation
-    return occupation is not None and occupation.owner == player
+    occupation = board.coordinates_to_occupation[coordinates]
+    return occupation is not None and occupation.owner == seat
 
 
 def _is_valid_troop(troop: BaseTroop) -> bool:
@@ -36,19 +36,19 @@ def _is_valid_troop(troop: BaseTroop) -> bool:
 
 
 def _is_occupied(board: Board, coordinates: HexagonCoordinates) -> bool:
-    return board.coordinates_to_tile[coordinates].occupation is not None
+    return board.coordinates_to_occupation[coordinates] is not None
 
 
 def _is_near_player_home_base(
-    board: Board, coordinates: HexagonCoordinates, player: Player
+    board: Board, coordinates: HexagonCoordinates, seat: Seat
 ) -> bool:
     home_base_coordinates = next(
         (
             coordinates
-            for coordinates, tile in board.coordinates_to_tile.items()
-            if tile.occupation is not None
-            and isinstance(tile.occupation, HomeBaseTroop)
-            and tile.occupation.owner == player
+            for coordinates, occupation in board.coordinates_to_occupation.items()
+            if occupation is not None
+            and isinstance(occupation, HomeBaseTroop)
+            and occupation.owner == seat
         ),
         None,
     )
@@ -59,9 +59,7 @@ def _is_near_player_home_base(
     )
 
 
-def is_valid_action(
-    player: Player, action: GameAction, game_status: GameStatus
-) -> bool:
+def is_valid_action(seat: Seat, action: GameAction, game_status: GameStatus) -> bool:
     board = game_status.board
     match action:
         case MarchTroopAction(
@@ -72,8 +70,16 @@ def is_valid_action(
                 lambda: _coordinates_out_of_board(board, starting_coordinates),
                 lambda: _coordinates_out_of_board(board, destination_coordinates),
                 lambda: not _troop_is_present(board, starting_coordinates),
-                lambda: not _is_tile_of_player(board, starting_coordinates, player),
-                # lambda: _is_tile_of_player(board, destination_coordinates, player),
+                lambda: not _is_tile_of_player(board, starting_coordinates, seat),
+                lambda: (
+                    not _is_valid_troop(
+                        board.coordinates_to_occupation[starting_coordinates]
+                    )
+                ),
+                # a player never attacks nor stacks on its own troops
+                lambda: _is_tile_of_player(board, destination_coordinates, seat),
+                # troops march one tile per action
+                lambda: not starting_coordinates.is_nearby(destination_coordinates),
             ]
             return not any(condition() for condition in conditions)
 
@@ -81,7 +87,7 @@ def is_valid_action(
             conditions = [
                 lambda: _coordinates_out_of_board(board, coordinates),
                 lambda: _is_occupied(board, coordinates),
-                lambda: not _is_near_player_home_base(board, coordinates, player),
+                lambda: not _is_near_player_home_base(board, coordinates, seat),
                 lambda: not _is_valid_troop(troop),
             ]
             return not any(condition() for condition in conditions)
@@ -1,6 +1,6 @@
-from typing import Union, Literal
+from typing import Literal, Union
 
-from pydantic import BaseModel
+from pydantic import BaseModel, ConfigDict
 
 from model.board.hexagon_coordinates import HexagonCoordinates
 from model.game_model.game_config import game_config
@@ -8,6 +8,7 @@ from model.troops import PlayableTroopType
 
 
 class GameAction(BaseModel):
+    model_config = ConfigDict(defer_build=True)
     action_points_cost: int
 
     class ConfigDict:
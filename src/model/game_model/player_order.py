@@ -1,17 +1,15 @@
 from clonable_base_model import ClonableBaseModel
-from player.player import Player
+from player.player import Seat
 
 
 class PlayerOrder(ClonableBaseModel):
-    players: list[Player]
+    seats: list[Seat]
 
-    def remove_player(self, player: Player) -> "PlayerOrder":
+    def remove_seat(self, seat: Seat) -> "PlayerOrder":
         return PlayerOrder(
-            players=[
-                not_removed for not_removed in self.players if not_removed != player
-            ]
+            seats=[not_removed for not_removed in self.seats if not_removed != seat]
         )
 
     def turn_players_order(self) -> "PlayerOrder":
-        new_order = self.players[1:] + self.players[:1]
-        return PlayerOrder(players=new_order)
+        new_order = self.seats[1:] + self.seats[:1]
+        return PlayerOrder(seats=new_order)
@@ -1,13 +1,14 @@
 from abc import ABC, abstractmethod
 from typing import Literal, Union
 
-from pydantic import BaseModel
+from pydantic import BaseModel, ConfigDict
 
-from player.player import Player
+from player.player import Seat
 
 
 class BaseTroop(BaseModel, ABC):
-    owner: Player
+    model_config = ConfigDict(defer_build=True)
+    owner: Seat
 
     @abstractmethod
     def __gt__(self, other: "BaseTroop") -> bool:
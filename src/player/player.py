@@ -1,11 +1,15 @@
+import random
 import uuid
 
-from pydantic import BaseModel, field_serializer
+from pydantic import BaseModel, ConfigDict, field_serializer
 
 PlayerID = uuid.UUID
+# index of a player in the players of its game, what the engine refers to
+Seat = int
 
 
 class Player(BaseModel):
+    model_config = ConfigDict(defer_build=True)
     id: PlayerID
     username: str
 
@@ -20,8 +24,11 @@ class Player(BaseModel):
         return str(player_id)
 
     @staticmethod
-    def random_id() -> PlayerID:
-        return uuid.uuid4()
+    def random_id(rng: random.Random | None = None) -> PlayerID:
+        if rng is None:
+            return uuid.uuid4()
+        # drawn from a seeded stream, for reproducible simulations
+        return uuid.UUID(int=rng.getrandbits(128), version=4)
 
     class ConfigDict:
         frozen = True
@@ -1,28 +1,67 @@
 import logging
 import uuid
-from typing import Callable, override
+from collections.abc import Callable
+from functools import partial
+from typing import Any, override
+
+from pydantic import ConfigDict, TypeAdapter, ValidationError
 
 from controller.game_controller import GameController
 from controller.game_update import GameUpdate, PersonalUpdate
-from controller.player_request import PlayerRequest
+from controller.player_request import (
+    CancelActionRequest,
+    ClearActions,
+    PerformActionRequest,
+    PlayerRequest,
+    UndoLastActionRequest,
+)
+from metrics.metrics import metrics_registry
+from metrics.tracing import Trace
 from player.player import Player, PlayerID
 from session.pub_sub import pub_sub
+from session.remote_update import RemoteGameUpdate
 from session.session import Session
 
 logger = logging.getLogger(__name__)
 
+# built by the first request, not at startup
+_player_request_adapter = TypeAdapter(
+    PlayerRequest, config=ConfigDict(defer_build=True)
+)
+
+_active_games = metrics_registry.gauge("games_active", "Games being played.")
+_players_in_game = metrics_registry.gauge(
+    "players_in_game", "Players taking part in a game being played."
+)
+
 
 class GameSession(Session):
+    # every broadcast, once per game, as a RemoteGameUpdate
+    SPECTATE_TOPIC = "spectate"
+    # the id of every game whose session ended, over or stopped
+    GAME_ENDED_TOPIC = "game_ended"
+
     def __init__(
         self,
         players: set[Player],
         game_controller_factory: Callable[[set[Player], Session], GameController],
+        buffers_factory: Callable[["GameSession"], dict[str, object]] | None = None,
     ):
         self._game_controller = None
         self._players_id = {player.id for player in players}
         self._game_id = uuid.uuid4()
         self._players = players
+        self._request_callbacks: dict[PlayerID, Callable[[Any], None]] = {}
         self._game_controller_factory = game_controller_factory
+        self._buffers_factory = buffers_factory
+
+    @property
+    def game_id(self) -> uuid.UUID:
+        return self._game_id
+
+    @property
+    def players_id(self) -> set[PlayerID]:
+        return self._players_id
 
     @staticmethod
     def request_topic(player_id: PlayerID):
@@ -34,27 +73,83 @@ class GameSession(Session):
 
     @override
     def start(self):
-        for player_id in self._players_id:
-            pub_sub.subscribe(self.request_topic(player_id), self._on_player_request)
+        for player in self._players:
+            callback = partial(self._on_player_request, player)
+            self._request_callbacks[player.id] = callback
+            pub_sub.subscribe(self.request_topic(player.id), callback)
 
         self._game_controller = self._game_controller_factory(self._players, self)
+        _active_games.inc()
+        _players_in_game.inc(len(self._players))
         self._game_controller.start()
 
-    def _on_player_request(self, player_request: PlayerRequest):
-        if self._game_controller is not None:
-            self._game_controller.process_player_request(player_request)
+    def _on_player_request(
+        self, player: Player, request: dict[str, Any], trace: Trace | None = None
+    ):
+        if self._game_controller is None:
+            if trace is not None:
+                trace.finish("no_game")
+            return
+        if trace is not None:
+            trace.mark("dispatch")
+
+        # the requesting player is the owner of the topic, not the one in the payload
+        try:
+            player_request = _player_request_adapter.validate_python(
+                {**request, "player": player}
+            )
+        except ValidationError as e:
+            logger.warning("Invalid request from %s: %s", player.id, e)
+            if trace is not None:
+                trace.finish("invalid_request")
+            return
+        if trace is not None:
+            trace.mark("parse")
+
+        match player_request:
+            case PerformActionRequest(game_action=game_action):
+                self._game_controller.process_player_request(player, game_action, trace)
+            case CancelActionRequest(action_id=action_id):
+                self._game_controller.cancel_player_action(player, action_id, trace)
+            case UndoLastActionRequest():
+                self._game_controller.undo_last_player_action(player, trace)
+            case ClearActions():
+                self._game_controller.clear_player_actions(player, trace)
 
     @override
     def game_is_over(self):
-        for player_id in self._players_id:
-            pub_sub.unsubscribe(self.request_topic(player_id), self._on_player_request)
+        for player_id, callback in self._request_callbacks.items():
+            pub_sub.unsubscribe(self.request_topic(player_id), callback)
+        _active_games.dec()
+        _players_in_game.dec(len(self._players))
+        pub_sub.publish(self.GAME_ENDED_TOPIC, self._game_id)
+
+    @override
+    def buffers(self) -> dict[str, object]:
+        # the frames encoded for the players and the spectators of the game
+        if self._buffers_factory is None:
+            return {}
+        return self._buffers_factory(self)
 
     @override
-    def send_private_update(self, player_id: PlayerID, update: PersonalUpdate):
-        pub_sub.publish(self.update_topic(player_id), update)
+    def send_private_update(
+        self, player_id: PlayerID, update: PersonalUpdate, trace: Trace | None = None
+    ):
+        pub_sub.publish(self.update_topic(player_id), update, trace=trace)
 
     @override
-    def send_broadcast_update(self, update: GameUpdate):
+    def send_broadcast_update(
+        self,
+        update: GameUpdate,
+        player_views: dict[PlayerID, GameUpdate] | None = None,
+    ):
         for player_id in self._players_id:
-            pub_sub.publish(self.update_topic(player_id), update)
-            logger.info("send update")
+            player_update = (
+                update if player_views is None else player_views.get(player_id)
+            )
+            if player_update is not None:
+                pub_sub.publish(self.update_topic(player_id), player_update)
+        logger.debug(
+            "Broadcast %s to %d players", update.update_type, len(self._players_id)
+        )
+        pub_sub.publish(self.SPECTATE_TOPIC, RemoteGameUpdate(self._game_id, update))
@@ -1,15 +1,15 @@
 import logging
+from collections import defaultdict
+from collections.abc import Callable
 from threading import Lock
-from typing import Set, Callable, Any, DefaultDict
-
-from black.trans import defaultdict
+from typing import Any
 
 logger = logging.getLogger(__name__)
 
 
 class PubSubManager:
     def __init__(self):
-        self._topics: DefaultDict[str, Set[Callable[..., None]]] = defaultdict(set)
+        self._topics: defaultdict[str, set[Callable[..., None]]] = defaultdict(set)
         self._lock = Lock()  # ✅ FIXED: threading.Lock, not multiprocessing.Lock
 
     def subscribe(self, topic: str, callback: Callable[..., None]):
@@ -21,7 +21,8 @@ class PubSubManager:
             if topic in self._topics:
                 self._topics[topic].discard(callback)
 
-    def publish(self, topic: str, *messages: Any, **kwargs: Any):
+    def publish(self, topic: str, *messages: Any, **kwargs: Any) -> int:
+        """Call the subscribers of ``topic``, returns how many there were."""
         with self._lock:
             callbacks = list(self._topics.get(topic, []))
 
@@ -29,8 +30,9 @@ class PubSubManager:
         for callback in callbacks:
             try:
                 callback(*messages, **kwargs)
-            except Exception as e:
-                logger.error(f"Error in callback for topic {topic}: {e}", exc_info=True)
+            except Exception:
+                logger.exception("Error in callback for topic %s", topic)
+        return len(callbacks)
 
 
 pub_sub = PubSubManager()
@@ -1,30 +1,69 @@
 import asyncio
 import logging
 import os
-from concurrent.futures import ThreadPoolExecutor
+import time
+from collections.abc import Callable, Iterable
+from contextlib import suppress
 from functools import partial
-from threading import Thread, Event
+from threading import Event, Thread
 
 from fastapi import WebSocket
 from pydantic import ValidationError
 from starlette.websockets import WebSocketDisconnect
 
-from controller.game_update import Update
+from controller.game_update import GameStatusUpdate, ResumeTokenUpdate, Update
 from lobby.lobbies_controller import LobbiesController
-from player.player import PlayerID, Player
+from metrics.metrics import FAST_BUCKETS, metrics_registry
+from metrics.runtime_monitor import MonitoredThreadPoolExecutor, runtime_monitor
+from metrics.tracing import Trace, tracer
+from player.player import Player, PlayerID
 from session.game_session import GameSession
 from session.pub_sub import pub_sub
+from session.remote_update import encode_update
+from session.update_stream import UpdateStream
+from session.update_stream_config import UpdateStreamConfig, update_stream_config
 
 logger = logging.getLogger(__name__)
 
+_connected_players = metrics_registry.gauge(
+    "players_connected", "Players with an open websocket."
+)
+_serialization_seconds = metrics_registry.histogram(
+    "update_serialization_seconds",
+    "Time spent encoding an update for one player, by update type.",
+    ("update_type",),
+    buckets=FAST_BUCKETS,
+)
+_update_bytes = metrics_registry.histogram(
+    "update_bytes",
+    "Size of the encoded updates sent to players, by update type.",
+    ("update_type",),
+    buckets=(64, 256, 1024, 4096, 16384, 65536, 262144, 1048576),
+)
+_resumes = metrics_registry.counter(
+    "update_stream_resumes_total",
+    "Reconnections with a resume token: replayed the missed frames, resynced "
+    "from the latest game status, or expired.",
+    ("outcome",),
+)
+
+# websocket close code for an unknown or expired resume token
+_UNKNOWN_STREAM = 4404
 
-class RemotePlayerInterface:
 
-    def __init__(self):
-        self._players_to_websocket: dict[PlayerID, WebSocket] = dict()  # PlayerID
+class RemotePlayerInterface:
+    def __init__(self, config: UpdateStreamConfig = update_stream_config):
+        self._config = config
+        self._players_to_websocket: dict[PlayerID, WebSocket] = {}  # PlayerID
+        # by resume token, kept for a grace period after a disconnection
+        self._streams: dict[str, UpdateStream] = {}
+        self._player_streams: dict[PlayerID, UpdateStream] = {}
+        self._subscriptions: dict[str, Callable[..., None]] = {}
         self._loop: asyncio.AbstractEventLoop | None = None
         self._thread: Thread | None = None
-        self._support_executor = ThreadPoolExecutor(max_workers=os.cpu_count() or 4)
+        self._support_executor = MonitoredThreadPoolExecutor(
+            "player_interface_support", max_workers=os.cpu_count() or 4
+        )
         self._loop_ready = Event()
 
     def start(self):
@@ -37,10 +76,19 @@ class RemotePlayerInterface:
                 raise RuntimeError("Event loop failed to start within 5 seconds")
             logger.info("RemotePlayerInterface event loop started")
 
+    def update_rings(self, player_ids: Iterable[PlayerID]) -> list[object]:
+        """The frames kept for the players, with the keyframes overwritten in
+        their ring."""
+        streams = (self._player_streams.get(player_id) for player_id in player_ids)
+        return [
+            (stream.ring, stream.keyframe) for stream in streams if stream is not None
+        ]
+
     def _run_loop(self):
         """Run the asyncio event loop in a separate thread"""
         self._loop = asyncio.new_event_loop()
         asyncio.set_event_loop(self._loop)
+        runtime_monitor.watch_event_loop("player_interface", self._loop)
         self._loop_ready.set()
         logger.info("Event loop running in separate thread")
         self._loop.run_forever()
@@ -63,10 +111,24 @@ class RemotePlayerInterface:
         # This will block until the WebSocket disconnects
         try:
             await asyncio.wrap_future(future)
-        except Exception as e:
-            logger.error(
-                f"Error in connection for player {player_id}: {e}", exc_info=True
-            )
+        except Exception:
+            logger.exception("Error in connection for player %s", player_id)
+            raise
+
+    async def resume_connection(
+        self, resume_token: str, last_seq: int, websocket: WebSocket
+    ):
+        """Handle a reconnection resuming the update stream of a player."""
+        if self._loop is None:
+            raise RuntimeError("Event loop not started. Call start() first.")
+
+        future = asyncio.run_coroutine_threadsafe(
+            self._handle_resume(resume_token, last_seq, websocket), self._loop
+        )
+        try:
+            await asyncio.wrap_future(future)
+        except Exception:
+            logger.exception("Error in resumed connection")
             raise
 
     async def _handle_connection(
@@ -74,20 +136,31 @@ class RemotePlayerInterface:
     ):
         """
         Internal method that runs in the separate event loop.
-        Handles the entire lifecycle of a WebSocket connection.
+        Opens the update stream of the player and serves the WebSocket.
         """
         await websocket.accept()
-        self._players_to_websocket[player_id] = websocket
-        logger.info(f"Player {player_id} connected")
+        stream = UpdateStream(player_id, self._config.update_stream_ring_size)
+        stream.append(
+            _encode_update(
+                ResumeTokenUpdate(
+                    player_id=str(player_id), resume_token=stream.resume_token
+                )
+            ),
+            is_keyframe=False,
+        )
+        self._streams[stream.resume_token] = stream
+        self._player_streams[player_id] = stream
+        logger.info("Player %s connected", player_id)
 
         # Create subscription callback
-        player_subscription = partial(self._sync_send_update, websocket)
+        player_subscription = partial(self._sync_send_update, stream)
+        self._subscriptions[stream.resume_token] = player_subscription
 
         # Subscribe for player's updates (pub_sub is sync, so use executor)
         await self._loop.run_in_executor(
             self._support_executor,
             pub_sub.subscribe,
-            GameSession.update_topic(player_id),  # GameSession.update_topic(player_id)
+            GameSession.update_topic(player_id),
             player_subscription,
         )
 
@@ -99,22 +172,59 @@ class RemotePlayerInterface:
             Player(id=player_id, username=username),
         )
 
+        await self._serve(stream, websocket)
+
+    async def _handle_resume(
+        self, resume_token: str, last_seq: int, websocket: WebSocket
+    ):
+        await websocket.accept()
+        stream = self._streams.get(resume_token)
+        if stream is None:
+            _resumes.labels("expired").inc()
+            await websocket.close(code=_UNKNOWN_STREAM)
+            return
+
+        _resumes.labels("replayed" if stream.can_replay(last_seq) else "resynced").inc()
+
+        logger.info("Player %s resumed from seq %d", stream.player_id, last_seq)
+        previous_websocket = stream.websocket
+        if previous_websocket is not None and stream.detach(previous_websocket):
+            # the old connection is half open, the client already left it
+            with suppress(Exception):
+                await previous_websocket.close()
+        await self._serve(stream, websocket, last_seq)
+
+    async def _serve(
+        self, stream: UpdateStream, websocket: WebSocket, last_seq: int | None = None
+    ):
+        """Send the update stream to the WebSocket and publish its requests."""
+        player_id = stream.player_id
+        self._players_to_websocket[player_id] = websocket
+        _connected_players.inc()
         try:
+            await stream.attach(websocket, last_seq)
             while True:
                 try:
                     data = await websocket.receive_json()
+                    trace = tracer.start_trace("player_request")
                     # Assuming PlayerRequest validation
                     # validated_data = PlayerRequest.model_validate(data)
 
                     # Publish player request (pub_sub is sync, so use executor)
-                    await self._loop.run_in_executor(
+                    subscribers = await self._loop.run_in_executor(
                         self._support_executor,
-                        pub_sub.publish,
-                        GameSession.request_topic(player_id),
-                        data,  # validated_data
+                        partial(
+                            pub_sub.publish,
+                            GameSession.request_topic(player_id),
+                            data,  # validated_data
+                            trace=trace,
+                        ),
                     )
+                    # not in a game, no one will answer
+                    if not subscribers:
+                        trace.finish("no_game")
                 except ValidationError as e:
-                    logger.warning(f"Invalid request from {player_id}: {e}")
+                    logger.warning("Invalid request from %s: %s", player_id, e)
                     await websocket.send_json(
                         {
                             "type": "error",
@@ -122,48 +232,84 @@ class RemotePlayerInterface:
                         }
                     )
         except WebSocketDisconnect:
-            logger.info(f"Player {player_id} disconnected")
-        except Exception as e:
-            logger.error(f"Unexpected error for player {player_id}: {e}", exc_info=True)
+            logger.info("Player %s disconnected", player_id)
+        except Exception:
+            logger.exception("Unexpected error for player %s", player_id)
         finally:
-            # Cleanup
-            logger.info(f"Cleaning up player {player_id}")
-
-            # Publish disconnect event
-            await self._loop.run_in_executor(
-                self._support_executor,
-                pub_sub.publish,
-                LobbiesController.REMOVE_PLAYER_TOPIC,
-                player_id,
-            )
-
-            # Unsubscribe
-            await self._loop.run_in_executor(
-                self._support_executor,
-                pub_sub.unsubscribe,
-                GameSession.update_topic(player_id),
-                player_subscription,
-            )
-
-            # Remove from tracking
-            self._players_to_websocket.pop(player_id, None)
-
-    def _sync_send_update(self, websocket: WebSocket, update: Update):
+            _connected_players.dec()
+            # the stream waits for the player to resume it before the cleanup
+            if stream.detach(websocket):
+                self._players_to_websocket.pop(player_id, None)
+                stream.expiry = self._loop.call_later(
+                    self._config.resume_grace_period, self._expire_later, stream
+                )
+
+    def _expire_later(self, stream: UpdateStream):
+        self._loop.create_task(self._expire(stream))
+
+    async def _expire(self, stream: UpdateStream):
+        player_id = stream.player_id
+        logger.info("Cleaning up player %s", player_id)
+        self._streams.pop(stream.resume_token, None)
+        if self._player_streams.get(player_id) is stream:
+            del self._player_streams[player_id]
+        player_subscription = self._subscriptions.pop(stream.resume_token)
+
+        # Publish disconnect event
+        await self._loop.run_in_executor(
+            self._support_executor,
+            pub_sub.publish,
+            LobbiesController.REMOVE_PLAYER_TOPIC,
+            player_id,
+        )
+
+        # Unsubscribe
+        await self._loop.run_in_executor(
+            self._support_executor,
+            pub_sub.unsubscribe,
+            GameSession.update_topic(player_id),
+            player_subscription,
+        )
+
+    def _sync_send_update(
+        self, stream: UpdateStream, update: Update, trace: Trace | None = None
+    ):
         """
         Called from pub_sub (sync context) when game sends updates.
-        Schedules the actual send on the event loop.
+        The update is encoded in the stream here, the send is scheduled on
+        the event loop.
         """
         if self._loop is None:
             logger.error("Cannot send update: event loop not running")
+            if trace is not None:
+                trace.finish("not_sent")
             return
 
+        frame = stream.append(
+            _encode_update(update), isinstance(update, GameStatusUpdate)
+        )
+        if trace is not None:
+            trace.mark("serialize")
+
         async def _async_send_update():
             try:
-                await websocket.send_json(update.model_dump())
+                if trace is None:
+                    await stream.flush()
+                    return
+
+                trace.mark("send_queue")
+                await stream.flush()
+                if stream.is_sent(frame.seq):
+                    trace.mark("send")
+                    trace.finish(update.update_type)
             except WebSocketDisconnect:
                 logger.debug("WebSocket already disconnected during send")
-            except Exception as e:
-                logger.error(f"Error sending update: {e}", exc_info=True)
+            except Exception:
+                logger.exception("Error sending update")
+            finally:
+                # not sent, disconnected or failed; a no-op once finished
+                if trace is not None:
+                    trace.finish("not_sent")
 
         # Schedule on the event loop
         future = asyncio.run_coroutine_threadsafe(_async_send_update(), self._loop)
@@ -172,8 +318,8 @@ class RemotePlayerInterface:
         def _handle_result(fut):
             try:
                 fut.result()
-            except Exception as e:
-                logger.error(f"Failed to send update: {e}", exc_info=True)
+            except Exception:
+                logger.exception("Failed to send update")
 
         future.add_done_callback(_handle_result)
 
@@ -184,3 +330,14 @@ class RemotePlayerInterface:
         if self._thread:
             self._thread.join(timeout=5.0)
         self._support_executor.shutdown(wait=True)
+
+
+def _encode_update(update: Update) -> str:
+    start = time.perf_counter()
+    message = encode_update(update)
+    _serialization_seconds.labels(update.update_type).observe(
+        time.perf_counter() - start
+    )
+    # characters, not bytes: only usernames may be non-ascii
+    _update_bytes.labels(update.update_type).observe(len(message))
+    return message
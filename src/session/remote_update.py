@@ -1,10 +1,16 @@
+import json
 from dataclasses import dataclass
 from uuid import UUID
 
-from controller.game_update import GameUpdate
+from controller.game_update import GameUpdate, Update
 
 
 @dataclass(frozen=True)
 class RemoteGameUpdate:
     game_id: UUID
     update: GameUpdate
+
+
+def encode_update(update: Update) -> str:
+    # the same encoding as WebSocket.send_json
+    return json.dumps(update.model_dump(), separators=(",", ":"), ensure_ascii=False)
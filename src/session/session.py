@@ -1,6 +1,7 @@
-from abc import abstractmethod, ABC
+from abc import ABC, abstractmethod
 
-from controller.game_update import PersonalUpdate, GameUpdate
+from controller.game_update import GameUpdate, PersonalUpdate
+from metrics.tracing import Trace
 from player.player import PlayerID
 
 
@@ -10,13 +11,25 @@ class Session(ABC):
         pass
 
     @abstractmethod
-    def send_private_update(self, player_id: PlayerID, update: PersonalUpdate):
+    def send_private_update(
+        self, player_id: PlayerID, update: PersonalUpdate, trace: Trace | None = None
+    ):
         pass
 
     @abstractmethod
-    def send_broadcast_update(self, update: GameUpdate):
-        pass
+    def send_broadcast_update(
+        self,
+        update: GameUpdate,
+        player_views: dict[PlayerID, GameUpdate] | None = None,
+    ):
+        """Send ``update`` to every player, or with ``player_views`` the view
+        of each player listed in it; spectators always see ``update``."""
 
     @abstractmethod
     def game_is_over(self) -> None:
         pass
+
+    def buffers(self) -> dict[str, object]:
+        """The buffers kept for the game outside of its controller, by name,
+        accounted with the memory of the game."""
+        return {}
@@ -0,0 +1,13 @@
+from pydantic import Field
+from pydantic_settings import BaseSettings
+
+
+class SpectatorConfig(BaseSettings):
+    # encoded frames kept per game, must cover the longest delay
+    spectator_ring_size: int = Field(default=2048, gt=0)
+    spectator_max_delay: float = Field(default=300, ge=0)
+    # seconds a spectator may lag behind before skipping to the latest keyframe
+    spectator_max_lag: float = Field(default=2.0, gt=0)
+
+
+spectator_config = SpectatorConfig()
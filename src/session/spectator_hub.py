@@ -0,0 +1,257 @@
+"""Live games streamed read-only to spectators.
+
+GameSession publishes every broadcast of a game once on its SPECTATE_TOPIC.
+The hub appends it to the ring of frames of the game, from which every
+spectator socket reads at its own cursor, optionally delayed. A frame is
+encoded once, by its first reader: games nobody watches are never encoded.
+Game statuses are keyframes: a spectator that falls behind, or whose next
+frame was overwritten, skips to the latest keyframe instead of queueing frames.
+"""
+
+import asyncio
+import logging
+import time
+from dataclasses import dataclass
+from functools import cached_property
+from uuid import UUID
+
+from fastapi import WebSocket
+from starlette.websockets import WebSocketDisconnect
+
+from controller.game_update import GameOverUpdate, GameStatusUpdate, Update
+from metrics.metrics import metrics_registry
+from session.game_session import GameSession
+from session.pub_sub import pub_sub
+from session.remote_update import RemoteGameUpdate, encode_update
+from session.spectator_config import SpectatorConfig, spectator_config
+
+logger = logging.getLogger(__name__)
+
+_spectators = metrics_registry.gauge(
+    "spectators_connected", "Spectators with an open websocket."
+)
+_skipped_frames = metrics_registry.counter(
+    "spectator_skipped_frames_total",
+    "Frames not sent to slow spectators, skipped to the latest keyframe.",
+)
+
+# websocket close code for an unknown or finished game
+_UNKNOWN_GAME = 4404
+
+
+@dataclass(frozen=True)
+class Frame:
+    seq: int
+    published_at: float
+    # the encoded update, or the update itself until a reader encodes it
+    payload: str | Update
+    # seq of the latest keyframe up to this frame, -1 before the first one
+    keyframe_seq: int
+
+    @property
+    def is_keyframe(self) -> bool:
+        return self.seq == self.keyframe_seq
+
+    @cached_property
+    def text(self) -> str:
+        # read on the event loop of the spectators only, encoded once
+        if isinstance(self.payload, str):
+            return self.payload
+        return encode_update(self.payload)
+
+
+class FrameRing:
+    """Frames of one game, appended by its controller thread and read by the
+    spectators without locks: a slot holds the frame with its seq, readers
+    check it to notice an overwritten slot."""
+
+    def __init__(self, capacity: int):
+        self._slots: list[Frame | None] = [None] * capacity
+        self._keyframe_seq = -1
+        # seq of the next frame
+        self.head = 0
+
+    @property
+    def oldest(self) -> int:
+        return max(0, self.head - len(self._slots))
+
+    def append(
+        self, payload: str | Update, is_keyframe: bool, published_at: float
+    ) -> Frame:
+        if is_keyframe:
+            self._keyframe_seq = self.head
+        frame = Frame(self.head, published_at, payload, self._keyframe_seq)
+        self._slots[frame.seq % len(self._slots)] = frame
+        self.head += 1
+        return frame
+
+    def get(self, seq: int) -> Frame | None:
+        frame = self._slots[seq % len(self._slots)]
+        return frame if frame is not None and frame.seq == seq else None
+
+    def latest_keyframe(self, published_before: float) -> Frame | None:
+        """The latest keyframe still in the ring published before the time."""
+        seq = self.head - 1
+        while seq >= 0:
+            frame = self.get(seq)
+            keyframe = self.get(frame.keyframe_seq) if frame is not None else None
+            if keyframe is None:
+                return None
+            if keyframe.published_at <= published_before:
+                return keyframe
+            seq = keyframe.seq - 1
+        return None
+
+
+class _GameStream:
+    def __init__(self, capacity: int):
+        self.ring = FrameRing(capacity)
+        self.is_over = False
+        self.spectators = 0
+        # replaced at every frame, only touched on the spectators event loop
+        self._new_frame = asyncio.Event()
+
+    def notify(self):
+        self._new_frame.set()
+        self._new_frame = asyncio.Event()
+
+    async def wait_frame(self, seq: int):
+        new_frame = self._new_frame
+        if self.ring.head <= seq and not self.is_over:
+            await new_frame.wait()
+
+
+class SpectatorHub:
+    def __init__(self, config: SpectatorConfig = spectator_config):
+        self._config = config
+        self._streams: dict[UUID, _GameStream] = {}
+        self._loop: asyncio.AbstractEventLoop | None = None
+
+    def start(self, loop: asyncio.AbstractEventLoop):
+        """Start recording the games, spectators are served on the loop."""
+        self._loop = loop
+        pub_sub.subscribe(GameSession.SPECTATE_TOPIC, self.on_game_update)
+        pub_sub.subscribe(GameSession.GAME_ENDED_TOPIC, self.on_game_ended)
+
+    def stop(self):
+        pub_sub.unsubscribe(GameSession.SPECTATE_TOPIC, self.on_game_update)
+        pub_sub.unsubscribe(GameSession.GAME_ENDED_TOPIC, self.on_game_ended)
+
+    def game_ids(self) -> list[UUID]:
+        return list(self._streams)
+
+    def ring(self, game_id: UUID) -> FrameRing | None:
+        stream = self._streams.get(game_id)
+        return stream.ring if stream is not None else None
+
+    def on_game_update(self, remote_update: RemoteGameUpdate):
+        """Called by pub_sub on the controller thread of the game."""
+        game_id, update = remote_update.game_id, remote_update.update
+        stream = self._streams.get(game_id)
+        if stream is None:
+            stream = self._streams[game_id] = _GameStream(
+                self._config.spectator_ring_size
+            )
+
+        # kept even without spectators, for the delayed ones joining later,
+        # and encoded only once read
+        stream.ring.append(
+            update, isinstance(update, GameStatusUpdate), time.monotonic()
+        )
+        if isinstance(update, GameOverUpdate):
+            self._end_stream(game_id)
+        elif stream.spectators and self._loop is not None:
+            self._loop.call_soon_threadsafe(stream.notify)
+
+    def on_game_ended(self, game_id: UUID):
+        """Called by pub_sub when the session of a game ends, over or not."""
+        self._end_stream(game_id)
+
+    def _end_stream(self, game_id: UUID):
+        stream = self._streams.pop(game_id, None)
+        if stream is None:
+            return
+        stream.is_over = True
+        if stream.spectators and self._loop is not None:
+            self._loop.call_soon_threadsafe(stream.notify)
+
+    async def spectate(self, game_id: UUID, websocket: WebSocket, delay: float = 0):
+        await websocket.accept()
+        stream = self._streams.get(game_id)
+        if stream is None:
+            await websocket.close(code=_UNKNOWN_GAME)
+            return
+
+        stream.spectators += 1
+        _spectators.inc()
+        sender = asyncio.create_task(self._send_frames(stream, websocket, delay))
+        # spectators are read-only, receiving only notices the disconnection
+        receiver = asyncio.create_task(_receive_until_disconnect(websocket))
+        try:
+            done, _ = await asyncio.wait(
+                {sender, receiver}, return_when=asyncio.FIRST_COMPLETED
+            )
+            if sender in done and sender.exception() is None:
+                await websocket.close()
+        except (WebSocketDisconnect, RuntimeError):
+            logger.debug("Spectator of game %s already disconnected", game_id)
+        finally:
+            sender.cancel()
+            receiver.cancel()
+            stream.spectators -= 1
+            _spectators.dec()
+
+    async def _send_frames(
+        self, stream: _GameStream, websocket: WebSocket, delay: float
+    ):
+        ring = stream.ring
+        seq, is_synced = self._resync(ring, delay)
+        while True:
+            frame = ring.get(seq)
+            if frame is None:
+                if seq < ring.oldest:
+                    # overwritten while the spectator was slow
+                    skipped_from = seq
+                    seq, is_synced = self._resync(ring, delay)
+                    _skipped_frames.inc(max(0, seq - skipped_from))
+                    continue
+                if stream.is_over:
+                    return
+                await stream.wait_frame(seq)
+                continue
+
+            # the stream starts from a keyframe
+            if not is_synced:
+                if not frame.is_keyframe:
+                    seq += 1
+                    continue
+                is_synced = True
+
+            overdue = time.monotonic() - (frame.published_at + delay)
+            if overdue < 0:
+                await asyncio.sleep(-overdue)
+            elif overdue > self._config.spectator_max_lag:
+                keyframe = ring.latest_keyframe(time.monotonic() - delay)
+                if keyframe is not None and keyframe.seq > seq:
+                    _skipped_frames.inc(keyframe.seq - seq)
+                    seq = keyframe.seq
+                    continue
+
+            await websocket.send_text(frame.text)
+            seq += 1
+
+    @staticmethod
+    def _resync(ring: FrameRing, delay: float) -> tuple[int, bool]:
+        """The seq to continue from, and if it is a keyframe."""
+        keyframe = ring.latest_keyframe(time.monotonic() - delay)
+        if keyframe is None:
+            return ring.oldest, False
+        return keyframe.seq, True
+
+
+async def _receive_until_disconnect(websocket: WebSocket):
+    while True:
+        await websocket.receive_text()
+
+
+spectator_hub = SpectatorHub()
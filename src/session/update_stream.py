@@ -0,0 +1,95 @@
+"""Sequence-numbered update streams of the players, kept across reconnections.
+
+Every update sent to a player is encoded once, with its seq, into the ring of
+frames of the player. A client that loses its websocket reconnects with its
+resume token and the last seq it received: it is sent the frames it missed,
+or the latest game status and the frames after it when the missed ones were
+overwritten.
+"""
+
+import asyncio
+import secrets
+import time
+
+from fastapi import WebSocket
+
+from player.player import PlayerID
+from session.spectator_hub import Frame, FrameRing
+
+
+class UpdateStream:
+    """Frames are appended by the thread publishing the updates of the player
+    and sent in seq order on the event loop of its websocket."""
+
+    def __init__(self, player_id: PlayerID, capacity: int):
+        self.player_id = player_id
+        self.resume_token = secrets.token_urlsafe(16)
+        self.ring = FrameRing(capacity)
+        # kept even when overwritten in the ring, a resumed client needs it
+        self.keyframe: Frame | None = None
+        self.websocket: WebSocket | None = None
+        self.expiry: asyncio.TimerHandle | None = None
+        # seq of the next frame to send
+        self._next_seq = 0
+        self._send_lock = asyncio.Lock()
+
+    def append(self, text: str, is_keyframe: bool) -> Frame:
+        # the seq is spliced in the encoded object, no second encoding
+        text = f'{{"seq":{self.ring.head},{text[1:]}'
+        frame = self.ring.append(text, is_keyframe, time.monotonic())
+        if is_keyframe:
+            self.keyframe = frame
+        return frame
+
+    def can_replay(self, last_seq: int) -> bool:
+        """If the frames after last_seq are all still in the ring."""
+        return last_seq + 1 >= self.ring.oldest
+
+    def is_sent(self, seq: int) -> bool:
+        return seq < self._next_seq
+
+    def frames_from(self, seq: int) -> list[Frame]:
+        """The frames from seq to the latest one, starting from the latest
+        keyframe if some of them were overwritten."""
+        head = self.ring.head
+        if seq >= self.ring.oldest:
+            return [frame for s in range(seq, head) if (frame := self.ring.get(s))]
+
+        keyframe = self.keyframe
+        if keyframe is None:
+            start, frames = self.ring.oldest, []
+        else:
+            start, frames = max(keyframe.seq + 1, self.ring.oldest), [keyframe]
+        return frames + [
+            frame for s in range(start, head) if (frame := self.ring.get(s))
+        ]
+
+    async def attach(self, websocket: WebSocket, last_seq: int | None = None):
+        """Send the frames not sent yet, or the ones after last_seq when
+        resuming, to the websocket, that receives the new ones from now on."""
+        if self.expiry is not None:
+            self.expiry.cancel()
+            self.expiry = None
+        async with self._send_lock:
+            self.websocket = websocket
+            if last_seq is not None:
+                self._next_seq = min(max(last_seq + 1, 0), self.ring.head)
+            await self._send(self.frames_from(self._next_seq))
+
+    def detach(self, websocket: WebSocket) -> bool:
+        # a resumed connection may have replaced the websocket already
+        if self.websocket is not websocket:
+            return False
+        self.websocket = None
+        return True
+
+    async def flush(self):
+        async with self._send_lock:
+            if self.websocket is not None and self._next_seq < self.ring.head:
+                await self._send(self.frames_from(self._next_seq))
+
+    async def _send(self, frames: list[Frame]):
+        websocket = self.websocket
+        for frame in frames:
+            await websocket.send_text(frame.text)
+            self._next_seq = frame.seq + 1
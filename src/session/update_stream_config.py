@@ -0,0 +1,12 @@
+from pydantic import Field
+from pydantic_settings import BaseSettings
+
+
+class UpdateStreamConfig(BaseSettings):
+    # encoded frames kept per player, a few seconds of a planning phase
+    update_stream_ring_size: int = Field(default=512, gt=0)
+    # seconds a disconnected player can resume its stream
+    resume_grace_period: float = Field(default=60, ge=0)
+
+
+update_stream_config = UpdateStreamConfig()
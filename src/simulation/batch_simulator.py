@@ -0,0 +1,639 @@
+"""Lockstep batch simulator: many games of one level as NumPy arrays.
+
+Every game keeps the troop type and the owner seat of each tile; a turn is
+resolved for all the games at once, following the rules of
+``update_game_status``: actions are applied one round at a time in player order,
+invalid ones are skipped, combat comes from the troop outcome table and the
+turn ends with the same winning conditions.
+
+Run with ``PYTHONPATH=src python -m simulation.batch_simulator --games 10000``.
+"""
+
+import argparse
+import time
+from collections import Counter
+from collections.abc import Iterable
+from dataclasses import dataclass
+
+import numpy as np
+
+from controller.controller_config import controller_config
+from controller.level_loader import LevelLoader
+from model.board.board import Board
+from model.board.board_factory import BoardTemplate, as_level
+from model.board.hex_geometry import level_geometry
+from model.board.hexagon_coordinates import HexagonCoordinates
+from model.board.level import Level
+from model.game_model.core_control_score import CoreControlScore
+from model.game_model.game_config import game_config
+from model.game_model.game_status.game_status import GameStatus
+from model.game_model.player_actions import (
+    GameAction,
+    MarchTroopAction,
+    SpawnTroopAction,
+)
+from model.game_model.player_order import PlayerOrder
+from model.troops import (
+    HomeBaseTroop,
+    PentagonTroop,
+    SquareTroop,
+    TriangleTroop,
+)
+from player.player import Player
+
+# troop type codes, 0 is an empty tile
+_TROOP_CLASSES = (None, TriangleTroop, SquareTroop, PentagonTroop, HomeBaseTroop)
+_TROOP_CODES = {
+    troop_class: code
+    for code, troop_class in enumerate(_TROOP_CLASSES)
+    if troop_class is not None
+}
+EMPTY = 0
+HOME_BASE = _TROOP_CODES[HomeBaseTroop]
+PLAYABLE_TROOPS = np.array(
+    [_TROOP_CODES[troop] for troop in (TriangleTroop, SquareTroop, PentagonTroop)]
+)
+# playable by troop type code, faster than np.isin on the hot path
+_IS_PLAYABLE = np.isin(np.arange(len(_TROOP_CLASSES)), PLAYABLE_TROOPS)
+NO_SEAT = -1
+
+# action kinds
+NO_ACTION = 0
+MARCH = 1
+SPAWN = 2
+
+# march outcomes
+_TIE = 0
+_MOVE = 1
+_LOSE = 2
+_ELIMINATE = 3
+
+
+def _outcome_table() -> np.ndarray:
+    """Outcome of a march by attacker and defender type, from the troops ordering."""
+    outcomes = np.full((len(_TROOP_CLASSES),) * 2, _TIE, dtype=np.int8)
+    for attacker_code in PLAYABLE_TROOPS:
+        attacker = _TROOP_CLASSES[attacker_code].model_construct(owner=None)
+        outcomes[attacker_code, EMPTY] = _MOVE
+        for defender_code in range(1, len(_TROOP_CLASSES)):
+            defender = _TROOP_CLASSES[defender_code].model_construct(owner=None)
+            if isinstance(defender, HomeBaseTroop):
+                outcomes[attacker_code, defender_code] = _ELIMINATE
+            elif attacker > defender:
+                outcomes[attacker_code, defender_code] = _MOVE
+            elif attacker < defender:
+                outcomes[attacker_code, defender_code] = _LOSE
+    return outcomes
+
+
+_OUTCOMES = _outcome_table()
+
+
+def _are_neighbours(
+    neighbours: np.ndarray, origins: np.ndarray, destinations: np.ndarray
+) -> np.ndarray:
+    """Whether every destination is next to its origin, from the neighbour
+    rows of the origins rather than a tiles by tiles matrix."""
+    return (neighbours[origins] == destinations[:, None]).any(axis=1)
+
+
+class BatchLevel:
+    """Tiles of a level as indexes, with their neighbours and the home bases."""
+
+    def __init__(
+        self,
+        level: Level | Iterable[HexagonCoordinates],
+        n_players: int,
+    ):
+        level = as_level(level, n_players)
+        if not level.points:
+            raise ValueError(f"No tiles in the level for {n_players} players")
+        geometry = level_geometry(level.points)
+        self.tiles = geometry.tiles
+        self.tile_index = geometry.index
+        self.n_players = n_players
+        self.core_coordinates = level.core
+        self.core = self.tile_index.get(level.core, -1)
+
+        # neighbour tile indexes, -1 where the neighbour is off board
+        self.neighbours = geometry.neighbours
+
+        # home bases by seat, as the board templates place them
+        board = BoardTemplate(level).new_board()
+        home_bases = {
+            troop.owner: self.tile_index[coordinates]
+            for coordinates, troop in board.coordinates_to_occupation.items()
+            if troop is not None
+        }
+        self.home_bases = np.array(
+            [home_bases.get(seat, -1) for seat in range(n_players)], dtype=np.int32
+        )
+
+    @property
+    def n_tiles(self) -> int:
+        return len(self.tiles)
+
+
+@dataclass(frozen=True)
+class BatchActions:
+    """Planned actions of every seat, shaped (games, seats, slots).
+
+    ``starts`` is only meaningful for marches, ``troops`` only for spawns.
+    """
+
+    kinds: np.ndarray
+    starts: np.ndarray
+    destinations: np.ndarray
+    troops: np.ndarray
+
+    @property
+    def slots(self) -> int:
+        return self.kinds.shape[2]
+
+    def compacted(self) -> "BatchActions":
+        """Move the empty slots last: a player's i-th action is played in round i."""
+        slots = np.argsort(self.kinds == NO_ACTION, axis=2, kind="stable")
+        return BatchActions(
+            *(
+                np.take_along_axis(array, slots, axis=2)
+                for array in (self.kinds, self.starts, self.destinations, self.troops)
+            )
+        )
+
+
+class BatchSimulator:
+    def __init__(
+        self,
+        level: BatchLevel,
+        troops: np.ndarray,
+        owners: np.ndarray,
+        orders: np.ndarray,
+        home_bases: np.ndarray,
+        turn_numbers: np.ndarray,
+        players: list[list[Player]],
+    ):
+        n_games = troops.shape[0]
+        self.level = level
+        self.troops = troops
+        self.owners = owners
+        # seats in turn order, the players still in game first
+        self.orders = orders
+        self.alive = home_bases >= 0
+        self.home_bases = home_bases
+        self.turn_numbers = turn_numbers
+        self.control_troops = np.zeros(n_games, dtype=np.int8)
+        self.control_owners = np.full(n_games, NO_SEAT, dtype=np.int8)
+        self.control_turns = np.zeros(n_games, dtype=np.int32)
+        self.winners = np.full(n_games, NO_SEAT, dtype=np.int8)
+        self.players = players
+        self._games = np.arange(n_games)
+
+    @classmethod
+    def new_games(cls, level: BatchLevel, n_games: int) -> "BatchSimulator":
+        """Start games as generate_game_status would: seat i gets the i-th home
+        base and plays i-th in the first turn."""
+        n_players = level.n_players
+        troops = np.zeros((n_games, level.n_tiles), dtype=np.int8)
+        owners = np.full((n_games, level.n_tiles), NO_SEAT, dtype=np.int8)
+        orders = np.tile(np.arange(n_players, dtype=np.int8), (n_games, 1))
+
+        home_bases = np.tile(level.home_bases, (n_games, 1))
+        placed = home_bases >= 0
+        games = np.nonzero(placed)[0]
+        troops[games, home_bases[placed]] = HOME_BASE
+        owners[games, home_bases[placed]] = np.nonzero(placed)[1]
+
+        seat_players = [
+            Player(id=Player.random_id(), username=f"seat{seat}")
+            for seat in range(n_players)
+        ]
+        return cls(
+            level,
+            troops,
+            owners,
+            orders,
+            home_bases,
+            np.ones(n_games, dtype=np.int32),
+            [seat_players] * n_games,
+        )
+
+    @classmethod
+    def from_game_statuses(
+        cls, level: BatchLevel, game_statuses: list[GameStatus]
+    ) -> "BatchSimulator":
+        """Load running games, with the seats of their players."""
+        n_games = len(game_statuses)
+        troops = np.zeros((n_games, level.n_tiles), dtype=np.int8)
+        owners = np.full((n_games, level.n_tiles), NO_SEAT, dtype=np.int8)
+        orders = np.empty((n_games, level.n_players), dtype=np.int8)
+        home_bases = np.full((n_games, level.n_players), -1, dtype=np.int32)
+        players = []
+
+        for game, game_status in enumerate(game_statuses):
+            if len(game_status.players) != level.n_players:
+                raise ValueError(
+                    f"Game {game} has {len(game_status.players)} players, "
+                    f"the level is for {level.n_players}"
+                )
+            occupation = game_status.board.coordinates_to_occupation
+            if occupation.keys() != level.tile_index.keys():
+                raise ValueError(f"Game {game} is not played on the level")
+
+            for coordinates, troop in occupation.items():
+                if troop is None:
+                    continue
+                tile = level.tile_index[coordinates]
+                troops[game, tile] = _TROOP_CODES[type(troop)]
+                owners[game, tile] = troop.owner
+                if isinstance(troop, HomeBaseTroop):
+                    home_bases[game, troop.owner] = tile
+            # the players in game first, in turn order
+            in_game = game_status.player_order.seats
+            orders[game] = in_game + [
+                seat for seat in range(level.n_players) if seat not in in_game
+            ]
+            players.append(game_status.players)
+
+        simulator = cls(
+            level,
+            troops,
+            owners,
+            orders,
+            home_bases,
+            np.array(
+                [game_status.turn_number for game_status in game_statuses],
+                dtype=np.int32,
+            ),
+            players,
+        )
+        for game, game_status in enumerate(game_statuses):
+            control_troop = game_status.control_score.troop
+            if control_troop is not None:
+                simulator.control_troops[game] = _TROOP_CODES[type(control_troop)]
+                simulator.control_owners[game] = control_troop.owner
+            simulator.control_turns[game] = game_status.control_score.n_turn_of_control
+            if game_status.winner is not None:
+                simulator.winners[game] = game_status.winner
+        return simulator
+
+    @property
+    def n_games(self) -> int:
+        return len(self._games)
+
+    @property
+    def active(self) -> np.ndarray:
+        return self.winners == NO_SEAT
+
+    def is_over(self) -> bool:
+        return not self.active.any()
+
+    def step(self, actions: BatchActions):
+        """Resolve one turn of every game still running."""
+        active = self.active
+        # the action order is fixed at the start of the turn
+        orders = self.orders.copy()
+        n_alive = self.alive.sum(axis=1)
+        actions = actions.compacted()
+
+        for slot in range(actions.slots):
+            for position in range(self.level.n_players):
+                in_turn = active & (position < n_alive)
+                seats = orders[:, position]
+                kinds = np.where(
+                    in_turn, actions.kinds[self._games, seats, slot], NO_ACTION
+                )
+                destinations = actions.destinations[self._games, seats, slot]
+                self._spawn(
+                    kinds == SPAWN,
+                    seats,
+                    destinations,
+                    actions.troops[self._games, seats, slot],
+                )
+                self._march(
+                    kinds == MARCH,
+                    seats,
+                    actions.starts[self._games, seats, slot],
+                    destinations,
+                )
+
+        self._end_turn(active)
+
+    def random_actions(
+        self,
+        rng: np.random.Generator,
+        action_points: int | None = None,
+        spawn_probability: float = 0.3,
+    ) -> BatchActions:
+        """Random marches of own troops and spawns near the home base, within the
+        action points of the turn."""
+        if action_points is None:
+            action_points = controller_config.default_action_points
+        march_cost = game_config.march_troop_action_points
+        spawn_cost = game_config.spawn_troop_action_points
+        n_games, n_players = self.n_games, self.level.n_players
+        slots = action_points // min(march_cost, spawn_cost)
+        shape = (n_games, n_players, slots)
+
+        kinds = np.where(rng.random(shape) < spawn_probability, SPAWN, MARCH)
+        costs = np.where(kinds == SPAWN, spawn_cost, march_cost)
+        kinds[np.cumsum(costs, axis=2) > action_points] = NO_ACTION
+        directions = rng.integers(0, 6, shape)
+        troops = rng.choice(PLAYABLE_TROOPS, shape).astype(np.int8)
+
+        # march a random own troop: pick the n-th troop of the seat
+        starts = np.full(shape, -1, dtype=np.int32)
+        playable = _IS_PLAYABLE[self.troops]
+        for seat in range(n_players):
+            # int32 as the tile indices, a big level overflows int16 counts
+            owned_counts = np.cumsum(
+                playable & (self.owners == seat), axis=1, dtype=np.int32
+            )
+            n_owned = owned_counts[:, -1]
+            for slot in range(slots):
+                rank = (rng.random(n_games) * n_owned).astype(np.int32)
+                start = np.argmax(owned_counts > rank[:, None], axis=1)
+                starts[:, seat, slot] = np.where(n_owned > 0, start, -1)
+
+        spawn_tiles = np.broadcast_to(self.home_bases[:, :, None], shape)
+        origins = np.where(kinds == SPAWN, spawn_tiles, starts)
+        destinations = np.where(
+            origins >= 0, self.level.neighbours[origins, directions], -1
+        )
+        kinds[destinations < 0] = NO_ACTION
+
+        return BatchActions(kinds, starts, destinations, troops)
+
+    def game_status(self, game: int) -> GameStatus:
+        """The game as the reference models, for cross-checks and inspection."""
+        occupation = {
+            tile: self._troop(game, index)
+            for index, tile in enumerate(self.level.tiles)
+        }
+        n_alive = int(self.alive[game].sum())
+        control_troop = (
+            _TROOP_CLASSES[self.control_troops[game]].model_construct(
+                owner=int(self.control_owners[game])
+            )
+            if self.control_troops[game] != EMPTY
+            else None
+        )
+
+        return GameStatus.model_construct(
+            turn_number=int(self.turn_numbers[game]),
+            players=self.players[game],
+            player_order=PlayerOrder.model_construct(
+                seats=self.orders[game, :n_alive].tolist()
+            ),
+            winner=int(self.winners[game]) if self.winners[game] != NO_SEAT else None,
+            board=Board.model_construct(
+                coordinates_to_occupation=occupation,
+                core_coordinates=self.level.core_coordinates,
+            ),
+            control_score=CoreControlScore.model_construct(
+                troop=control_troop,
+                n_turn_of_control=int(self.control_turns[game]),
+            ),
+        )
+
+    def game_actions(self, actions: BatchActions, game: int) -> list[list[GameAction]]:
+        """The planned actions of a game by seat, as the reference models."""
+        tiles = self.level.tiles
+        game_actions = []
+        for seat in range(self.level.n_players):
+            player_actions = []
+            for slot in range(actions.slots):
+                kind = actions.kinds[game, seat, slot]
+                destination = tiles[actions.destinations[game, seat, slot]]
+                if kind == MARCH:
+                    player_actions.append(
+                        MarchTroopAction(
+                            starting_coordinates=tiles[
+                                actions.starts[game, seat, slot]
+                            ],
+                            destination_coordinates=destination,
+                        )
+                    )
+                elif kind == SPAWN:
+                    troop_class = _TROOP_CLASSES[actions.troops[game, seat, slot]]
+                    player_actions.append(
+                        SpawnTroopAction(
+                            coordinates=destination, troop=troop_class(owner=seat)
+                        )
+                    )
+            game_actions.append(player_actions)
+        return game_actions
+
+    def _troop(self, game: int, tile: int):
+        troop = self.troops[game, tile]
+        if troop == EMPTY:
+            return None
+        return _TROOP_CLASSES[troop].model_construct(owner=int(self.owners[game, tile]))
+
+    def _spawn(
+        self,
+        spawning: np.ndarray,
+        seats: np.ndarray,
+        destinations: np.ndarray,
+        troops: np.ndarray,
+    ):
+        games = np.nonzero(spawning)[0]
+        seats, destinations, troops = seats[games], destinations[games], troops[games]
+        home_bases = self.home_bases[games, seats]
+
+        valid = (
+            (self.troops[games, destinations] == EMPTY)
+            & (home_bases >= 0)
+            & _are_neighbours(self.level.neighbours, home_bases, destinations)
+            & _IS_PLAYABLE[troops]
+        )
+        games, seats = games[valid], seats[valid]
+        self.troops[games, destinations[valid]] = troops[valid]
+        self.owners[games, destinations[valid]] = seats
+
+    def _march(
+        self,
+        marching: np.ndarray,
+        seats: np.ndarray,
+        starts: np.ndarray,
+        destinations: np.ndarray,
+    ):
+        games = np.nonzero(marching)[0]
+        seats, starts, destinations = seats[games], starts[games], destinations[games]
+        attackers = self.troops[games, starts]
+
+        valid = (
+            (self.owners[games, starts] == seats)
+            & _IS_PLAYABLE[attackers]
+            & (self.owners[games, destinations] != seats)
+            & _are_neighbours(self.level.neighbours, starts, destinations)
+        )
+        games, seats = games[valid], seats[valid]
+        starts, destinations = starts[valid], destinations[valid]
+        attackers = attackers[valid]
+        outcomes = _OUTCOMES[attackers, self.troops[games, destinations]]
+
+        moving = outcomes == _MOVE
+        self.troops[games[moving], destinations[moving]] = attackers[moving]
+        self.owners[games[moving], destinations[moving]] = seats[moving]
+
+        emptied = moving | (outcomes == _LOSE)
+        self.troops[games[emptied], starts[emptied]] = EMPTY
+        self.owners[games[emptied], starts[emptied]] = NO_SEAT
+
+        eliminating = outcomes == _ELIMINATE
+        if eliminating.any():
+            self._eliminate(
+                games[eliminating], self.owners[games, destinations][eliminating]
+            )
+
+    def _eliminate(self, games: np.ndarray, seats: np.ndarray):
+        # a home base was taken: its owner leaves the game with all its troops
+        removed = self.owners[games] == seats[:, None]
+        self.troops[games] = np.where(removed, EMPTY, self.troops[games])
+        self.owners[games] = np.where(removed, NO_SEAT, self.owners[games])
+        self.home_bases[games, seats] = -1
+        self.alive[games, seats] = False
+
+    def _end_turn(self, active: np.ndarray):
+        games = np.nonzero(active)[0]
+        self.turn_numbers[games] += 1
+
+        # the removed players leave the turn order, keeping the others in order
+        orders = self.orders[games]
+        leaving = ~self.alive[games[:, None], orders]
+        orders = np.take_along_axis(
+            orders, np.argsort(leaving, axis=1, kind="stable"), axis=1
+        )
+        n_alive = self.alive[games].sum(axis=1)
+
+        # the last player left in the game wins
+        last_player = n_alive == 1
+        self.winners[games[last_player]] = orders[last_player, 0]
+
+        # max turns reached: most troops wins, ties go to the earlier in turn order
+        max_turns = ~last_player & (self.turn_numbers[games] > game_config.max_turns)
+        if max_turns.any():
+            self.winners[games[max_turns]] = self._most_troops(
+                games[max_turns], orders[max_turns], n_alive[max_turns]
+            )
+
+        # a troop holding the core for enough consecutive turns wins
+        running = ~last_player & ~max_turns
+        won = self._update_core_control(games[running])
+        running[running] = ~won
+
+        # rotate the turn order of the players in game
+        positions = np.arange(self.level.n_players)
+        rotated = np.where(
+            positions < n_alive[:, None],
+            (positions + 1) % np.maximum(n_alive, 1)[:, None],
+            positions,
+        )
+        orders[running] = np.take_along_axis(orders[running], rotated[running], axis=1)
+        self.orders[games] = orders
+
+    def _most_troops(
+        self, games: np.ndarray, orders: np.ndarray, n_alive: np.ndarray
+    ) -> np.ndarray:
+        playable = _IS_PLAYABLE[self.troops[games]]
+        owners = self.owners[games]
+        troop_counts = np.stack(
+            [
+                (playable & (owners == seat)).sum(axis=1)
+                for seat in range(orders.shape[1])
+            ],
+            axis=1,
+        )
+        ordered_counts = np.take_along_axis(troop_counts, orders.astype(np.intp), 1)
+        ordered_counts[np.arange(orders.shape[1]) >= n_alive[:, None]] = -1
+        # argmax returns the first maximum, the earlier in turn order
+        return orders[np.arange(len(games)), np.argmax(ordered_counts, axis=1)]
+
+    def _update_core_control(self, games: np.ndarray) -> np.ndarray:
+        if self.level.core < 0:
+            core_troops = np.zeros(len(games), dtype=np.int8)
+            core_owners = np.full(len(games), NO_SEAT, dtype=np.int8)
+        else:
+            core_troops = self.troops[games, self.level.core]
+            core_owners = self.owners[games, self.level.core]
+
+        occupied = core_troops != EMPTY
+        # troops of the same type and owner keep the control, home bases never do
+        kept = (
+            occupied
+            & (core_troops == self.control_troops[games])
+            & (core_owners == self.control_owners[games])
+            & (core_troops != HOME_BASE)
+        )
+        self.control_turns[games] = np.where(
+            kept, self.control_turns[games] + 1, np.where(occupied, 1, 0)
+        )
+        self.control_troops[games] = core_troops
+        self.control_owners[games] = core_owners
+
+        won = occupied & (
+            self.control_turns[games] >= game_config.winning_core_control_turns
+        )
+        self.winners[games[won]] = core_owners[won]
+        return won
+
+
+@dataclass(frozen=True)
+class BatchReport:
+    winners: np.ndarray
+    turns: np.ndarray
+    elapsed_seconds: float
+
+    @property
+    def games(self) -> int:
+        return len(self.winners)
+
+    @property
+    def games_per_second(self) -> float:
+        return self.games / self.elapsed_seconds if self.elapsed_seconds else 0.0
+
+    def wins_by_seat(self) -> dict[int, int]:
+        return dict(Counter(self.winners[self.winners != NO_SEAT].tolist()))
+
+
+def run_batch(
+    level: BatchLevel, n_games: int, seed: int, batch_size: int = 10_000
+) -> BatchReport:
+    """Play random games to the end, ``batch_size`` games in lockstep at a time."""
+    rng = np.random.default_rng(seed)
+    start = time.perf_counter()
+    winners, turns = [], []
+
+    for first_game in range(0, n_games, batch_size):
+        simulator = BatchSimulator.new_games(
+            level, min(batch_size, n_games - first_game)
+        )
+        while not simulator.is_over():
+            simulator.step(simulator.random_actions(rng))
+        winners.append(simulator.winners)
+        turns.append(simulator.turn_numbers)
+
+    return BatchReport(
+        np.concatenate(winners), np.concatenate(turns), time.perf_counter() - start
+    )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--games", type=int, default=10_000)
+    parser.add_argument("--players", type=int, default=3)
+    parser.add_argument("--batch-size", type=int, default=10_000)
+    parser.add_argument("--seed", type=int, default=1234)
+    parser.add_argument("--levels", default="src/resources/")
+    args = parser.parse_args()
+
+    level_loader = LevelLoader(level_folder_path=args.levels)
+    level_loader.load_levels()
+    batch_level = BatchLevel(level_loader.get_level(args.players), args.players)
+    report = run_batch(batch_level, args.games, args.seed, args.batch_size)
+
+    print(f"games: {report.games}")
+    print(f"elapsed: {report.elapsed_seconds:.3f}s")
+    print(f"games per second: {report.games_per_second:.2f}")
+    print(f"mean turns: {report.turns.mean():.2f}")
+    print(f"wins by seat: {report.wins_by_seat()}")
@@ -0,0 +1,169 @@
+"""Play complete games at CPU speed, with a virtual clock and simulated players.
+
+Run with ``PYTHONPATH=src python -m simulation.headless_runner --games 100``.
+"""
+
+import argparse
+import random
+import time
+import uuid
+from collections import Counter
+from collections.abc import Callable
+from dataclasses import dataclass
+
+from controller.action_point_calculator import action_points_cost
+from controller.game_controller import GameController
+from controller.game_controller_setup import GameControllerSetup
+from controller.level_loader import LevelLoader
+from game_log.game_log_writer import GameLogWriter
+from metrics.game_accounting import GameAccounting
+from model.board.board_factory import BoardTemplates
+from model.game_model.game_rng import game_rng
+from model.game_model.game_status.game_status_factory import generate_game_status
+from model.game_model.game_status.game_status_updater import update_game_status
+from model.game_model.player_action_validator import is_valid_action
+from player.player import Player
+from simulation.in_memory_session import InMemorySession
+from simulation.manual_executor import ManualExecutor
+from simulation.simulated_player import RandomPlayer, SimulatedPlayer
+from simulation.virtual_clock import VirtualClock
+
+
+@dataclass(frozen=True)
+class GameResult:
+    winner: Player | None
+    turns: int
+    virtual_seconds: float
+    updates_count: dict[str, int]
+
+
+@dataclass(frozen=True)
+class SimulationReport:
+    results: list[GameResult]
+    elapsed_seconds: float
+
+    @property
+    def games(self) -> int:
+        return len(self.results)
+
+    @property
+    def games_per_second(self) -> float:
+        return self.games / self.elapsed_seconds if self.elapsed_seconds else 0.0
+
+    def wins_by_username(self) -> dict[str, int]:
+        return dict(
+            Counter(
+                result.winner.username
+                for result in self.results
+                if result.winner is not None
+            )
+        )
+
+
+class HeadlessRunner:
+    """Drives the GameController phase machine without wall clock or network."""
+
+    def __init__(
+        self,
+        setup: GameControllerSetup,
+        game_log_writer: GameLogWriter | None = None,
+        seed: int | None = None,
+        game_accounting: GameAccounting | None = None,
+    ):
+        self._setup = setup
+        self._game_log_writer = game_log_writer
+        self._seed = seed
+        self._game_accounting = game_accounting
+
+    def play_game(
+        self, simulated_players: list[SimulatedPlayer], game: int = 0
+    ) -> GameResult:
+        clock = VirtualClock()
+        executor = ManualExecutor()
+        game_id = uuid.uuid4()
+        session = InMemorySession(simulated_players)
+        game_controller = GameController(
+            self._setup,
+            {simulated_player.player for simulated_player in simulated_players},
+            session,
+            clock,
+            executor,
+            self._game_log_writer.open_game_log(game_id)
+            if self._game_log_writer is not None
+            else None,
+            game_rng(game, self._seed),
+            self._game_accounting.open_account(game_id)
+            if self._game_accounting is not None
+            else None,
+        )
+        session.attach(game_controller)
+
+        session.start()
+        executor.run_until_idle()
+
+        return GameResult(
+            winner=session.winner,
+            turns=session.last_turn_number,
+            virtual_seconds=clock.monotonic(),
+            updates_count=dict(session.updates_count),
+        )
+
+    def run(
+        self,
+        n_games: int,
+        players_factory: Callable[[int], list[SimulatedPlayer]],
+    ) -> SimulationReport:
+        start = time.perf_counter()
+        results = [
+            self.play_game(players_factory(game), game) for game in range(n_games)
+        ]
+        return SimulationReport(results, time.perf_counter() - start)
+
+
+def default_setup(level_folder_path: str) -> GameControllerSetup:
+    level_loader = LevelLoader(level_folder_path=level_folder_path)
+    level_loader.load_levels()
+    board_templates = BoardTemplates(
+        level_loader.get_level, level_loader.levels_sizes()
+    )
+
+    return GameControllerSetup(
+        update_game_status,
+        is_valid_action,
+        action_points_cost,
+        lambda players, rng: generate_game_status(
+            players, board_templates.generate_board, rng
+        ),
+    )
+
+
+def random_players_factory(
+    n_players: int, seed: int
+) -> Callable[[int], list[SimulatedPlayer]]:
+    def _random_players(game: int) -> list[SimulatedPlayer]:
+        rng = random.Random(f"{seed}-{game}")
+        return [
+            RandomPlayer(Player(id=Player.random_id(rng), username=f"seat{seat}"), rng)
+            for seat in range(n_players)
+        ]
+
+    return _random_players
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--games", type=int, default=100)
+    parser.add_argument("--players", type=int, default=3)
+    parser.add_argument("--seed", type=int, default=1234)
+    parser.add_argument("--levels", default="src/resources/")
+    args = parser.parse_args()
+
+    runner = HeadlessRunner(default_setup(args.levels), seed=args.seed)
+    report = runner.run(args.games, random_players_factory(args.players, args.seed))
+
+    turns = [result.turns for result in report.results]
+    print(f"games: {report.games}")
+    print(f"elapsed: {report.elapsed_seconds:.3f}s")
+    print(f"games per second: {report.games_per_second:.2f}")
+    print(f"mean turns: {sum(turns) / len(turns):.2f}")
+    print(f"wins: {report.wins_by_username()}")
@@ -0,0 +1,73 @@
+from collections import Counter
+from typing import override
+
+from controller.controller_config import controller_config
+from controller.game_controller import GameController
+from controller.game_update import (
+    GameOverUpdate,
+    GameStatusUpdate,
+    GameUpdate,
+    PersonalUpdate,
+)
+from metrics.tracing import Trace
+from player.player import Player, PlayerID
+from session.session import Session
+from simulation.simulated_player import SimulatedPlayer
+
+
+class InMemorySession(Session):
+    """Session that hands updates to simulated players instead of websockets."""
+
+    def __init__(self, simulated_players: list[SimulatedPlayer]):
+        self._simulated_players = {
+            simulated_player.player.id: simulated_player
+            for simulated_player in simulated_players
+        }
+        self._game_controller: GameController | None = None
+        self.updates_count: Counter[str] = Counter()
+        self.last_turn_number = 0
+        self.winner: Player | None = None
+        self.is_over = False
+
+    def attach(self, game_controller: GameController):
+        self._game_controller = game_controller
+
+    @override
+    def start(self):
+        self._game_controller.start()
+
+    @override
+    def send_private_update(
+        self, player_id: PlayerID, update: PersonalUpdate, trace: Trace | None = None
+    ):
+        self.updates_count[update.update_type] += 1
+
+    @override
+    def send_broadcast_update(
+        self,
+        update: GameUpdate,
+        player_views: dict[PlayerID, GameUpdate] | None = None,
+    ):
+        self.updates_count[update.update_type] += 1
+
+        match update:
+            case GameStatusUpdate(game_status=game_status):
+                self.last_turn_number = game_status.turn_number
+                for player in game_status.players_in_game():
+                    simulated_player = self._simulated_players[player.id]
+                    # players choose on the part of the board they are sent
+                    player_status = (
+                        player_views[player.id].game_status
+                        if player_views is not None
+                        else game_status
+                    )
+                    for action in simulated_player.choose_actions(
+                        player_status, controller_config.default_action_points
+                    ):
+                        self._game_controller.process_player_request(player, action)
+            case GameOverUpdate(winner=winner):
+                self.winner = winner
+
+    @override
+    def game_is_over(self):
+        self.is_over = True
@@ -0,0 +1,44 @@
+from collections import deque
+from collections.abc import Callable
+from concurrent.futures import Executor, Future
+from typing import Any
+
+
+class ManualExecutor(Executor):
+    """Executor that queues tasks and runs them on the caller's thread.
+
+    Tasks run in submission order only when ``run_until_idle`` is called, which
+    makes a controller driven by it single-threaded and deterministic.
+    """
+
+    def __init__(self):
+        self._tasks: deque[tuple[Future, Callable[..., Any], tuple, dict]] = deque()
+        self._shutdown = False
+
+    def submit(self, fn: Callable[..., Any], /, *args, **kwargs) -> Future:
+        if self._shutdown:
+            raise RuntimeError("cannot schedule new futures after shutdown")
+
+        future = Future()
+        self._tasks.append((future, fn, args, kwargs))
+        return future
+
+    def run_until_idle(self) -> int:
+        executed = 0
+        while self._tasks:
+            future, fn, args, kwargs = self._tasks.popleft()
+            executed += 1
+            if not future.set_running_or_notify_cancel():
+                continue
+            try:
+                future.set_result(fn(*args, **kwargs))
+            except BaseException as e:
+                future.set_exception(e)
+                raise
+        return executed
+
+    def shutdown(self, wait: bool = True, *, cancel_futures: bool = False):
+        self._shutdown = True
+        if cancel_futures:
+            while self._tasks:
+                self._tasks.popleft()[0].cancel()
@@ -0,0 +1,55 @@
+import random
+from abc import ABC, abstractmethod
+from collections.abc import Callable
+
+from model.game_model.game_status.game_status import GameStatus
+from model.game_model.legal_actions import legal_actions
+from model.game_model.player_actions import GameAction
+from player.player import Player
+
+
+class SimulatedPlayer(ABC):
+    def __init__(self, player: Player):
+        self.player = player
+
+    @abstractmethod
+    def choose_actions(
+        self, game_status: GameStatus, action_points: int
+    ) -> list[GameAction]:
+        pass
+
+
+class ScriptedPlayer(SimulatedPlayer):
+    def __init__(
+        self,
+        player: Player,
+        script: Callable[[Player, GameStatus], list[GameAction]],
+    ):
+        super().__init__(player)
+        self._script = script
+
+    def choose_actions(
+        self, game_status: GameStatus, action_points: int
+    ) -> list[GameAction]:
+        return self._script(self.player, game_status)
+
+
+class RandomPlayer(SimulatedPlayer):
+    """Plays random actions among the legal ones at the start of the turn."""
+
+    def __init__(self, player: Player, rng: random.Random):
+        super().__init__(player)
+        self._rng = rng
+
+    def choose_actions(
+        self, game_status: GameStatus, action_points: int
+    ) -> list[GameAction]:
+        candidates = legal_actions(game_status.seat_of(self.player), game_status)
+        self._rng.shuffle(candidates)
+
+        actions = []
+        for action in candidates:
+            if action.action_points_cost <= action_points:
+                actions.append(action)
+                action_points -= action.action_points_cost
+        return actions
@@ -0,0 +1,14 @@
+from controller.clock import Clock
+
+
+class VirtualClock(Clock):
+    """Clock whose time only moves forward when someone sleeps."""
+
+    def __init__(self, start: float = 0.0):
+        self._now = start
+
+    def monotonic(self) -> float:
+        return self._now
+
+    def sleep(self, seconds: float) -> None:
+        self._now += max(0.0, seconds)
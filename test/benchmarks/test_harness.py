@@ -0,0 +1,53 @@
+from benchmarks.harness import (
+    BenchmarkResult,
+    compare_results,
+    read_results,
+    run_benchmark,
+    write_results,
+)
+
+
+def _result(median_s: float) -> BenchmarkResult:
+    return BenchmarkResult(
+        median_s=median_s, min_s=median_s, stdev_s=0.0, loops=1, repeats=1
+    )
+
+
+def test_run_benchmark_calibrates_loops():
+    result = run_benchmark(lambda: lambda: None, repeats=2, min_repeat_time=0.001)
+
+    assert result.loops > 1
+    assert result.median_s > 0
+
+
+def test_run_benchmark_cleans_up_yielding_setups():
+    cleaned_up = []
+
+    def _setup():
+        try:
+            yield lambda: None
+        finally:
+            cleaned_up.append(True)
+
+    run_benchmark(_setup, repeats=2, min_repeat_time=0.001)
+
+    assert cleaned_up == [True]
+
+
+def test_results_round_trip(tmp_path):
+    path = tmp_path / "results.json"
+    write_results(path, {"a": _result(1.0)})
+
+    assert read_results(path) == {"a": _result(1.0)}
+
+
+def test_compare_flags_only_regressions_over_threshold():
+    baseline = {"fast": _result(1.0), "slow": _result(1.0), "removed": _result(1.0)}
+    current = {"fast": _result(0.5), "slow": _result(1.5), "added": _result(1.0)}
+
+    comparisons = {c.name: c for c in compare_results(baseline, current)}
+
+    assert comparisons.keys() == {"fast", "slow"}
+    assert not comparisons["fast"].is_regression(0.1)
+    assert comparisons["slow"].is_regression(0.1)
+    assert not comparisons["slow"].is_regression(0.6)
@@ -0,0 +1,9 @@
+from benchmarks.startup import HEAVY_MODULES, measure_startup
+
+
+def test_server_starts_without_heavy_modules():
+    # what is imported, not how long it takes: timings vary across machines
+    report = measure_startup("main", runs=1)
+
+    assert report.imported("fastapi")
+    assert [module for module in HEAVY_MODULES if report.imported(module)] == []
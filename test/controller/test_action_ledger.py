@@ -0,0 +1,56 @@
+from controller.action_ledger import ActionLedger
+from controller.action_point_calculator import action_points_cost
+from model.board.hexagon_coordinates import HexagonCoordinates
+from model.game_model.player_actions import MarchTroopAction, SpawnTroopAction
+from model.troops import SquareTroop
+
+_SEAT = 0
+
+
+def _march() -> MarchTroopAction:
+    return MarchTroopAction(
+        starting_coordinates=HexagonCoordinates(q=0, r=0),
+        destination_coordinates=HexagonCoordinates(q=1, r=0),
+    )
+
+
+def _spawn() -> SpawnTroopAction:
+    return SpawnTroopAction(
+        coordinates=HexagonCoordinates(q=0, r=1), troop=SquareTroop(owner=_SEAT)
+    )
+
+
+def test_append_updates_remaining_points():
+    ledger = ActionLedger(3, action_points_cost)
+
+    ledger.append(_march())
+    ledger.append(_spawn())
+
+    assert ledger.remaining_action_points == 0
+    assert not ledger.can_afford(_march())
+
+
+def test_cancel_by_id_refunds_only_that_action():
+    ledger = ActionLedger(3, action_points_cost)
+    march, spawn = _march(), _spawn()
+    march_id = ledger.append(march)
+    ledger.append(spawn)
+
+    assert ledger.cancel(march_id) == march
+    assert ledger.cancel(march_id) is None
+    assert ledger.actions() == [spawn]
+    assert ledger.remaining_action_points == 1
+
+
+def test_undo_last_and_clear():
+    ledger = ActionLedger(3, action_points_cost)
+    march, spawn = _march(), _spawn()
+    ledger.append(march)
+    spawn_id = ledger.append(spawn)
+
+    assert ledger.undo_last() == (spawn_id, spawn)
+    assert ledger.actions() == [march]
+
+    ledger.clear()
+    assert ledger.undo_last() is None
+    assert ledger.remaining_action_points == 3
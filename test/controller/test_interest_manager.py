@@ -0,0 +1,133 @@
+import random
+from functools import cache
+
+from controller.action_point_calculator import action_points_cost
+from controller.controller_config import controller_config
+from controller.game_controller_setup import GameControllerSetup
+from controller.interest_manager import InterestManager
+from model.board.board_factory import BoardTemplates, generate_board
+from model.board.level_generator import generate_level
+from model.board.tile_grid import tile_grid
+from model.game_model.game_event import PlayerRemovedEvent, TroopMovedEvent
+from model.game_model.game_status.game_status_factory import generate_game_status
+from model.game_model.game_status.game_status_updater import update_game_status
+from model.game_model.player_action_validator import is_valid_action
+from model.troops import SquareTroop
+from player.player import Player
+from simulation.headless_runner import HeadlessRunner, random_players_factory
+from simulation.simulated_player import RandomPlayer
+
+RADIUS = 3
+CELL_SIZE = 4
+
+
+@cache
+def _large_level(n_players: int):
+    return generate_level(n_players, radius=40).points
+
+
+def _new_game(n_players: int = 4):
+    players = {
+        Player(id=Player.random_id(), username=f"p{i}") for i in range(n_players)
+    }
+    return generate_game_status(
+        players,
+        lambda n_players: generate_board(n_players, lambda n: set(_large_level(n))),
+        random.Random(0),
+    )
+
+
+def _owned_tiles(game_status, seat):
+    return [
+        coordinates
+        for coordinates, troop in game_status.board.coordinates_to_occupation.items()
+        if troop is not None and troop.owner == seat
+    ]
+
+
+def test_grid_covers_the_tiles_within_the_radius():
+    tiles = _large_level(4)
+    grid = tile_grid(tiles, CELL_SIZE)
+    center = next(iter(tiles))
+
+    cells = set(grid.cells_around(center, RADIUS))
+
+    assert all(
+        grid.cell_of(tile) in cells for tile in tiles if tile.distance(center) <= RADIUS
+    )
+    assert sum(len(grid.tiles_in(cell)) for cell in grid.cells()) == len(tiles)
+
+
+def test_players_see_their_surroundings_and_the_core_only():
+    game_status = _new_game()
+    interest_manager = InterestManager(game_status, RADIUS, CELL_SIZE)
+    board = game_status.board
+
+    for seat in game_status.player_order.seats:
+        visible = interest_manager.visible_game_status(seat, game_status).board
+        tiles = visible.coordinates_to_occupation
+        assert board.core_coordinates in tiles
+        assert all(
+            tile in tiles
+            for owned in _owned_tiles(game_status, seat)
+            for tile in board.coordinates_to_occupation
+            if tile.distance(owned) <= RADIUS
+        )
+        # bounded by the region, not by the map
+        assert len(tiles) < len(board.coordinates_to_occupation) / 10
+
+
+def test_regions_follow_the_troops_incrementally():
+    game_status = _new_game()
+    interest_manager = InterestManager(game_status, RADIUS, CELL_SIZE)
+    rng = random.Random(3)
+
+    for _ in range(8):
+        players_actions = [
+            RandomPlayer(player, rng).choose_actions(game_status, 3)
+            for player in game_status.players
+        ]
+        _, game_status = update_game_status(
+            game_status, players_actions, is_valid_action, interest_manager.rebase
+        )
+
+    rebuilt = InterestManager(game_status, RADIUS, CELL_SIZE)
+    for seat in game_status.player_order.seats:
+        assert interest_manager.region(seat) == rebuilt.region(seat)
+
+
+def test_events_reach_the_players_that_see_them():
+    game_status = _new_game()
+    interest_manager = InterestManager(game_status, RADIUS, CELL_SIZE)
+    seats = game_status.player_order.seats
+    mover = seats[0]
+    start = _owned_tiles(game_status, mover)[0]
+    moved = TroopMovedEvent(
+        troop=SquareTroop(owner=mover),
+        from_coordinates=start,
+        to_coordinates=start.neighbours()[0],
+    )
+
+    assert interest_manager.event_audience(moved, seats) == [mover]
+    assert interest_manager.event_audience(
+        PlayerRemovedEvent(seat=mover), seats
+    ) == list(seats)
+
+
+def test_games_on_large_boards_are_played_on_the_regions(monkeypatch):
+    monkeypatch.setattr(controller_config, "interest_min_tiles", 0)
+    monkeypatch.setattr(controller_config, "interest_radius", RADIUS)
+    monkeypatch.setattr(controller_config, "interest_cell_size", CELL_SIZE)
+    board_templates = BoardTemplates(lambda n: set(_large_level(n)))
+    setup = GameControllerSetup(
+        update_game_status,
+        is_valid_action,
+        action_points_cost,
+        lambda players, rng: generate_game_status(
+            players, board_templates.generate_board, rng
+        ),
+    )
+
+    report = HeadlessRunner(setup).run(1, random_players_factory(3, seed=4))
+
+    assert report.results[0].winner is not None
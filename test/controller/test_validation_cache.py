@@ -0,0 +1,110 @@
+import random
+
+from controller.validation_cache import ValidationCache
+from model.board.board_factory import generate_board
+from model.board.hexagon_coordinates import HexagonCoordinates
+from model.game_model.game_status.game_status_factory import generate_game_status
+from model.game_model.game_status.game_status_updater import update_game_status
+from model.game_model.player_action_validator import is_valid_action
+from model.game_model.player_actions import MarchTroopAction, SpawnTroopAction
+from model.troops import HomeBaseTroop, SquareTroop
+from player.player import Player
+
+
+def _level(_: int) -> set[HexagonCoordinates]:
+    return {
+        HexagonCoordinates(q=q, r=r)
+        for q in range(-3, 4)
+        for r in range(-3, 4)
+        if abs(q + r) <= 3
+    }
+
+
+def _new_game():
+    players = {Player(id=Player.random_id(), username=f"p{i}") for i in range(3)}
+    game_status = generate_game_status(
+        players, lambda n_players: generate_board(n_players, _level), random.Random(0)
+    )
+    return game_status, game_status.player_order.seats
+
+
+def _spawn_near_home_base(game_status, seat) -> SpawnTroopAction:
+    home_base = next(
+        coordinates
+        for coordinates, troop in game_status.board.coordinates_to_occupation.items()
+        if isinstance(troop, HomeBaseTroop) and troop.owner == seat
+    )
+    coordinates = next(
+        neighbour
+        for neighbour in home_base.neighbours()
+        if neighbour in game_status.board.coordinates_to_occupation
+    )
+    return SpawnTroopAction(coordinates=coordinates, troop=SquareTroop(owner=seat))
+
+
+def test_repeated_validation_is_a_hit():
+    game_status, seats = _new_game()
+    cache = ValidationCache(is_valid_action)
+    action = _spawn_near_home_base(game_status, seats[0])
+
+    assert cache(seats[0], action, game_status)
+    assert cache(seats[0], action, game_status)
+    assert (cache.hits, cache.misses) == (1, 1)
+
+
+def test_rebase_drops_only_touched_validations():
+    game_status, seats = _new_game()
+    cache = ValidationCache(is_valid_action)
+    first_spawn = _spawn_near_home_base(game_status, seats[0])
+    second_spawn = _spawn_near_home_base(game_status, seats[1])
+    cache(seats[0], first_spawn, game_status)
+    cache(seats[1], second_spawn, game_status)
+
+    _, new_game_status = update_game_status(
+        game_status,
+        [[first_spawn], [], []],
+        cache,
+        cache.rebase,
+    )
+    cache.rebase(new_game_status, set())
+
+    # the spawn tile is now occupied: recomputed and invalid
+    assert not cache(seats[0], first_spawn, new_game_status)
+    assert cache(seats[1], second_spawn, new_game_status)
+    assert cache.misses == 3
+
+
+def test_cached_resolution_matches_reference():
+    game_status, seats = _new_game()
+    spawn = _spawn_near_home_base(game_status, seats[0])
+    other_spawn = _spawn_near_home_base(game_status, seats[1])
+    occupation = game_status.board.coordinates_to_occupation
+    destination = next(
+        neighbour
+        for neighbour in spawn.coordinates.neighbours()
+        if neighbour in occupation
+        and occupation[neighbour] is None
+        and neighbour != other_spawn.coordinates
+    )
+    march = MarchTroopAction(
+        starting_coordinates=spawn.coordinates, destination_coordinates=destination
+    )
+    actions = [[], [], []]
+    actions[seats[0]] = [spawn, march]
+    actions[seats[1]] = [other_spawn]
+    cache = ValidationCache(is_valid_action)
+
+    reference_events, reference_status = update_game_status(
+        game_status, actions, is_valid_action
+    )
+    cached_events, cached_status = update_game_status(
+        game_status, actions, cache, cache.rebase
+    )
+
+    # the march is validated after the spawn touched its starting tile
+    marched = reference_status.board.coordinates_to_occupation
+    assert marched[spawn.coordinates] is None
+    assert marched[destination] == spawn.troop
+    assert marched[other_spawn.coordinates] == other_spawn.troop
+    assert cached_events == reference_events
+    assert cached_status.board.model_dump() == reference_status.board.model_dump()
@@ -0,0 +1,190 @@
+import random
+import uuid
+from threading import Event
+
+import pytest
+
+from game_log.game_log_config import GameLogConfig
+from game_log.game_log_reader import GameLogReader
+from game_log.game_log_writer import GameLogWriter
+from model.board.board_factory import BoardTemplates
+from model.board.hexagon_coordinates import HexagonCoordinates
+from model.game_model.game_status.game_status_factory import generate_game_status
+from model.game_model.game_status.game_status_updater import update_game_status
+from model.game_model.player_action_validator import is_valid_action
+from player.player import Player
+from simulation.headless_runner import (
+    HeadlessRunner,
+    default_setup,
+    random_players_factory,
+)
+from simulation.simulated_player import RandomPlayer
+
+
+def _level(_: int) -> set[HexagonCoordinates]:
+    return {
+        HexagonCoordinates(q=q, r=r)
+        for q in range(-4, 5)
+        for r in range(-4, 5)
+        if abs(q + r) <= 4
+    }
+
+
+def _writer(tmp_path) -> GameLogWriter:
+    return GameLogWriter(
+        GameLogConfig(game_log_folder=str(tmp_path), game_log_snapshot_interval=4)
+    )
+
+
+def _play(game_log, turns: int):
+    """Play random turns, recording them; returns the statuses and actions."""
+    rng = random.Random(7)
+    players = {Player(id=Player.random_id(), username=f"p{i}") for i in range(3)}
+    game_status = generate_game_status(
+        players, BoardTemplates(_level).generate_board, rng
+    )
+    random_players = [RandomPlayer(player, rng) for player in game_status.players]
+
+    statuses, turns_actions = [game_status], []
+    for _ in range(turns):
+        players_actions = [
+            random_player.choose_actions(game_status, 3)
+            for random_player in random_players
+        ]
+        game_log.record_turn(game_status, players_actions)
+        _, game_status = update_game_status(
+            game_status, players_actions, is_valid_action
+        )
+        statuses.append(game_status)
+        turns_actions.append(players_actions)
+        if game_status.winner is not None:
+            break
+    return statuses, turns_actions
+
+
+def _dump_actions(players_actions):
+    return [[action.model_dump() for action in actions] for actions in players_actions]
+
+
+def test_every_turn_is_rebuilt_from_the_nearest_snapshot(tmp_path):
+    writer = _writer(tmp_path)
+    game_log = writer.open_game_log(uuid.uuid4())
+    statuses, turns_actions = _play(game_log, turns=11)
+    game_log.close(statuses[-1])
+    writer.flush()
+
+    with GameLogReader(game_log.path) as reader:
+        assert reader.closed
+        assert reader.first_turn == statuses[0].turn_number
+        assert reader.last_turn == statuses[-1].turn_number
+        for game_status in statuses:
+            turn = game_status.turn_number
+            assert reader.game_status(turn).model_dump() == game_status.model_dump()
+        for game_status, players_actions in zip(statuses, turns_actions):
+            assert _dump_actions(
+                reader.players_actions(game_status.turn_number)
+            ) == _dump_actions(players_actions)
+        assert reader.players_actions(reader.last_turn) == []
+        with pytest.raises(IndexError):
+            reader.game_status(reader.last_turn + 1)
+
+
+def test_unfinished_log_is_indexed_by_scanning(tmp_path):
+    writer = _writer(tmp_path)
+    game_log = writer.open_game_log(uuid.uuid4())
+    statuses, _ = _play(game_log, turns=6)
+    writer.flush()
+    # a record cut short by a crash
+    with open(game_log.path, "ab") as f:
+        f.write(b"\x02\x07\x00")
+
+    with GameLogReader(game_log.path) as reader:
+        assert not reader.closed
+        # the actions of the last recorded turn are there, not its outcome
+        assert reader.last_turn == statuses[-2].turn_number
+        assert (
+            reader.game_status(reader.last_turn).model_dump()
+            == statuses[-2].model_dump()
+        )
+
+
+def test_logs_are_named_after_their_game(tmp_path):
+    writer = _writer(tmp_path)
+    game_id = uuid.uuid4()
+
+    game_log = writer.open_game_log(game_id)
+
+    assert game_log.path == tmp_path / f"{game_id.hex}.hexlog"
+
+
+def test_failed_record_abandons_only_its_log(tmp_path):
+    writer = _writer(tmp_path)
+    broken_log = writer.open_game_log(uuid.uuid4())
+    game_log = writer.open_game_log(uuid.uuid4())
+    statuses, _ = _play(game_log, turns=3)
+    # not an I/O error
+    broken_log.record_turn(None, [])
+    game_log.close(statuses[-1])
+    writer.flush()
+
+    with GameLogReader(game_log.path) as reader:
+        assert reader.closed
+        assert reader.last_turn == statuses[-1].turn_number
+
+
+def test_log_is_left_unfinished_when_the_queue_is_full(tmp_path):
+    writer = GameLogWriter(
+        GameLogConfig(game_log_folder=str(tmp_path), game_log_queue_size=1)
+    )
+    game_log = writer.open_game_log(uuid.uuid4())
+    busy_log = writer.open_game_log(uuid.uuid4())
+    started, release = Event(), Event()
+
+    def block():
+        started.set()
+        release.wait()
+
+    # the writer thread is busy, a single record fits in the queue
+    writer.submit(busy_log._log_file, block)
+    started.wait(timeout=1)
+    statuses, _ = _play(game_log, turns=3)
+    release.set()
+    game_log.close(statuses[-1])
+    writer.flush()
+
+    with GameLogReader(game_log.path) as reader:
+        assert not reader.closed
+        assert reader.last_turn == statuses[0].turn_number
+
+
+def test_shutdown_closes_the_logs_of_running_games(tmp_path):
+    writer = _writer(tmp_path)
+    game_log = writer.open_game_log(uuid.uuid4())
+    statuses, _ = _play(game_log, turns=3)
+
+    writer.shutdown()
+
+    with GameLogReader(game_log.path) as reader:
+        assert not reader.closed
+        assert reader.last_turn == statuses[-2].turn_number
+
+
+def test_headless_games_are_logged(tmp_path):
+    writer = _writer(tmp_path)
+    runner = HeadlessRunner(default_setup("src/resources/"), writer)
+    result = runner.play_game(random_players_factory(3, seed=3)(0))
+    writer.flush()
+
+    (path,) = tmp_path.iterdir()
+    with GameLogReader(path) as reader:
+        final_status = reader.game_status(reader.last_turn)
+        assert final_status.players[final_status.winner] == result.winner
+        assert final_status.turn_number == result.turns + 1
+
+
+def test_other_files_are_refused(tmp_path):
+    path = tmp_path / "traces.jsonl"
+    path.write_text("{}\n" * 10)
+
+    with pytest.raises(ValueError):
+        GameLogReader(path)
@@ -0,0 +1,41 @@
+import math
+
+import pytest
+
+from loadtest.swarm import SwarmStats, _percentiles, _report
+
+
+def test_percentiles_of_few_samples():
+    assert all(math.isnan(value) for value in _percentiles([]))
+    assert _percentiles([0.2]) == (0.2, 0.2)
+
+
+def test_percentiles_interpolate_between_samples():
+    p50, p99 = _percentiles([float(value) for value in range(1, 101)])
+
+    assert p50 == pytest.approx(50.5)
+    assert p99 == pytest.approx(99.01)
+
+
+def test_report_counts_the_broadcasts_received_before_the_cutoff():
+    game = ("a", "b", "c")
+    stats = SwarmStats(game_sizes={game: 3}, messages=50)
+    # every player got the first broadcast, one missed the second
+    stats.broadcast_arrivals[(game, 0, "game_status_update", 0)] += [1.0, 1.1, 1.3]
+    stats.broadcast_arrivals[(game, 0, "planning_phase_time_update", 1)] += [
+        2.0,
+        2.2,
+    ]
+    # still in flight when the run stopped
+    stats.broadcast_arrivals[(game, 1, "game_status_update", 2)] += [9.5]
+    stats.action_ack += [0.01, 0.03]
+
+    report = _report(stats, clients=3, elapsed=10.0, cutoff=9.0)
+
+    assert report["games_started"] == 1
+    assert report["messages_per_second"] == 5.0
+    assert report["broadcasts_delivered"] == 5
+    assert report["broadcasts_dropped"] == 1
+    assert report["broadcast_skew_p50_ms"] == pytest.approx(250)
+    assert report["action_ack_p50_ms"] == pytest.approx(20)
+    assert math.isnan(report["join_to_game_start_p50_ms"])
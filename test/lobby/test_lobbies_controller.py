@@ -0,0 +1,234 @@
+from concurrent.futures import ThreadPoolExecutor
+from threading import Event
+
+from lobby.lobbies_controller import LobbiesController
+from lobby.lobby_config import lobby_config
+from metrics.admission_config import AdmissionConfig
+from metrics.admission_controller import AdmissionController
+from metrics.runtime_monitor import RuntimeMonitor
+from player.player import Player
+from session.session import Session
+
+
+class _FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+class _RecordingSession(Session):
+    def __init__(self, players: set[Player], started: list[set[Player]]):
+        self._players = players
+        self._started = started
+
+    def start(self):
+        self._started.append(self._players)
+
+    def send_private_update(self, player_id, update):
+        pass
+
+    def send_broadcast_update(self, update, player_views=None):
+        pass
+
+    def game_is_over(self):
+        pass
+
+
+def _new_controller() -> tuple[LobbiesController, _FakeClock, list[set[Player]]]:
+    clock = _FakeClock()
+    started: list[set[Player]] = []
+    controller = LobbiesController(
+        lambda players: _RecordingSession(players, started),
+        clock,
+        ThreadPoolExecutor(max_workers=1),
+    )
+    return controller, clock, started
+
+
+def _new_player(username: str) -> Player:
+    return Player(id=Player.random_id(), username=username)
+
+
+def _wait(controller: LobbiesController):
+    controller._executor.submit(lambda: None).result()
+    controller._session_executor.submit(lambda: None).result()
+
+
+def test_game_starts_when_lobby_is_full():
+    controller, _, started = _new_controller()
+    players = [_new_player(f"player{i}") for i in range(3)]
+
+    for player in players:
+        controller.add_player_in_lobby(3, player)
+    _wait(controller)
+
+    assert started == [set(players)]
+    assert controller.queue_depths()[3] == 0
+
+
+def test_removed_player_does_not_join_game():
+    controller, _, started = _new_controller()
+    leaving, *staying = [_new_player(f"player{i}") for i in range(4)]
+
+    controller.add_player_in_lobby(3, leaving)
+    controller.remove_player_from_lobby(leaving.id)
+    for player in staying:
+        controller.add_player_in_lobby(3, player)
+    _wait(controller)
+
+    assert started == [set(staying)]
+
+
+def test_waiting_players_fill_any_size_after_flexible_wait():
+    controller, clock, started = _new_controller()
+    players = [_new_player(f"player{i}") for i in range(3)]
+
+    for lobby_size, player in zip((4, 5, 8), players):
+        controller.add_player_in_lobby(lobby_size, player)
+    _wait(controller)
+    assert started == []
+
+    clock.now = lobby_config.flexible_matchmaking_wait
+    controller._executor.submit(controller._flexible_check_tick).result()
+    _wait(controller)
+
+    assert started == [set(players)]
+    assert sum(controller.queue_depths().values()) == 0
+
+
+def test_flexible_game_prefers_biggest_size():
+    controller, clock, started = _new_controller()
+    waiting = [_new_player(f"player{i}") for i in range(4)]
+    exact = _new_player("exact")
+
+    for player in waiting:
+        controller.add_player_in_lobby(8, player)
+    _wait(controller)
+    clock.now = lobby_config.flexible_matchmaking_wait
+    controller.add_player_in_lobby(5, exact)
+    _wait(controller)
+    controller._executor.submit(controller._flexible_check_tick).result()
+    _wait(controller)
+
+    assert started == [set(waiting) | {exact}]
+
+
+def test_slow_game_creation_does_not_block_the_lobby():
+    release = Event()
+    started: list[set[Player]] = []
+
+    def _slow_session_factory(players: set[Player]) -> Session:
+        release.wait(timeout=10)
+        return _RecordingSession(players, started)
+
+    controller = LobbiesController(
+        _slow_session_factory, _FakeClock(), ThreadPoolExecutor(max_workers=1)
+    )
+    first_game = [_new_player(f"player{i}") for i in range(3)]
+    leaving, staying = _new_player("leaving"), _new_player("staying")
+
+    for player in first_game:
+        controller.add_player_in_lobby(3, player)
+    controller.add_player_in_lobby(4, leaving)
+    controller.add_player_in_lobby(4, staying)
+    controller.remove_player_from_lobby(leaving.id)
+    controller._executor.submit(lambda: None).result()
+
+    # the lobby went on while the first game is still being created
+    assert started == []
+    assert controller.queue_depths()[3] == 0
+    assert controller.queue_depths()[4] == 1
+
+    release.set()
+    _wait(controller)
+    assert started == [set(first_game)]
+
+
+def test_failed_game_creation_does_not_stop_the_next_games(caplog):
+    started: list[set[Player]] = []
+    failures = [RuntimeError("no level")]
+
+    def _failing_session_factory(players: set[Player]) -> Session:
+        if failures:
+            raise failures.pop()
+        return _RecordingSession(players, started)
+
+    controller = LobbiesController(
+        _failing_session_factory, _FakeClock(), ThreadPoolExecutor(max_workers=1)
+    )
+    first_game = [_new_player(f"first{i}") for i in range(3)]
+    second_game = [_new_player(f"second{i}") for i in range(3)]
+
+    for player in first_game:
+        controller.add_player_in_lobby(3, player)
+    _wait(controller)
+    for player in second_game:
+        controller.add_player_in_lobby(3, player)
+    _wait(controller)
+
+    assert started == [set(second_game)]
+    assert "Cannot create the game of" in caplog.text
+    assert controller._starting_games == 0
+
+
+def test_full_lobby_waits_for_the_admission_of_its_game():
+    is_overloaded = True
+    started: list[set[Player]] = []
+    controller = LobbiesController(
+        lambda players: _RecordingSession(players, started),
+        _FakeClock(),
+        ThreadPoolExecutor(max_workers=1),
+        admit_game_start=lambda starting_games: not is_overloaded,
+    )
+    players = [_new_player(f"player{i}") for i in range(3)]
+
+    for player in players:
+        controller.add_player_in_lobby(3, player)
+    _wait(controller)
+    assert started == []
+    assert controller.queue_depths()[3] == 3
+
+    is_overloaded = False
+    controller._executor.submit(controller._flexible_check_tick).result()
+    _wait(controller)
+
+    assert started == [set(players)]
+    assert controller.queue_depths()[3] == 0
+
+
+def test_burst_of_full_lobbies_stops_at_the_max_active_games():
+    release = Event()
+    started: list[set[Player]] = []
+
+    def _slow_session_factory(players: set[Player]) -> Session:
+        release.wait(timeout=10)
+        return _RecordingSession(players, started)
+
+    admission_controller = AdmissionController(
+        lambda: len(started),
+        AdmissionConfig(admission_max_active_games=2),
+        RuntimeMonitor(),
+    )
+    controller = LobbiesController(
+        _slow_session_factory,
+        _FakeClock(),
+        ThreadPoolExecutor(max_workers=4),
+        admit_game_start=admission_controller.admit_game_start,
+    )
+    players = [_new_player(f"player{i}") for i in range(12)]
+
+    for player in players:
+        controller.add_player_in_lobby(3, player)
+    controller._executor.submit(lambda: None).result()
+    # none is running yet, the games being created count
+    assert controller.queue_depths()[3] == 6
+
+    release.set()
+    _wait(controller)
+    controller._executor.submit(controller._flexible_check_tick).result()
+    _wait(controller)
+
+    assert len(started) == 2
+    assert controller.queue_depths()[3] == 6
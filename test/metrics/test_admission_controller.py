@@ -0,0 +1,62 @@
+from metrics.admission_config import AdmissionConfig
+from metrics.admission_controller import AdmissionController
+from metrics.runtime_monitor import RuntimeMonitor, RuntimeSample
+
+
+def _admission_controller(active_games: list[int]) -> AdmissionController:
+    return AdmissionController(
+        lambda: active_games[0],
+        AdmissionConfig(
+            admission_max_event_loop_lag=0.1,
+            admission_max_executor_queue=100,
+            admission_max_active_games=10,
+            admission_recovery_ratio=0.5,
+        ),
+        RuntimeMonitor(),
+    )
+
+
+def _sample(lag: float = 0.0, queue_depth: int = 0) -> RuntimeSample:
+    return RuntimeSample({"main": lag}, {"game_controller": queue_depth})
+
+
+def test_lagging_event_loop_refuses_new_players_until_it_recovers():
+    admission_controller = _admission_controller([0])
+
+    admission_controller.update(_sample(lag=0.2))
+    assert not admission_controller.admit_connection()
+    assert not admission_controller.admit_game_start()
+
+    # under the threshold but not under its recovery share yet
+    admission_controller.update(_sample(lag=0.08))
+    assert admission_controller.is_overloaded
+
+    admission_controller.update(_sample(lag=0.01))
+    assert admission_controller.admit_connection()
+    assert admission_controller.admit_game_start()
+
+
+def test_queued_tasks_refuse_new_players():
+    admission_controller = _admission_controller([0])
+
+    admission_controller.update(_sample(queue_depth=150))
+
+    assert admission_controller.is_overloaded
+    assert not admission_controller.admit_connection()
+
+
+def test_game_starts_wait_under_the_max_active_games():
+    active_games = [9]
+    admission_controller = _admission_controller(active_games)
+    admission_controller.update(_sample())
+
+    assert admission_controller.admit_game_start()
+    # started, their session still being created
+    assert not admission_controller.admit_game_start(starting_games=1)
+    # started since the last sample
+    active_games[0] = 10
+    assert not admission_controller.admit_game_start()
+    assert admission_controller.admit_connection()
+
+    admission_controller.update(_sample())
+    assert not admission_controller.admit_connection()
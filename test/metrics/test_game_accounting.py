@@ -0,0 +1,121 @@
+import uuid
+
+import pytest
+
+from controller.action_point_calculator import action_points_cost
+from controller.game_controller_setup import GameControllerSetup
+from game_log.game_log_config import GameLogConfig
+from game_log.game_log_reader import GameLogReader
+from game_log.game_log_writer import GameLogWriter
+from metrics.accounting_config import AccountingConfig
+from metrics.game_accounting import GameAccounting, retained_bytes
+from model.board.board_factory import BoardTemplates
+from model.board.hexagon_coordinates import HexagonCoordinates
+from model.game_model.game_status.game_status_factory import generate_game_status
+from model.game_model.game_status.game_status_updater import update_game_status
+from model.game_model.player_action_validator import is_valid_action
+from simulation.headless_runner import HeadlessRunner, random_players_factory
+
+
+def _level(_: int) -> set[HexagonCoordinates]:
+    return {
+        HexagonCoordinates(q=q, r=r)
+        for q in range(-3, 4)
+        for r in range(-3, 4)
+        if abs(q + r) <= 3
+    }
+
+
+def _setup() -> GameControllerSetup:
+    board_templates = BoardTemplates(_level)
+    return GameControllerSetup(
+        update_game_status,
+        is_valid_action,
+        action_points_cost,
+        lambda players, rng: generate_game_status(
+            players, board_templates.generate_board, rng
+        ),
+    )
+
+
+def test_shared_objects_are_counted_once():
+    shared = HexagonCoordinates(q=1, r=2)
+    seen: set[int] = set()
+
+    first = retained_bytes([shared, shared], seen)
+    alone = retained_bytes(shared, set())
+
+    assert first > alone > 0
+    assert retained_bytes(shared, seen) == 0
+
+
+def test_finished_games_report_their_cpu_time_and_memory():
+    game_accounting = GameAccounting(AccountingConfig(game_memory_sample_interval=1))
+    runner = HeadlessRunner(_setup(), game_accounting=game_accounting)
+
+    results = [
+        runner.play_game(random_players_factory(3, seed=1)(game), game)
+        for game in range(2)
+    ]
+    report = game_accounting.report()
+
+    assert report["running"] == []
+    assert len(report["finished"]) == 2
+    assert sorted(account["turns"] for account in report["finished"]) == sorted(
+        result.turns for result in results
+    )
+    for account in report["finished"]:
+        assert account["cpu_seconds"] >= account["resolution_cpu_seconds"] > 0
+        assert account["tasks"] > account["turns"]
+        assert set(account["retained_bytes"]) == {
+            "game_status",
+            "action_ledgers",
+            "validation_cache",
+        }
+        assert account["peak_retained_bytes"] >= sum(account["retained_bytes"].values())
+    # most expensive first
+    cpu_seconds = [account["cpu_seconds"] for account in report["finished"]]
+    assert cpu_seconds == sorted(cpu_seconds, reverse=True)
+
+
+def test_failed_request_keeps_the_game_running():
+    game_accounting = GameAccounting()
+    account = game_accounting.open_account(uuid.uuid4())
+
+    def _failing_request():
+        raise RuntimeError("request failed")
+
+    with pytest.raises(RuntimeError):
+        account.run(_failing_request)
+
+    assert game_accounting.running_games() == 1
+    assert account.tasks == 1
+
+
+def test_failed_phase_ends_the_game(tmp_path):
+    def _failing_update(*_):
+        raise RuntimeError("resolution failed")
+
+    setup = _setup()
+    game_accounting = GameAccounting()
+    game_log_writer = GameLogWriter(GameLogConfig(game_log_folder=str(tmp_path)))
+    runner = HeadlessRunner(
+        GameControllerSetup(
+            _failing_update,
+            setup.action_validator_fn,
+            setup.action_cost_fn,
+            setup.game_status_factory,
+        ),
+        game_log_writer,
+        game_accounting=game_accounting,
+    )
+
+    result = runner.play_game(random_players_factory(3, seed=1)(0))
+    game_log_writer.flush()
+
+    assert result.winner is None
+    assert game_accounting.running_games() == 0
+    assert len(game_accounting.report()["finished"]) == 1
+    (path,) = tmp_path.iterdir()
+    with GameLogReader(path) as reader:
+        assert reader.closed
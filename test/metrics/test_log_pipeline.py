@@ -0,0 +1,111 @@
+import logging
+import threading
+
+from metrics.log_pipeline import _MAX_TRACKED_CLASSES, LogPipeline, SamplingFilter
+from metrics.logging_config import LoggingConfig
+
+
+class _FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+class _RecordingHandler(logging.Handler):
+    def __init__(self):
+        super().__init__()
+        self.records: list[tuple[str, str]] = []
+
+    def emit(self, record: logging.LogRecord):
+        self.records.append((self.format(record), threading.current_thread().name))
+
+
+def _record(msg: str, level: int = logging.INFO) -> logging.LogRecord:
+    return logging.LogRecord("test", level, __file__, 0, msg, ("id",), None)
+
+
+def test_message_classes_are_rate_limited_separately():
+    clock = _FakeClock()
+    sampling_filter = SamplingFilter({}, rate_limit=1, burst=2, clock=clock)
+
+    kept = [sampling_filter.filter(_record("Player %s left")) for _ in range(3)]
+    assert kept == [True, True, False]
+    assert sampling_filter.filter(_record("Player %s joined"))
+
+    clock.now = 1.0
+    assert sampling_filter.filter(_record("Player %s left"))
+    assert not sampling_filter.filter(_record("Player %s left"))
+
+
+def test_many_message_classes_keep_the_busy_buckets():
+    clock = _FakeClock()
+    sampling_filter = SamplingFilter({}, rate_limit=1, burst=1, clock=clock)
+
+    assert sampling_filter.filter(_record("Player %s left"))
+    for index in range(2 * _MAX_TRACKED_CLASSES):
+        assert sampling_filter.filter(_record(f"Player {index} joined"))
+        # the busy template stays out of the least recently logged ones
+        assert not sampling_filter.filter(_record("Player %s left"))
+
+
+def test_rate_limit_keeps_warnings():
+    sampling_filter = SamplingFilter({}, rate_limit=1, burst=1, clock=_FakeClock())
+
+    assert sampling_filter.filter(_record("Player %s left"))
+    assert not sampling_filter.filter(_record("Player %s left"))
+    assert sampling_filter.filter(_record("Player %s left", logging.WARNING))
+    assert sampling_filter.filter(_record("Player %s left", logging.ERROR))
+
+
+def test_sampling_keeps_warnings():
+    sampling_filter = SamplingFilter({"Player %s left": 0.0}, rate_limit=0, burst=1)
+
+    assert not sampling_filter.filter(_record("Player %s left"))
+    assert sampling_filter.filter(_record("Player %s left", logging.WARNING))
+    assert sampling_filter.filter(_record("Player %s joined"))
+
+
+def test_records_are_written_by_the_writer_thread():
+    handler = _RecordingHandler()
+    root = logging.getLogger()
+    root.addHandler(handler)
+    logger = logging.getLogger("test_log_pipeline")
+    logger.setLevel(logging.INFO)
+    pipeline = LogPipeline(LoggingConfig(log_sample_rates={}))
+    arguments = ["first"]
+
+    pipeline.start()
+    try:
+        assert handler not in root.handlers
+        logger.info("Player %s connected", arguments)
+        # merged when logged, not when written
+        arguments[0] = "changed"
+    finally:
+        pipeline.stop()
+        root.removeHandler(handler)
+
+    [(message, thread_name)] = handler.records
+    assert message == "Player ['first'] connected"
+    assert thread_name != threading.current_thread().name
+
+
+def test_malformed_record_is_reported_not_raised(monkeypatch):
+    errors = []
+    pipeline = LogPipeline(LoggingConfig(log_sample_rates={}))
+    logger = logging.getLogger("test_log_pipeline_malformed")
+    logger.setLevel(logging.INFO)
+
+    pipeline.start()
+    try:
+        monkeypatch.setattr(
+            pipeline._handler, "handleError", lambda record: errors.append(record)
+        )
+        # more arguments than placeholders
+        logger.info("Player %s connected", "first", "second")  # noqa: PLE1205
+    finally:
+        pipeline.stop()
+
+    [record] = errors
+    assert record.msg == "Player %s connected"
@@ -0,0 +1,40 @@
+from metrics.metrics import MetricsRegistry
+
+
+def test_exposition_of_counters_and_gauges():
+    registry = MetricsRegistry()
+    requests = registry.counter("requests_total", "Requests.", ("result",))
+    requests.labels("hit").inc(3)
+    queue = [1, 2]
+    registry.gauge("queue_depth", "Queued items.").set_function(lambda: len(queue))
+
+    assert registry.exposition().splitlines() == [
+        "# HELP requests_total Requests.",
+        "# TYPE requests_total counter",
+        'requests_total{result="hit"} 3.0',
+        "# HELP queue_depth Queued items.",
+        "# TYPE queue_depth gauge",
+        "queue_depth 2.0",
+    ]
+
+
+def test_exposition_of_histograms():
+    registry = MetricsRegistry()
+    histogram = registry.histogram("phase_seconds", "Phases.", ("phase",), (0.1, 1.0))
+    histogram.labels("update").observe(0.05)
+    histogram.labels("update").observe(2.0)
+
+    assert registry.exposition().splitlines()[2:] == [
+        'phase_seconds_bucket{phase="update",le="0.1"} 1',
+        'phase_seconds_bucket{phase="update",le="1.0"} 1',
+        'phase_seconds_bucket{phase="update",le="+Inf"} 2',
+        'phase_seconds_sum{phase="update"} 2.05',
+        'phase_seconds_count{phase="update"} 2',
+    ]
+
+
+def test_exposition_escapes_label_values():
+    registry = MetricsRegistry()
+    registry.counter("errors_total", "Errors.", ("message",)).labels('a "b"\n').inc()
+
+    assert 'errors_total{message="a \\"b\\"\\n"} 1.0' in registry.exposition()
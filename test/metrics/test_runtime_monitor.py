@@ -0,0 +1,85 @@
+import asyncio
+import logging
+import time
+from threading import Event, Thread
+
+from metrics.metrics import metrics_registry
+from metrics.monitor_config import MonitorConfig
+from metrics.runtime_monitor import MonitoredThreadPoolExecutor, RuntimeMonitor
+
+
+def _monitor() -> RuntimeMonitor:
+    return RuntimeMonitor(
+        MonitorConfig(
+            event_loop_lag_warning=0.05,
+            executor_wait_warning=0.05,
+            executor_queue_warning=10,
+        )
+    )
+
+
+def _saturated(resource: str) -> float:
+    return metrics_registry.get("runtime_saturated").labels(resource).value
+
+
+def test_blocked_executor_is_reported_until_it_recovers(caplog):
+    monitor = _monitor()
+    executor = MonitoredThreadPoolExecutor("test_blocked", 1, monitor)
+    release = Event()
+    executor.submit(release.wait)
+    queued = executor.submit(lambda: None)
+
+    time.sleep(0.06)
+    with caplog.at_level(logging.WARNING):
+        monitor.check()
+
+    assert executor.queue_depth() == 1
+    assert executor.oldest_task_wait() >= 0.05
+    assert _saturated("executor:test_blocked") == 1
+    assert "executor:test_blocked is saturated" in caplog.text
+
+    release.set()
+    queued.result(timeout=1)
+    monitor.check()
+
+    assert executor.queue_depth() == 0
+    assert _saturated("executor:test_blocked") == 0
+    executor.shutdown()
+
+
+def test_cancelled_tasks_leave_the_queue():
+    executor = MonitoredThreadPoolExecutor("test_cancelled", 1, _monitor())
+    release = Event()
+    executor.submit(release.wait)
+    queued = executor.submit(lambda: None)
+
+    assert queued.cancel()
+    assert executor.queue_depth() == 0
+    executor.submit(lambda: None)
+    executor.shutdown(wait=False, cancel_futures=True)
+    release.set()
+
+    assert executor.queue_depth() == 0
+    assert executor.oldest_task_wait() == 0.0
+
+
+def test_busy_event_loop_is_reported(caplog):
+    monitor = _monitor()
+    loop = asyncio.new_event_loop()
+    thread = Thread(target=loop.run_forever, daemon=True)
+    thread.start()
+    monitor.watch_event_loop("test_loop", loop)
+
+    # the first check sends a probe, the loop is blocked before running it
+    loop.call_soon_threadsafe(time.sleep, 0.1)
+    monitor.check()
+    time.sleep(0.06)
+    with caplog.at_level(logging.WARNING):
+        monitor.check()
+
+    assert _saturated("event_loop:test_loop") == 1
+    assert "event_loop:test_loop is saturated" in caplog.text
+
+    loop.call_soon_threadsafe(loop.stop)
+    thread.join(timeout=1)
+    loop.close()
@@ -0,0 +1,165 @@
+import json
+
+from controller.action_point_calculator import action_points_cost
+from controller.game_controller import GameController
+from controller.game_controller_setup import GameControllerSetup
+from controller.game_update import ApprovedActionUpdate
+from metrics.metrics import metrics_registry
+from metrics.tracing import Tracer
+from metrics.tracing_config import TracingConfig
+from model.board.board_factory import BoardTemplates
+from model.board.hexagon_coordinates import HexagonCoordinates
+from model.game_model.game_status.game_status_factory import generate_game_status
+from model.game_model.game_status.game_status_updater import update_game_status
+from model.game_model.legal_actions import legal_actions
+from model.game_model.player_action_validator import is_valid_action
+from player.player import Player
+from session.game_session import GameSession
+from session.session import Session
+from simulation.manual_executor import ManualExecutor
+from simulation.virtual_clock import VirtualClock
+
+
+class _RecordingSession(Session):
+    def __init__(self):
+        self.private_updates = []
+
+    def start(self):
+        pass
+
+    def send_private_update(self, player_id, update, trace=None):
+        self.private_updates.append((update, trace))
+
+    def send_broadcast_update(self, update, player_views=None):
+        pass
+
+    def game_is_over(self):
+        pass
+
+
+def _level(_: int) -> set[HexagonCoordinates]:
+    return {
+        HexagonCoordinates(q=q, r=r)
+        for q in range(-3, 4)
+        for r in range(-3, 4)
+        if abs(q + r) <= 3
+    }
+
+
+def test_sampled_traces_are_dumped_with_their_hops(tmp_path):
+    dump_path = tmp_path / "traces.jsonl"
+    tracer = Tracer(
+        TracingConfig(trace_sample_rate=1.0, trace_dump_path=str(dump_path))
+    )
+
+    trace = tracer.start_trace("test_request")
+    trace.mark("queue")
+    trace.mark("send")
+    trace.finish("approved")
+    # answered twice, recorded once
+    trace.finish("approved")
+    tracer.flush()
+
+    [dump] = [json.loads(line) for line in dump_path.read_text().splitlines()]
+    assert dump["name"] == "test_request"
+    assert dump["outcome"] == "approved"
+    assert [hop["hop"] for hop in dump["hops"]] == ["queue", "send"]
+    hops = metrics_registry.get("trace_hop_seconds")
+    assert hops.labels("test_request", "send").count == 1
+
+
+def test_unsampled_traces_only_feed_histograms(tmp_path):
+    dump_path = tmp_path / "traces.jsonl"
+    tracer = Tracer(
+        TracingConfig(trace_sample_rate=0.0, trace_dump_path=str(dump_path))
+    )
+
+    tracer.start_trace("unsampled_request").finish("approved")
+    tracer.flush()
+
+    assert not dump_path.exists()
+    total = metrics_registry.get("trace_total_seconds")
+    assert total.labels("unsampled_request").count == 1
+
+
+def _dumping_tracer(tmp_path) -> Tracer:
+    return Tracer(
+        TracingConfig(trace_sample_rate=1.0, trace_dump_path=str(tmp_path / "t.jsonl"))
+    )
+
+
+def _outcomes(tmp_path, tracer: Tracer) -> list[str]:
+    tracer.flush()
+    lines = (tmp_path / "t.jsonl").read_text().splitlines()
+    return [json.loads(line)["outcome"] for line in lines]
+
+
+def _controller():
+    board_templates = BoardTemplates(_level)
+    game_statuses = []
+
+    def _game_status_factory(players, rng):
+        game_statuses.append(
+            generate_game_status(players, board_templates.generate_board, rng)
+        )
+        return game_statuses[-1]
+
+    setup = GameControllerSetup(
+        update_game_status, is_valid_action, action_points_cost, _game_status_factory
+    )
+    players = {Player(id=Player.random_id(), username=f"p{i}") for i in range(3)}
+    session = _RecordingSession()
+    executor = ManualExecutor()
+    controller = GameController(setup, players, session, VirtualClock(), executor)
+    return controller, session, executor, players, game_statuses
+
+
+def test_controller_carries_the_trace_to_the_answer():
+    controller, session, executor, players, game_statuses = _controller()
+    player = next(iter(players))
+    action = legal_actions(game_statuses[0].seat_of(player), game_statuses[0])[0]
+    trace = Tracer(TracingConfig(trace_sample_rate=0.0)).start_trace("test_controller")
+
+    controller.process_player_request(player, action, trace)
+    executor.run_until_idle()
+
+    answer, answer_trace = session.private_updates[0]
+    assert isinstance(answer, ApprovedActionUpdate)
+    assert answer_trace is trace
+    assert [hop for hop, _ in trace.hops()] == ["controller_queue", "processing"]
+    # the remaining action points update that follows is not traced
+    assert session.private_updates[1][1] is None
+
+
+def test_unanswered_requests_finish_their_trace(tmp_path):
+    controller, _, executor, players, _ = _controller()
+    tracer = _dumping_tracer(tmp_path)
+    stranger = Player(id=Player.random_id(), username="stranger")
+
+    controller.clear_player_actions(stranger, tracer.start_trace("test_unanswered"))
+    controller.cancel_player_action(
+        next(iter(players)), 404, tracer.start_trace("test_unanswered")
+    )
+    executor.run_until_idle()
+
+    assert _outcomes(tmp_path, tracer) == ["not_a_player", "nothing_cancelled"]
+
+
+def test_invalid_requests_finish_their_trace(tmp_path):
+    class _IdleController:
+        def start(self):
+            pass
+
+    player = Player(id=Player.random_id(), username="p0")
+    session = GameSession({player}, lambda players, session: _IdleController())
+    session.start()
+    tracer = _dumping_tracer(tmp_path)
+
+    session._on_player_request(
+        player,
+        {"request_type": "no_such_request"},
+        tracer.start_trace("test_invalid"),
+    )
+    session.game_is_over()
+
+    assert _outcomes(tmp_path, tracer) == ["invalid_request"]
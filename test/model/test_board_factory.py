@@ -0,0 +1,100 @@
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from model.board.board_factory import BoardTemplate, BoardTemplates
+from model.board.hexagon_coordinates import HexagonCoordinates
+from model.board.level import Level
+from model.troops import HomeBaseTroop
+
+
+def _level(n_players: int) -> set[HexagonCoordinates]:
+    radius = n_players
+    return {
+        HexagonCoordinates(q=q, r=r)
+        for q in range(-radius, radius + 1)
+        for r in range(-radius, radius + 1)
+        if abs(q + r) <= radius
+    }
+
+
+def _owners(board) -> set[int]:
+    return {
+        troop.owner
+        for troop in board.coordinates_to_occupation.values()
+        if troop is not None
+    }
+
+
+def test_template_places_one_home_base_per_seat():
+    templates = BoardTemplates(_level, (3,))
+
+    board = templates.generate_board(3)
+
+    home_bases = [
+        troop
+        for troop in board.coordinates_to_occupation.values()
+        if isinstance(troop, HomeBaseTroop)
+    ]
+    assert sorted(home_base.owner for home_base in home_bases) == [0, 1, 2]
+    assert set(board.coordinates_to_occupation) == _level(3)
+
+
+def test_template_boards_are_independent():
+    templates = BoardTemplates(_level)
+
+    first_board = templates.generate_board(4)
+    second_board = templates.generate_board(4)
+
+    assert first_board.coordinates_to_occupation is not (
+        second_board.coordinates_to_occupation
+    )
+    assert _owners(first_board) == _owners(second_board) == {0, 1, 2, 3}
+
+
+def test_concurrent_first_games_build_the_template_once():
+    generated = []
+
+    def _slow_level(n_players: int) -> set[HexagonCoordinates]:
+        generated.append(n_players)
+        time.sleep(0.05)
+        return _level(n_players)
+
+    templates = BoardTemplates(_slow_level)
+    with ThreadPoolExecutor(4) as executor:
+        boards = list(executor.map(templates.generate_board, [3] * 4))
+
+    assert generated == [3]
+    assert all(_owners(board) == {0, 1, 2} for board in boards)
+
+
+def test_concurrent_first_games_of_each_size_build_their_own_template():
+    generated = []
+
+    def _slow_level(n_players: int) -> set[HexagonCoordinates]:
+        generated.append(n_players)
+        time.sleep(0.02)
+        return _level(n_players)
+
+    templates = BoardTemplates(_slow_level, (2,))
+    sizes = [2, 3, 4] * 4
+    with ThreadPoolExecutor(6) as executor:
+        boards = list(executor.map(templates.generate_board, sizes))
+
+    # the size built up front is not built again
+    assert sorted(generated) == [2, 3, 4]
+    assert [_owners(board) for board in boards] == [
+        set(range(n_players)) for n_players in sizes
+    ]
+
+
+def test_template_keeps_the_home_bases_and_core_of_the_level():
+    home_bases = (HexagonCoordinates(q=1, r=0), HexagonCoordinates(q=-1, r=1))
+    core = HexagonCoordinates(q=0, r=1)
+    level = Level(frozenset(_level(2)), home_bases, core)
+
+    board = BoardTemplate(level).new_board()
+
+    assert board.core_coordinates == core
+    assert [
+        board.coordinates_to_occupation[home_base].owner for home_base in home_bases
+    ] == [0, 1]
@@ -0,0 +1,15 @@
+from model.game_model.core_control_score import CoreControlScore
+from model.troops import SquareTroop, TriangleTroop
+
+
+def test_core_control_accumulates_for_the_same_owner_only():
+    score = CoreControlScore.clear().score_for_troop(SquareTroop(owner=0))
+    score = score.score_for_troop(SquareTroop(owner=0))
+    assert score.n_turn_of_control == 2
+
+    # the same troop type of another player takes the control over
+    score = score.score_for_troop(SquareTroop(owner=1))
+    assert (score.troop.owner, score.n_turn_of_control) == (1, 1)
+
+    score = score.score_for_troop(TriangleTroop(owner=1))
+    assert score.n_turn_of_control == 1
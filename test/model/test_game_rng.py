@@ -0,0 +1,52 @@
+import os
+import subprocess
+import sys
+import uuid
+from pathlib import Path
+
+from model.game_model.game_rng import game_rng
+
+_SRC = Path(__file__).resolve().parents[2] / "src"
+_GAME_ID = uuid.UUID("6b1f3c6e-2f7a-4d2b-9a51-0c7d1e8f9a10")
+
+
+def _draws(rng, n: int = 5) -> list[float]:
+    return [rng.random() for _ in range(n)]
+
+
+def test_stream_is_the_same_in_another_process():
+    # str hashing is salted per process, the stream must not depend on it
+    script = (
+        "import uuid; from model.game_model.game_rng import game_rng; "
+        f"rng = game_rng(uuid.UUID('{_GAME_ID}'), root_seed=11); "
+        "print([rng.random() for _ in range(5)])"
+    )
+    completed = subprocess.run(
+        [sys.executable, "-c", script],
+        env={**os.environ, "PYTHONPATH": str(_SRC), "PYTHONHASHSEED": "123"},
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+
+    assert completed.stdout.strip() == str(_draws(game_rng(_GAME_ID, root_seed=11)))
+
+
+def test_stream_does_not_depend_on_the_other_games():
+    alone = _draws(game_rng(_GAME_ID, root_seed=11))
+
+    other = game_rng(uuid.uuid4(), root_seed=11)
+    interleaved = game_rng(_GAME_ID, root_seed=11)
+    draws = []
+    for _ in range(5):
+        other.random()
+        draws.append(interleaved.random())
+
+    assert draws == alone
+
+
+def test_streams_differ_by_game_and_root_seed():
+    stream = _draws(game_rng(_GAME_ID, root_seed=11))
+
+    assert _draws(game_rng(uuid.uuid4(), root_seed=11)) != stream
+    assert _draws(game_rng(_GAME_ID, root_seed=12)) != stream
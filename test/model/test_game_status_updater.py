@@ -0,0 +1,48 @@
+import random
+
+from model.board.board_factory import generate_board
+from model.board.hexagon_coordinates import HexagonCoordinates
+from model.game_model.game_status.game_status_factory import generate_game_status
+from model.game_model.game_status.game_status_updater import update_game_status
+from model.game_model.player_action_validator import is_valid_action
+from model.game_model.player_actions import MarchTroopAction
+from model.troops import HomeBaseTroop, SquareTroop
+from player.player import Player
+
+
+def _level(_: int) -> set[HexagonCoordinates]:
+    return {
+        HexagonCoordinates(q=q, r=r)
+        for q in range(-3, 4)
+        for r in range(-3, 4)
+        if abs(q + r) <= 3
+    }
+
+
+def test_last_player_left_wins_at_once():
+    players = {Player(id=Player.random_id(), username=f"p{i}") for i in range(2)}
+    game_status = generate_game_status(
+        players, lambda n_players: generate_board(n_players, _level), random.Random(0)
+    )
+    board = game_status.board
+    home_base = next(
+        coordinates
+        for coordinates, troop in board.coordinates_to_occupation.items()
+        if isinstance(troop, HomeBaseTroop) and troop.owner == 1
+    )
+    attacker = next(
+        neighbour
+        for neighbour in home_base.neighbours()
+        if board.coordinates_to_occupation.get(neighbour, False) is None
+    )
+    game_status = game_status.copy_with(
+        board=board.add_player_troop(SquareTroop(owner=0), attacker)
+    )
+    march = MarchTroopAction(
+        starting_coordinates=attacker, destination_coordinates=home_base
+    )
+
+    _, game_status = update_game_status(game_status, [[march], []], is_valid_action)
+
+    assert game_status.player_order.seats == [0]
+    assert game_status.winner == 0
@@ -0,0 +1,87 @@
+from itertools import pairwise
+
+import numpy as np
+
+from model.board.hex_geometry import (
+    NO_TILE,
+    LevelGeometry,
+    as_axial,
+    as_tiles,
+    distances,
+    line,
+    ring,
+    spiral,
+    to_xy,
+)
+from model.board.hexagon_coordinates import HexagonCoordinates
+from model.board.level_generator import generate_level
+
+CENTER = HexagonCoordinates(2, -1)
+
+
+def test_distances_match_the_scalar_distance():
+    tiles = as_tiles(spiral(CENTER, 4))
+    origin = HexagonCoordinates(-1, 3)
+
+    assert distances(origin, as_axial(tiles)).tolist() == [
+        origin.distance(tile) for tile in tiles
+    ]
+    assert np.allclose(to_xy(as_axial(tiles)), [tile.to_xy() for tile in tiles])
+
+
+def test_rings_and_spirals():
+    for radius in range(5):
+        assert set(distances(CENTER, ring(CENTER, radius)).tolist()) == {radius}
+        assert len(set(as_tiles(ring(CENTER, radius)))) == max(1, 6 * radius)
+
+    assert len(set(as_tiles(spiral(CENTER, 4)))) == 1 + 3 * 4 * 5
+    assert set(as_tiles(ring(CENTER, 1))) == set(CENTER.neighbours())
+
+
+def test_lines_are_contiguous():
+    end = HexagonCoordinates(-3, 5)
+
+    tiles = as_tiles(line(CENTER, end))
+
+    assert tiles[0] == CENTER and tiles[-1] == end
+    assert len(tiles) == CENTER.distance(end) + 1
+    assert all(a.is_nearby(b) for a, b in pairwise(tiles))
+
+
+def test_level_neighbours_and_reachability():
+    points = generate_level(4, radius=8, seed=1).points
+    geometry = LevelGeometry(points)
+    core = HexagonCoordinates(0, 0)
+
+    assert geometry.neighbour_table() == {
+        tile: tuple(n for n in tile.neighbours() if n in points) for tile in points
+    }
+    assert geometry.indexes(as_axial([HexagonCoordinates(99, 99)])).tolist() == [
+        NO_TILE
+    ]
+
+    steps = geometry.reachable([core], max_steps=3)
+    assert {
+        geometry.tiles[index] for index in np.flatnonzero(steps != NO_TILE)
+    } == _bfs(points, core, 3)
+
+    # the core cannot be walked into, nor through
+    passable = np.ones(geometry.n_tiles, dtype=bool)
+    passable[geometry.index[core]] = False
+    start = core.neighbours()[0]
+    steps = geometry.reachable([start], passable=passable)
+    assert steps[geometry.index[core]] == NO_TILE
+
+
+def _bfs(points, source, max_steps):
+    reached = {source}
+    frontier = {source}
+    for _ in range(max_steps):
+        frontier = {
+            neighbour
+            for tile in frontier
+            for neighbour in tile.neighbours()
+            if neighbour in points and neighbour not in reached
+        }
+        reached |= frontier
+    return reached
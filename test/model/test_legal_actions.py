@@ -0,0 +1,82 @@
+import random
+
+from model.board.board_factory import generate_board
+from model.board.hexagon_coordinates import HexagonCoordinates
+from model.game_model.game_status.game_status_factory import generate_game_status
+from model.game_model.game_status.game_status_updater import update_game_status
+from model.game_model.legal_actions import legal_actions, legal_actions_by_seat
+from model.game_model.player_action_validator import is_valid_action
+from model.game_model.player_actions import MarchTroopAction, SpawnTroopAction
+from model.troops import PentagonTroop, SquareTroop, TriangleTroop
+from player.player import Player, Seat
+
+
+def _level(_: int) -> set[HexagonCoordinates]:
+    return {
+        HexagonCoordinates(q=q, r=r)
+        for q in range(-3, 4)
+        for r in range(-3, 4)
+        if abs(q + r) <= 3
+    }
+
+
+def _new_game():
+    players = {Player(id=Player.random_id(), username=f"p{i}") for i in range(3)}
+    game_status = generate_game_status(
+        players, lambda n_players: generate_board(n_players, _level), random.Random(0)
+    )
+    return game_status, game_status.player_order.seats
+
+
+def _all_actions(seat: Seat, game_status) -> list:
+    # every action shape on the board, legal or not
+    tiles = list(game_status.board.coordinates_to_occupation)
+    actions = [
+        MarchTroopAction(starting_coordinates=start, destination_coordinates=end)
+        for start in tiles
+        for end in tiles
+    ]
+    actions.extend(
+        SpawnTroopAction(coordinates=coordinates, troop=troop_type(owner=seat))
+        for coordinates in tiles
+        for troop_type in (TriangleTroop, SquareTroop, PentagonTroop)
+    )
+    return actions
+
+
+def _keys(actions) -> set[str]:
+    return {action.model_dump_json() for action in actions}
+
+
+def _assert_matches_validator(game_status, seats):
+    for seat in seats:
+        expected = [
+            action
+            for action in _all_actions(seat, game_status)
+            if is_valid_action(seat, action, game_status)
+        ]
+        assert _keys(legal_actions(seat, game_status)) == _keys(expected)
+
+
+def test_legal_actions_match_validator_at_start():
+    game_status, seats = _new_game()
+
+    _assert_matches_validator(game_status, seats)
+
+
+def test_legal_actions_match_validator_after_turns():
+    game_status, _ = _new_game()
+
+    for _ in range(4):
+        # play the first legal actions of everyone, then check the new status
+        actions = [[] for _ in game_status.players]
+        for seat, seat_actions in legal_actions_by_seat(game_status).items():
+            actions[seat] = seat_actions[:2]
+        _, game_status = update_game_status(game_status, actions, is_valid_action)
+        _assert_matches_validator(game_status, game_status.player_order.seats)
+
+
+def test_legal_actions_by_seat_covers_every_player():
+    game_status, seats = _new_game()
+
+    assert set(legal_actions_by_seat(game_status)) == set(seats)
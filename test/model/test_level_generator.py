@@ -0,0 +1,81 @@
+import json
+
+import pytest
+
+from controller.level_loader import LevelLoader
+from model.board.board_factory import find_home_bases
+from model.board.hexagon_coordinates import HexagonCoordinates
+from model.board.level_format import read_level, write_level
+from model.board.level_generator import generate_level
+
+
+def _rotate(coordinates: HexagonCoordinates, sixths: int) -> HexagonCoordinates:
+    q, r = coordinates.q, coordinates.r
+    for _ in range(sixths):
+        q, r = -r, q + r
+    return HexagonCoordinates(q=q, r=r)
+
+
+def _reachable(level, start: HexagonCoordinates) -> set[HexagonCoordinates]:
+    reached, frontier = {start}, [start]
+    while frontier:
+        for neighbour in frontier.pop().neighbours():
+            if neighbour in level.points and neighbour not in reached:
+                reached.add(neighbour)
+                frontier.append(neighbour)
+    return reached
+
+
+@pytest.mark.parametrize("n_players", range(3, 9))
+def test_levels_have_connected_home_bases_and_core(n_players):
+    level = generate_level(n_players, seed=1)
+
+    assert len(set(level.home_bases)) == n_players
+    assert level.core in level.points
+    assert set(level.home_bases) <= _reachable(level, level.core)
+    # the boards place the home bases on the same tiles
+    assert list(level.home_bases) == find_home_bases(level.points, n_players)
+
+
+def test_levels_are_deterministic():
+    assert generate_level(5, seed=3) == generate_level(5, seed=3)
+    assert generate_level(5, seed=3).points != generate_level(5, seed=4).points
+
+
+@pytest.mark.parametrize("n_players, sixths", [(2, 3), (3, 2), (6, 1)])
+def test_levels_are_symmetric_when_the_grid_allows_it(n_players, sixths):
+    level = generate_level(n_players, radius=9, seed=2)
+
+    assert {_rotate(c, sixths) for c in level.points} == level.points
+
+
+def test_compiled_level_round_trip(tmp_path):
+    level = generate_level(8, radius=30, seed=5)
+    write_level(tmp_path / "8.hexlevel", level)
+
+    assert read_level(tmp_path / "8.hexlevel") == level
+
+
+def test_other_files_are_not_compiled_levels(tmp_path):
+    path = tmp_path / "3.hexlevel"
+    path.write_bytes(b"\x00" * 64)
+
+    with pytest.raises(ValueError):
+        read_level(path)
+
+
+def test_loader_prefers_compiled_levels_and_generates_the_missing_ones(tmp_path):
+    write_level(tmp_path / "4.hexlevel", generate_level(4, seed=9))
+    (tmp_path / "4.json").write_text(json.dumps([{"q": 0, "r": 0}]))
+    (tmp_path / "3.json").write_text(json.dumps([{"q": 0, "r": 0}, {"q": 1, "r": 0}]))
+    level_loader = LevelLoader(level_folder_path=str(tmp_path))
+
+    assert level_loader.levels_sizes() == [3, 4]
+    assert level_loader.get_level(4) == generate_level(4, seed=9)
+    json_level = level_loader.get_level(3)
+    assert json_level.points == {
+        HexagonCoordinates(q=0, r=0),
+        HexagonCoordinates(q=1, r=0),
+    }
+    assert list(json_level.home_bases) == find_home_bases(json_level.points, 3)
+    assert level_loader.get_level(7) == generate_level(7)
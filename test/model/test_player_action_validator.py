@@ -0,0 +1,59 @@
+import random
+
+from model.board.board_factory import generate_board
+from model.board.hexagon_coordinates import HexagonCoordinates
+from model.game_model.game_status.game_status import GameStatus
+from model.game_model.game_status.game_status_factory import generate_game_status
+from model.game_model.player_action_validator import is_valid_action
+from model.game_model.player_actions import MarchTroopAction
+from model.troops import SquareTroop, TriangleTroop, Troop
+from player.player import Player
+
+_CENTER = HexagonCoordinates(q=0, r=0)
+
+
+def _level(_: int) -> set[HexagonCoordinates]:
+    return {
+        HexagonCoordinates(q=q, r=r)
+        for q in range(-3, 4)
+        for r in range(-3, 4)
+        if abs(q + r) <= 3
+    }
+
+
+def _game_with(troops: dict[HexagonCoordinates, Troop]) -> GameStatus:
+    players = {Player(id=Player.random_id(), username=f"p{i}") for i in range(2)}
+    game_status = generate_game_status(
+        players, lambda n_players: generate_board(n_players, _level), random.Random(0)
+    )
+    board = game_status.board
+    for coordinates, troop in troops.items():
+        board = board.add_player_troop(troop, coordinates)
+    return game_status.copy_with(board=board)
+
+
+def _march(destination: HexagonCoordinates) -> MarchTroopAction:
+    return MarchTroopAction(
+        starting_coordinates=_CENTER, destination_coordinates=destination
+    )
+
+
+def test_march_goes_to_an_adjacent_tile():
+    game_status = _game_with({_CENTER: SquareTroop(owner=0)})
+
+    assert is_valid_action(0, _march(HexagonCoordinates(q=1, r=0)), game_status)
+    assert not is_valid_action(0, _march(HexagonCoordinates(q=2, r=0)), game_status)
+
+
+def test_march_never_targets_a_tile_of_the_player():
+    own, enemy = HexagonCoordinates(q=1, r=0), HexagonCoordinates(q=0, r=1)
+    game_status = _game_with(
+        {
+            _CENTER: SquareTroop(owner=0),
+            own: TriangleTroop(owner=0),
+            enemy: TriangleTroop(owner=1),
+        }
+    )
+
+    assert not is_valid_action(0, _march(own), game_status)
+    assert is_valid_action(0, _march(enemy), game_status)
@@ -0,0 +1,66 @@
+import json
+import random
+
+from controller.game_update import GameEventUpdate, GameOverUpdate, GameStatusUpdate
+from model.board.board_factory import BoardTemplates
+from model.board.hexagon_coordinates import HexagonCoordinates
+from model.game_model.game_event import PlayerRemovedEvent
+from model.game_model.game_status.game_status import GameStatus
+from model.game_model.game_status.game_status_factory import generate_game_status
+from player.player import Player
+from session.remote_update import encode_update
+
+
+def _level(_: int) -> set[HexagonCoordinates]:
+    return {
+        HexagonCoordinates(q=q, r=r)
+        for q in range(-3, 4)
+        for r in range(-3, 4)
+        if abs(q + r) <= 3
+    }
+
+
+def _game_status() -> GameStatus:
+    players = {Player(id=Player.random_id(), username=f"p{i}") for i in range(3)}
+    return generate_game_status(
+        players, BoardTemplates(_level).generate_board, random.Random(1)
+    )
+
+
+def _wire(update) -> dict:
+    return json.loads(encode_update(update))
+
+
+def test_troops_are_owned_by_seat_on_the_wire():
+    game_status = _game_status()
+
+    wire_status = _wire(GameStatusUpdate(game_status=game_status))["game_status"]
+
+    # a client finds its seat by its id in the players
+    seats = {player["id"]: seat for seat, player in enumerate(wire_status["players"])}
+    assert seats == {
+        str(player.id): seat for seat, player in enumerate(game_status.players)
+    }
+    home_base_owners = sorted(
+        troop["owner"]
+        for _, _, troop in wire_status["board"]["coordinates_to_occupation"]
+        if troop is not None and troop["troop_type"] == "home_base_troop"
+    )
+    assert home_base_owners == [0, 1, 2]
+    assert wire_status["player_order"] == {"seats": [0, 1, 2]}
+    assert wire_status["winner"] is None
+    assert (
+        GameStatus.model_validate(wire_status).model_dump() == game_status.model_dump()
+    )
+
+
+def test_events_name_the_seat_and_game_over_the_player():
+    game_status = _game_status()
+    winner = game_status.players[2]
+
+    removed = _wire(GameEventUpdate(event=PlayerRemovedEvent(seat=1)))
+    game_over = _wire(GameOverUpdate(winner=winner))
+
+    assert removed["event"] == {"update_type": "player_removed_event", "seat": 1}
+    # seats stay inside the game, the winner is sent as a player
+    assert game_over["winner"] == {"id": str(winner.id), "username": winner.username}
@@ -0,0 +1,236 @@
+import asyncio
+import json
+import random
+import uuid
+
+from starlette.websockets import WebSocketDisconnect
+
+from controller.game_update import (
+    GameOverUpdate,
+    GameStatusUpdate,
+    PlanningPhaseTimeUpdate,
+)
+from model.board.board_factory import generate_board
+from model.board.hexagon_coordinates import HexagonCoordinates
+from model.game_model.game_status.game_status_factory import generate_game_status
+from player.player import Player
+from session import spectator_hub
+from session.remote_update import RemoteGameUpdate
+from session.spectator_config import SpectatorConfig
+from session.spectator_hub import FrameRing, SpectatorHub
+
+
+def _level(_: int) -> set[HexagonCoordinates]:
+    return {
+        HexagonCoordinates(q=q, r=r)
+        for q in range(-3, 4)
+        for r in range(-3, 4)
+        if abs(q + r) <= 3
+    }
+
+
+def _game_status_update() -> GameStatusUpdate:
+    players = {Player(id=Player.random_id(), username=f"p{i}") for i in range(3)}
+    return GameStatusUpdate(
+        game_status=generate_game_status(
+            players,
+            lambda n_players: generate_board(n_players, _level),
+            random.Random(0),
+        )
+    )
+
+
+class _SpectatorSocket:
+    def __init__(self):
+        self.received: list[dict] = []
+        self.close_code: int | None = None
+        self.can_send = asyncio.Event()
+        self.can_send.set()
+        self._disconnected = asyncio.Event()
+
+    async def accept(self):
+        pass
+
+    async def send_text(self, text: str):
+        await self.can_send.wait()
+        self.received.append(json.loads(text))
+
+    async def receive_text(self):
+        await self._disconnected.wait()
+        raise WebSocketDisconnect()
+
+    async def close(self, code: int = 1000):
+        self.close_code = code
+
+    def disconnect(self):
+        self._disconnected.set()
+
+
+def _update_types(socket: _SpectatorSocket) -> list[str]:
+    return [update["update_type"] for update in socket.received]
+
+
+def test_ring_overwrites_and_finds_keyframes():
+    ring = FrameRing(4)
+    for seq in range(6):
+        ring.append(f"{seq}", is_keyframe=seq in (1, 4), published_at=seq)
+
+    assert ring.oldest == 2
+    assert ring.get(1) is None
+    assert ring.get(5).text == "5"
+    assert ring.latest_keyframe(published_before=10).seq == 4
+    # the keyframe of seq 1 was overwritten
+    assert ring.latest_keyframe(published_before=3) is None
+
+
+def test_spectators_share_the_stream_from_the_latest_keyframe():
+    async def _spectate():
+        hub = SpectatorHub()
+        hub.start(asyncio.get_running_loop())
+        game_id = uuid.uuid4()
+
+        def _publish(update):
+            hub.on_game_update(RemoteGameUpdate(game_id, update))
+
+        _publish(PlanningPhaseTimeUpdate(remaining_time=1))
+        _publish(_game_status_update())
+        _publish(PlanningPhaseTimeUpdate(remaining_time=2))
+
+        sockets = [_SpectatorSocket() for _ in range(3)]
+        spectators = [
+            asyncio.create_task(hub.spectate(game_id, socket)) for socket in sockets
+        ]
+        await asyncio.sleep(0.01)
+        _publish(PlanningPhaseTimeUpdate(remaining_time=3))
+        _publish(GameOverUpdate(winner=Player(id=Player.random_id(), username="w")))
+        await asyncio.wait_for(asyncio.gather(*spectators), timeout=1)
+        hub.stop()
+        return sockets, hub.game_ids()
+
+    sockets, game_ids = asyncio.run(_spectate())
+
+    for socket in sockets:
+        assert _update_types(socket) == [
+            "game_status_update",
+            "planning_phase_time_update",
+            "planning_phase_time_update",
+            "game_over_update",
+        ]
+        assert socket.close_code == 1000
+    # finished games cannot be joined
+    assert game_ids == []
+
+
+def test_slow_spectator_skips_to_the_latest_keyframe():
+    async def _spectate():
+        hub = SpectatorHub(SpectatorConfig(spectator_max_lag=0.05))
+        hub.start(asyncio.get_running_loop())
+        game_id = uuid.uuid4()
+
+        def _publish(update):
+            hub.on_game_update(RemoteGameUpdate(game_id, update))
+
+        _publish(_game_status_update())
+        socket = _SpectatorSocket()
+        socket.can_send.clear()
+        spectator = asyncio.create_task(hub.spectate(game_id, socket))
+        await asyncio.sleep(0.01)
+
+        for remaining_time in range(10):
+            _publish(PlanningPhaseTimeUpdate(remaining_time=remaining_time))
+        _publish(_game_status_update())
+        _publish(PlanningPhaseTimeUpdate(remaining_time=99))
+        await asyncio.sleep(0.1)
+        socket.can_send.set()
+        await asyncio.sleep(0.01)
+        socket.disconnect()
+        await asyncio.wait_for(spectator, timeout=1)
+        hub.stop()
+        return socket
+
+    socket = asyncio.run(_spectate())
+
+    assert _update_types(socket) == [
+        "game_status_update",
+        "game_status_update",
+        "planning_phase_time_update",
+    ]
+    assert socket.received[-1]["remaining_time"] == 99
+
+
+def test_delayed_spectator_waits_for_the_frames():
+    async def _spectate():
+        hub = SpectatorHub()
+        hub.start(asyncio.get_running_loop())
+        game_id = uuid.uuid4()
+        hub.on_game_update(RemoteGameUpdate(game_id, _game_status_update()))
+
+        socket = _SpectatorSocket()
+        spectator = asyncio.create_task(hub.spectate(game_id, socket, delay=0.2))
+        await asyncio.sleep(0.1)
+        received_early = list(socket.received)
+        await asyncio.sleep(0.2)
+        socket.disconnect()
+        await asyncio.wait_for(spectator, timeout=1)
+        hub.stop()
+        return received_early, socket
+
+    received_early, socket = asyncio.run(_spectate())
+
+    assert received_early == []
+    assert _update_types(socket) == ["game_status_update"]
+
+
+def test_frames_are_encoded_once_read(monkeypatch):
+    encoded = []
+
+    def _encode_update(update):
+        encoded.append(update)
+        return "{}"
+
+    monkeypatch.setattr(spectator_hub, "encode_update", _encode_update)
+    hub = SpectatorHub()
+    game_id = uuid.uuid4()
+    for remaining_time in range(5):
+        hub.on_game_update(
+            RemoteGameUpdate(
+                game_id, PlanningPhaseTimeUpdate(remaining_time=remaining_time)
+            )
+        )
+    # nobody watches the game
+    assert encoded == []
+
+    frame = hub.ring(game_id).get(4)
+    assert frame.text == frame.text == "{}"
+    assert len(encoded) == 1
+
+
+def test_ended_session_drops_the_stream_of_its_game():
+    async def _spectate():
+        hub = SpectatorHub()
+        hub.start(asyncio.get_running_loop())
+        game_id = uuid.uuid4()
+        hub.on_game_update(RemoteGameUpdate(game_id, _game_status_update()))
+        socket = _SpectatorSocket()
+        spectator = asyncio.create_task(hub.spectate(game_id, socket))
+        await asyncio.sleep(0.01)
+
+        # the game stopped without a game over update
+        hub.on_game_ended(game_id)
+        await asyncio.wait_for(spectator, timeout=1)
+        hub.stop()
+        return socket, hub.game_ids()
+
+    socket, game_ids = asyncio.run(_spectate())
+
+    assert _update_types(socket) == ["game_status_update"]
+    assert socket.close_code == 1000
+    assert game_ids == []
+
+
+def test_unknown_games_are_closed():
+    socket = _SpectatorSocket()
+
+    asyncio.run(SpectatorHub().spectate(uuid.uuid4(), socket))
+
+    assert socket.close_code == 4404
@@ -0,0 +1,115 @@
+import asyncio
+import json
+
+from controller.game_update import (
+    GameStatusUpdate,
+    PlanningPhaseTimeUpdate,
+    RemainingActionPointsUpdate,
+)
+from player.player import Player
+from session.remote_update import encode_update
+from session.update_stream import UpdateStream
+
+
+class _PlayerSocket:
+    def __init__(self):
+        self.received: list[dict] = []
+
+    async def send_text(self, text: str):
+        self.received.append(json.loads(text))
+
+
+def _append(stream: UpdateStream, update):
+    return stream.append(encode_update(update), isinstance(update, GameStatusUpdate))
+
+
+def _append_keyframe(stream: UpdateStream):
+    # the content of the game status does not matter here
+    return stream.append('{"update_type":"game_status_update"}', is_keyframe=True)
+
+
+def _seqs(socket: _PlayerSocket) -> list[int]:
+    return [update["seq"] for update in socket.received]
+
+
+def test_updates_are_numbered_and_sent_in_order():
+    async def _stream():
+        stream = UpdateStream(Player.random_id(), capacity=8)
+        socket = _PlayerSocket()
+        _append(stream, RemainingActionPointsUpdate(remaining_action_points=3))
+        await stream.attach(socket)
+        for remaining_time in range(3):
+            _append(stream, PlanningPhaseTimeUpdate(remaining_time=remaining_time))
+        await stream.flush()
+        return socket
+
+    socket = asyncio.run(_stream())
+
+    assert _seqs(socket) == [0, 1, 2, 3]
+    assert socket.received[0] == {
+        "seq": 0,
+        "update_type": "remaining_action_points_update",
+        "remaining_action_points": 3,
+    }
+
+
+def test_resume_sends_only_the_missed_frames():
+    async def _stream():
+        stream = UpdateStream(Player.random_id(), capacity=8)
+        first_socket = _PlayerSocket()
+        await stream.attach(first_socket)
+        for remaining_time in range(3):
+            _append(stream, PlanningPhaseTimeUpdate(remaining_time=remaining_time))
+        await stream.flush()
+
+        assert stream.detach(first_socket)
+        for remaining_time in range(3, 6):
+            _append(stream, PlanningPhaseTimeUpdate(remaining_time=remaining_time))
+        # nothing is sent without a websocket
+        await stream.flush()
+
+        second_socket = _PlayerSocket()
+        assert stream.can_replay(last_seq=1)
+        await stream.attach(second_socket, last_seq=1)
+        return first_socket, second_socket
+
+    first_socket, second_socket = asyncio.run(_stream())
+
+    assert _seqs(first_socket) == [0, 1, 2]
+    assert _seqs(second_socket) == [2, 3, 4, 5]
+
+
+def test_resume_after_a_large_gap_starts_from_the_latest_keyframe():
+    async def _stream():
+        stream = UpdateStream(Player.random_id(), capacity=4)
+        _append_keyframe(stream)
+        for remaining_time in range(3):
+            _append(stream, PlanningPhaseTimeUpdate(remaining_time=remaining_time))
+        keyframe = _append_keyframe(stream)
+        for remaining_time in range(5):
+            _append(stream, PlanningPhaseTimeUpdate(remaining_time=remaining_time))
+
+        socket = _PlayerSocket()
+        assert not stream.can_replay(last_seq=0)
+        await stream.attach(socket, last_seq=0)
+        return keyframe, socket
+
+    keyframe, socket = asyncio.run(_stream())
+
+    # the keyframe was overwritten in the ring, it is sent all the same
+    assert _seqs(socket) == [keyframe.seq, 6, 7, 8, 9]
+    assert socket.received[0]["update_type"] == "game_status_update"
+
+
+def test_a_replaced_websocket_does_not_detach_the_stream():
+    async def _stream():
+        stream = UpdateStream(Player.random_id(), capacity=4)
+        old_socket, new_socket = _PlayerSocket(), _PlayerSocket()
+        await stream.attach(old_socket)
+        await stream.attach(new_socket, last_seq=-1)
+        return stream, old_socket, new_socket
+
+    stream, old_socket, new_socket = asyncio.run(_stream())
+
+    assert not stream.detach(old_socket)
+    assert stream.websocket is new_socket
@@ -0,0 +1,73 @@
+import numpy as np
+
+from model.board.board_factory import BoardTemplates
+from model.board.hexagon_coordinates import HexagonCoordinates
+from model.game_model.game_config import game_config
+from model.game_model.game_rng import game_rng
+from model.game_model.game_status.game_status_factory import generate_game_status
+from model.game_model.game_status.game_status_updater import update_game_status
+from model.game_model.player_action_validator import is_valid_action
+from player.player import Player
+from simulation.batch_simulator import BatchLevel, BatchSimulator, run_batch
+
+
+def _level(_: int) -> set[HexagonCoordinates]:
+    return {
+        HexagonCoordinates(q=q, r=r)
+        for q in range(-3, 4)
+        for r in range(-3, 4)
+        if abs(q + r) <= 3
+    }
+
+
+def _comparable(game_status) -> dict:
+    dump = game_status.model_dump()
+    # the tiles order of a board does not matter
+    dump["board"]["coordinates_to_occupation"] = sorted(
+        dump["board"]["coordinates_to_occupation"], key=lambda tile: tile[:2]
+    )
+    return dump
+
+
+def test_batch_matches_reference_engine():
+    n_players = 3
+    board_templates = BoardTemplates(_level)
+    game_statuses = [
+        generate_game_status(
+            {
+                Player(id=Player.random_id(), username=f"g{game}p{seat}")
+                for seat in range(n_players)
+            },
+            board_templates.generate_board,
+            game_rng(game, root_seed=7),
+        )
+        for game in range(40)
+    ]
+    simulator = BatchSimulator.from_game_statuses(
+        BatchLevel(_level(n_players), n_players), game_statuses
+    )
+    rng = np.random.default_rng(7)
+
+    while not simulator.is_over():
+        actions = simulator.random_actions(rng)
+        for game in np.nonzero(simulator.active)[0]:
+            _, game_statuses[game] = update_game_status(
+                game_statuses[game],
+                simulator.game_actions(actions, game),
+                is_valid_action,
+            )
+        simulator.step(actions)
+
+        for game, game_status in enumerate(game_statuses):
+            assert _comparable(simulator.game_status(game)) == _comparable(game_status)
+
+
+def test_run_batch_plays_every_game_to_the_end():
+    level = BatchLevel(_level(4), 4)
+
+    report = run_batch(level, n_games=500, seed=1, batch_size=200)
+
+    assert report.games == 500
+    assert (report.winners >= 0).all()
+    assert (report.turns <= game_config.max_turns + 1).all()
+    assert sum(report.wins_by_seat().values()) == 500
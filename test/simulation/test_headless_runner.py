@@ -0,0 +1,86 @@
+from controller.action_point_calculator import action_points_cost
+from controller.controller_config import controller_config
+from controller.game_controller_setup import GameControllerSetup
+from metrics.metrics import metrics_registry
+from model.board.board_factory import BoardTemplates
+from model.board.hexagon_coordinates import HexagonCoordinates
+from model.game_model.game_config import game_config
+from model.game_model.game_status.game_status_factory import generate_game_status
+from model.game_model.game_status.game_status_updater import update_game_status
+from model.game_model.player_action_validator import is_valid_action
+from player.player import Player
+from simulation.headless_runner import HeadlessRunner, random_players_factory
+from simulation.simulated_player import ScriptedPlayer
+
+
+def _level(_: int) -> set[HexagonCoordinates]:
+    return {
+        HexagonCoordinates(q=q, r=r)
+        for q in range(-3, 4)
+        for r in range(-3, 4)
+        if abs(q + r) <= 3
+    }
+
+
+def _setup() -> GameControllerSetup:
+    board_templates = BoardTemplates(_level)
+    return GameControllerSetup(
+        update_game_status,
+        is_valid_action,
+        action_points_cost,
+        lambda players, rng: generate_game_status(
+            players, board_templates.generate_board, rng
+        ),
+    )
+
+
+def test_random_games_run_to_completion():
+    report = HeadlessRunner(_setup()).run(3, random_players_factory(3, seed=1))
+
+    assert report.games == 3
+    assert all(result.winner is not None for result in report.results)
+    assert all(result.turns <= game_config.max_turns for result in report.results)
+    assert report.games_per_second > 0
+
+
+def test_idle_players_play_every_turn_on_the_virtual_clock():
+    players = [
+        ScriptedPlayer(
+            Player(id=Player.random_id(), username=f"seat{seat}"),
+            lambda player, game_status: [],
+        )
+        for seat in range(3)
+    ]
+
+    result = HeadlessRunner(_setup()).play_game(players)
+
+    assert result.turns == game_config.max_turns
+    assert result.winner is not None
+    assert (
+        result.virtual_seconds
+        >= game_config.max_turns * controller_config.turn_preparation_time
+    )
+
+
+def test_games_record_controller_phases():
+    phases = metrics_registry.get("game_controller_phase_seconds")
+    before = {
+        phase: phases.labels(phase).count
+        for phase in ("update_game_status", "game_over_check")
+    }
+
+    HeadlessRunner(_setup()).run(1, random_players_factory(3, seed=2))
+
+    recorded = {phase: phases.labels(phase).count - before[phase] for phase in before}
+    # one update and one game over check per turn
+    assert recorded["update_game_status"] == recorded["game_over_check"] > 0
+
+
+def test_games_are_reproducible_from_the_seed():
+    players_factory = random_players_factory(3, seed=5)
+    report = HeadlessRunner(_setup(), seed=5).run(3, players_factory)
+
+    # a game played alone, in another runner, is the same game
+    replayed = HeadlessRunner(_setup(), seed=5).play_game(players_factory(2), 2)
+
+    assert replayed == report.results[2]